@@ -1,9 +1,40 @@
+import threading
+
 from boto3 import Session
 from core.aws import AwsRegion
 
+from .client_registry import CLIENT_REGISTRY, ClientRegistry
+
 
 class BotoSession:
 
     @staticmethod
     def get_session(region: AwsRegion):
         return Session(region_name=region.value)
+
+    @staticmethod
+    def get_shared_session(region: AwsRegion):
+        return SharedSession(BotoSession.get_session(region))
+
+
+class SharedSession:
+    """Wraps a boto3 session so its clients come from the process wide client registry.
+
+    Session objects are not thread safe, the clients they create are, so the wrapper can be used from
+    several threads.
+    """
+
+    def __init__(self, session: Session, registry: ClientRegistry = CLIENT_REGISTRY):
+        self._session = session
+        self._registry = registry
+        self._lock = threading.Lock()
+
+    def client(self, service_name: str, region_name: str = None, **kwargs):
+        return self._registry.get_client(self._session, service_name, region_name, **kwargs)
+
+    def resource(self, *args, **kwargs):
+        with self._lock:
+            return self._session.resource(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
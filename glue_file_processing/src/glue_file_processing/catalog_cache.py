@@ -0,0 +1,85 @@
+import hashlib
+import json
+from typing import Dict, Optional, Tuple
+
+from boto3 import Session
+from gluecatalog.model import Table
+
+from .logger import get_logger
+
+LOGGER = get_logger()
+
+GLUE_SERVICE = 'glue'
+FINGERPRINT_PARAMETER = 'pipeline_definition_fingerprint'
+# the keys of a GetTable response that UpdateTable accepts back as its TableInput
+TABLE_INPUT_KEYS = ['Name', 'Description', 'Owner', 'LastAccessTime', 'LastAnalyzedTime', 'Retention',
+                    'StorageDescriptor', 'PartitionKeys', 'ViewOriginalText', 'ViewExpandedText', 'TableType',
+                    'Parameters', 'TargetTable']
+
+
+def _type_name(data_type) -> str:
+    return str(getattr(data_type, 'value', data_type))
+
+
+def table_fingerprint(table: Table) -> str:
+    """A hash of everything in a table definition that syncing it to the catalog would change."""
+    definition = {
+        'name': table.name,
+        'columns': [[column.name, _type_name(column.type)] for column in table.columns],
+        'location': table.s3_location,
+        'format': type(table.storage_format).__name__,
+        'partitions': [[column.name, _type_name(column.type)] for column in table.partition_cols],
+        'description': table.description,
+    }
+    return hashlib.sha256(json.dumps(definition, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class TableDefinitionCache:
+    """Remembers which table definitions are already in the catalog, so unchanged tables are not synced again.
+
+    The fingerprint of a synced definition is kept in memory and stored as a table parameter, so a new
+    process only needs a single GetTable call to find out the table is up to date.
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+        self._known: Dict[Tuple[str, str], str] = {}
+
+    def is_current(self, database_name: str, table: Table) -> bool:
+        fingerprint = table_fingerprint(table)
+        key = (database_name, table.name)
+        if self._known.get(key) == fingerprint:
+            return True
+
+        if self._stored_fingerprint(database_name, table.name) == fingerprint:
+            self._known[key] = fingerprint
+            return True
+        return False
+
+    def remember(self, database_name: str, table: Table):
+        fingerprint = table_fingerprint(table)
+        try:
+            self._store_fingerprint(database_name, table.name, fingerprint)
+        except Exception as ex:  # pylint: disable=broad-except
+            # the table is synced either way, the next process will simply sync it once more
+            LOGGER.warning(f"Unable to store the definition fingerprint of '{database_name}.{table.name}': {ex}")
+        self._known[(database_name, table.name)] = fingerprint
+
+    def _stored_fingerprint(self, database_name: str, table_name: str) -> Optional[str]:
+        glue = self._session.client(GLUE_SERVICE)
+        try:
+            response = glue.get_table(DatabaseName=database_name, Name=table_name)
+        except glue.exceptions.EntityNotFoundException:
+            return None
+        return response['Table'].get('Parameters', {}).get(FINGERPRINT_PARAMETER)
+
+    def _store_fingerprint(self, database_name: str, table_name: str, fingerprint: str):
+        glue = self._session.client(GLUE_SERVICE)
+        # read after the sync, the table fetched by is_current would put the old definition back
+        table = glue.get_table(DatabaseName=database_name, Name=table_name)['Table']
+        if table.get('Parameters', {}).get(FINGERPRINT_PARAMETER) == fingerprint:
+            # another process synced the same definition first
+            return
+        table_input = {key: value for key, value in table.items() if key in TABLE_INPUT_KEYS}
+        table_input['Parameters'] = dict(table_input.get('Parameters', {}), **{FINGERPRINT_PARAMETER: fingerprint})
+        glue.update_table(DatabaseName=database_name, TableInput=table_input)
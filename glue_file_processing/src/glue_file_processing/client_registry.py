@@ -0,0 +1,67 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from boto3 import Session
+from botocore.config import Config as BotoConfig
+
+from .logger import get_logger
+
+LOGGER = get_logger()
+
+DEFAULT_POOL_SIZE = 10
+
+
+class ClientRegistry:
+    """Process wide cache of boto3 clients keyed by service, region and the identity of the session.
+
+    Clients are thread safe and keep their connection pool warm, so every component of the job shares one
+    client per service instead of creating its own. Sessions with other credentials, a profile or an assumed
+    role, get clients of their own. Clients asked for with extra arguments are not shared.
+    """
+
+    def __init__(self, max_pool_connections: int = DEFAULT_POOL_SIZE):
+        self._max_pool_connections = max_pool_connections
+        self._clients: Dict[Tuple[str, str, Optional[str], Optional[str]], object] = {}
+        self._lock = threading.Lock()
+        self.created_count = 0
+        """The number of clients created"""
+        self.reused_count = 0
+        """The number of times an existing client was handed out"""
+
+    def configure(self, max_pool_connections: int):
+        """Sets the connection pool size of the clients created from now on."""
+        with self._lock:
+            self._max_pool_connections = max_pool_connections
+
+    def get_client(self, session: Session, service_name: str, region_name: str = None, **kwargs):
+        region_name = region_name or session.region_name
+        with self._lock:
+            if kwargs:
+                self.created_count += 1
+                return session.client(service_name, region_name=region_name, **kwargs)
+
+            key = (service_name, region_name) + self._identity(session)
+            client = self._clients.get(key)
+            if client is None:
+                client = session.client(service_name, region_name=region_name,
+                                        config=BotoConfig(max_pool_connections=self._max_pool_connections))
+                self._clients[key] = client
+                self.created_count += 1
+            else:
+                self.reused_count += 1
+            return client
+
+    @staticmethod
+    def _identity(session: Session) -> Tuple[Optional[str], Optional[str]]:
+        credentials = session.get_credentials()
+        return session.profile_name, credentials.access_key if credentials else None
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def log_stats(self):
+        LOGGER.info(f"AWS clients created: {self.created_count}, reused: {self.reused_count}")
+
+
+CLIENT_REGISTRY = ClientRegistry()
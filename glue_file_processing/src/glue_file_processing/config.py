@@ -1,4 +1,4 @@
-from typing import Dict, Union, List
+from typing import Dict, Union, List, Optional
 from dataclasses import dataclass
 from enum import IntEnum, auto
 
@@ -6,6 +6,7 @@ from gluecatalog.sanitize import sanitize_column_name
 from gluecatalog.data_types import DataTypes
 from gluecatalog.model import Column
 
+from .pipeline_enum import ParserBackend, TagFlushPolicy
 from .transform import ColumnName
 
 
@@ -20,6 +21,18 @@ class ConfigKey:
     DATA_QUALITY_REPORTING = 'error_reporting'
     DATA_QUALITY_RULES = 'rules'
     ERROR_REPORTING_ENABLED = 'error_reporting_enabled'
+    SOURCE_BUFFER_MAX_MEMORY = 'source_buffer_max_memory'
+    PARSER_BACKEND = 'parser_backend'
+    PARQUET_CHUNK_SIZE = 'parquet_chunk_size'
+    TAG_FLUSH_POLICY = 'tag_flush_policy'
+    MAX_WORKERS = 'max_workers'
+    STEP_WORKERS = 'step_workers'
+    CLIENT_POOL_SIZE = 'client_pool_size'
+    PARTITION_FLUSH_DELAY = 'partition_flush_delay'
+    REPORT_WORKERS = 'report_workers'
+    HASH_INDEX_PATH = 'hash_index_path'
+    FORCE_REPROCESS = 'force_reprocess'
+    RUN_JOURNAL = 'run_journal'
 
 
 class ConfigDefault:
@@ -31,6 +44,18 @@ class ConfigDefault:
     DATA_QUALITY_REPORTING = dict()
     DATA_QUALITY_RULES = dict()
     ERROR_REPORTING_ENABLED = True
+    SOURCE_BUFFER_MAX_MEMORY = 64 * 1024 * 1024
+    PARSER_BACKEND = ParserBackend.Python.value
+    PARQUET_CHUNK_SIZE = None
+    TAG_FLUSH_POLICY = TagFlushPolicy.Stage.value
+    MAX_WORKERS = 1
+    STEP_WORKERS = 4
+    CLIENT_POOL_SIZE = 10
+    PARTITION_FLUSH_DELAY = 0
+    REPORT_WORKERS = 4
+    HASH_INDEX_PATH = None
+    FORCE_REPROCESS = False
+    RUN_JOURNAL = False
 
 
 @dataclass
@@ -80,6 +105,48 @@ class Config():
             ConfigKey.ERROR_REPORTING_ENABLED, ConfigDefault.ERROR_REPORTING_ENABLED)
         """Will context columns (correlation id etc.) be added to the parquet file"""
 
+        self.source_buffer_max_memory: int = pipeline_config.get(
+            ConfigKey.SOURCE_BUFFER_MAX_MEMORY, ConfigDefault.SOURCE_BUFFER_MAX_MEMORY)
+        """The size in bytes above which the source file is spooled to local disk instead of kept in memory"""
+
+        self.parser_backend: ParserBackend = ParserBackend(
+            pipeline_config.get(ConfigKey.PARSER_BACKEND, ConfigDefault.PARSER_BACKEND))
+        """The CSV reader used to parse the source file (python, c or pyarrow), python unless a pipeline opts in"""
+
+        self.parquet_chunk_size: Optional[int] = pipeline_config.get(
+            ConfigKey.PARQUET_CHUNK_SIZE, ConfigDefault.PARQUET_CHUNK_SIZE)
+        """The number of rows converted and written per parquet row group, the whole file at once when not set"""
+
+        self.tag_flush_policy: TagFlushPolicy = TagFlushPolicy(
+            pipeline_config.get(ConfigKey.TAG_FLUSH_POLICY, ConfigDefault.TAG_FLUSH_POLICY))
+        """When tag changes are written to S3, straight away (immediate) or once per lifecycle stage (stage)"""
+
+        self.max_workers: int = pipeline_config.get(ConfigKey.MAX_WORKERS, ConfigDefault.MAX_WORKERS)
+        """The number of processes running data quality checks when a run has several files"""
+
+        self.step_workers: int = pipeline_config.get(ConfigKey.STEP_WORKERS, ConfigDefault.STEP_WORKERS)
+        """The number of threads running the independent steps after the data quality check, 1 runs them in order"""
+
+        self.client_pool_size: int = pipeline_config.get(ConfigKey.CLIENT_POOL_SIZE, ConfigDefault.CLIENT_POOL_SIZE)
+        """The maximum number of connections each shared AWS client keeps open"""
+
+        self.partition_flush_delay: float = pipeline_config.get(
+            ConfigKey.PARTITION_FLUSH_DELAY, ConfigDefault.PARTITION_FLUSH_DELAY)
+        """The seconds a new catalog partition may wait to be registered with others, 0 registers it straight away"""
+
+        self.report_workers: int = pipeline_config.get(ConfigKey.REPORT_WORKERS, ConfigDefault.REPORT_WORKERS)
+        """The number of threads writing the per rule files of the detailed error report"""
+
+        self.hash_index_path: Optional[str] = pipeline_config.get(ConfigKey.HASH_INDEX_PATH,
+                                                                  ConfigDefault.HASH_INDEX_PATH)
+        """The SQLite file remembering the content hash of processed files, resent files are not checked again"""
+
+        self.force_reprocess: bool = pipeline_config.get(ConfigKey.FORCE_REPROCESS, ConfigDefault.FORCE_REPROCESS)
+        """Processes files in full even when a file with the same content was processed before"""
+
+        self.run_journal: bool = pipeline_config.get(ConfigKey.RUN_JOURNAL, ConfigDefault.RUN_JOURNAL)
+        """Records the completed stages of every run in the raw bucket, so a retried run skips them"""
+
         self.schema: Dict[str, ColumnConfig] = self._parse_schema(pipeline_config)
         """A mapping of sanitized column names to configuration (data types etc.)"""
 
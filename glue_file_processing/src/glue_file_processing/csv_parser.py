@@ -0,0 +1,278 @@
+import csv
+import io
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from .config import ColumnConfig
+from .logger import get_logger
+from .pipeline_enum import Encoding, ParserBackend
+
+LOGGER = get_logger()
+
+# the values pandas treats as missing by default, so every backend reports the same blanks
+NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', 'N/A',
+             'NA', 'NULL', 'NaN', 'n/a', 'nan', 'null']
+_NA_VALUES = frozenset(NA_VALUES)
+_TRUE_VALUES = frozenset(['true', 't', '1', 'yes', 'y'])
+_FALSE_VALUES = frozenset(['false', 'f', '0', 'no', 'n'])
+_DECIMAL_TYPE = re.compile(r'DECIMAL\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)', re.IGNORECASE)
+
+
+def _int_converter(name: str) -> Callable[[str], Optional[int]]:
+    def to_int(value: str) -> Optional[int]:
+        if value in _NA_VALUES:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"Column '{name}' has a value that is not a valid integer: '{value}'") from None
+
+    return to_int
+
+
+def _bool_converter(name: str) -> Callable[[str], Optional[bool]]:
+    def to_bool(value: str) -> Optional[bool]:
+        if value in _NA_VALUES or value.strip() in _NA_VALUES:
+            return None
+        lower_value = value.strip().lower()
+        if lower_value in _TRUE_VALUES:
+            return True
+        if lower_value in _FALSE_VALUES:
+            return False
+        raise ValueError(f"Column '{name}' has a value that is not a valid boolean: '{value}'")
+
+    return to_bool
+
+
+def _decimal_converter(name: str, data_type: str) -> Callable[[str], Optional[Decimal]]:
+    decimal_type = _DECIMAL_TYPE.match(data_type)
+    precision, scale = (int(decimal_type.group(1)), int(decimal_type.group(2))) if decimal_type else (None, None)
+    exponent = Decimal(1).scaleb(-scale) if decimal_type else None
+
+    def to_decimal(value: str) -> Optional[Decimal]:
+        if value in _NA_VALUES:
+            return None
+        try:
+            decimal_value = Decimal(value)
+            if exponent is None:
+                return decimal_value
+            decimal_value = decimal_value.quantize(exponent, rounding=ROUND_HALF_UP)
+            # the digits left of the point may not take more than precision - scale places
+            if decimal_value and decimal_value.adjusted() >= precision - scale:
+                raise InvalidOperation
+            return decimal_value
+        except InvalidOperation:
+            raise ValueError(f"Column '{name}' has a value that is not a valid {data_type}: '{value}'") from None
+
+    return to_decimal
+
+
+@dataclass
+class ParseSpec:
+    """Per column parser settings compiled from the configured schema, keyed by the column name in the file."""
+    dtype: Dict[str, type] = field(default_factory=dict)
+    converters: Dict[str, Callable[[str], object]] = field(default_factory=dict)
+    timestamp_columns: List[str] = field(default_factory=list)
+    date_columns: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_schema(cls, schema: Dict[str, ColumnConfig]) -> 'ParseSpec':
+        spec = cls()
+        for col_config in schema.values():
+            if col_config.is_calculated:
+                continue
+            name = col_config.name_in_file
+            data_type = col_config.data_type.upper()
+            if data_type.startswith('DECIMAL'):
+                spec.converters[name] = _decimal_converter(name, data_type)
+            elif data_type in ('INT', 'BIGINT', 'SMALLINT', 'TINYINT'):
+                spec.converters[name] = _int_converter(name)
+            elif data_type == 'BOOLEAN':
+                spec.converters[name] = _bool_converter(name)
+            elif data_type == 'TIMESTAMP':
+                spec.timestamp_columns.append(name)
+            elif data_type == 'DATE':
+                spec.date_columns.append(name)
+            else:
+                spec.dtype[name] = str
+        return spec
+
+    @property
+    def parse_dates(self) -> List[str]:
+        return self.timestamp_columns + self.date_columns
+
+
+def pandas_engine(backend: ParserBackend) -> str:
+    """The pandas engine to use when the source can only be read through pandas."""
+    return ParserBackend.Python.value if backend == ParserBackend.Python else ParserBackend.C.value
+
+
+def requires_python_engine(delimiter: str) -> bool:
+    # the C and Arrow readers only support single character delimiters, anything else is treated as a regex
+    return delimiter is None or len(delimiter) != 1
+
+
+def read_csv(stream: BinaryIO, delimiter: str, backend: ParserBackend, spec: ParseSpec = None) -> pd.DataFrame:
+    """Reads a seekable binary stream into a data frame using the requested backend.
+
+    Without a ``spec`` every column is read as a string, otherwise columns come out typed as the spec describes.
+    Falls back to the pandas Python engine when the delimiter needs it or the faster reader rejects the file.
+    """
+    if backend != ParserBackend.Python and requires_python_engine(delimiter):
+        LOGGER.info(f"Delimiter '{delimiter}' is not supported by the {backend.value} parser, using python instead")
+        backend = ParserBackend.Python
+
+    if backend == ParserBackend.Arrow:
+        # pyarrow is imported when a file is read with it, so it stays out of the job start-up
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+        try:
+            return _read_csv_arrow(stream, delimiter, spec)
+        except pa.ArrowInvalid as ex:
+            LOGGER.warning(f"The pyarrow parser was unable to read the file, retrying with c: {ex}")
+            backend = ParserBackend.C
+
+    try:
+        return _read_csv_pandas(stream, delimiter, backend.value, spec)
+    except pd.errors.ParserError as ex:
+        if backend == ParserBackend.Python:
+            raise
+        LOGGER.warning(f"The {backend.value} parser was unable to read the file, retrying with python: {ex}")
+        return _read_csv_pandas(stream, delimiter, ParserBackend.Python.value, spec)
+
+
+def iter_csv(stream: BinaryIO, delimiter: str, backend: ParserBackend, spec: ParseSpec,
+             chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Reads a seekable binary stream in typed data frames of at most ``chunk_size`` rows.
+
+    The row index carries on across chunks. The pyarrow backend has no streaming reader, so the C engine is used.
+    """
+    if requires_python_engine(delimiter):
+        backend = ParserBackend.Python
+    elif backend == ParserBackend.Arrow:
+        backend = ParserBackend.C
+
+    chunks = _iter_csv_pandas(stream, delimiter, backend.value, spec, chunk_size)
+    try:
+        first_chunk = next(chunks, None)
+    except pd.errors.ParserError as ex:
+        if backend == ParserBackend.Python:
+            raise
+        LOGGER.warning(f"The {backend.value} parser was unable to read the file, retrying with python: {ex}")
+        chunks = _iter_csv_pandas(stream, delimiter, ParserBackend.Python.value, spec, chunk_size)
+        first_chunk = next(chunks, None)
+
+    if first_chunk is not None:
+        yield first_chunk
+        yield from chunks
+
+
+def _iter_csv_pandas(stream: BinaryIO, delimiter: str, engine: str, spec: ParseSpec,
+                     chunk_size: int) -> Iterator[pd.DataFrame]:
+    present = set(_read_header(stream, delimiter))
+    stream.seek(0)
+    text_stream = io.TextIOWrapper(stream, encoding=Encoding.Utf8.value, newline='')
+    try:
+        reader = pd.read_csv(
+            text_stream,
+            delimiter=delimiter,
+            engine=engine,
+            chunksize=chunk_size,
+            dtype={name: dtype for name, dtype in spec.dtype.items() if name in present},
+            converters={name: converter for name, converter in spec.converters.items() if name in present},
+            parse_dates=[name for name in spec.parse_dates if name in present])
+        for chunk in reader:
+            yield _with_datetime_columns(chunk, spec)
+    finally:
+        text_stream.detach()
+
+
+def _read_csv_pandas(stream: BinaryIO, delimiter: str, engine: str, spec: ParseSpec = None) -> pd.DataFrame:
+    present = set(_read_header(stream, delimiter)) if spec is not None else set()
+    stream.seek(0)
+    text_stream = io.TextIOWrapper(stream, encoding=Encoding.Utf8.value, newline='')
+    try:
+        if spec is None:
+            return pd.read_csv(text_stream, delimiter=delimiter, engine=engine, dtype=str)
+
+        data_frame = pd.read_csv(
+            text_stream,
+            delimiter=delimiter,
+            engine=engine,
+            dtype={name: dtype for name, dtype in spec.dtype.items() if name in present},
+            converters={name: converter for name, converter in spec.converters.items() if name in present},
+            parse_dates=[name for name in spec.parse_dates if name in present])
+        return _with_datetime_columns(data_frame, spec)
+    finally:
+        # detach so closing the wrapper does not close the underlying stream
+        text_stream.detach()
+
+
+def _read_csv_arrow(stream: BinaryIO, delimiter: str, spec: ParseSpec = None) -> pd.DataFrame:
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    from pyarrow import csv as pa_csv  # pylint: disable=import-outside-toplevel
+
+    column_names = _read_header(stream, delimiter)
+    if len(set(column_names)) != len(column_names):
+        # pandas de-duplicates repeated column names, arrow does not
+        return _read_csv_pandas(stream, delimiter, ParserBackend.C.value, spec)
+
+    column_types = {name: pa.string() for name in column_names}
+    if spec is not None:
+        column_types.update({name: pa.timestamp('ns') for name in spec.parse_dates if name in column_types})
+
+    stream.seek(0)
+    table = pa_csv.read_csv(
+        stream,
+        read_options=pa_csv.ReadOptions(use_threads=True),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            null_values=NA_VALUES,
+            strings_can_be_null=True))
+    data_frame = table.to_pandas()
+    del table
+    if spec is None:
+        return data_frame
+
+    # arrow has no csv decimal reader, so the remaining conversions run column by column on the frame
+    for name, converter in spec.converters.items():
+        if name in data_frame.columns:
+            data_frame[name] = [None if pd.isnull(value) else converter(value) for value in data_frame[name]]
+    return _with_datetime_columns(data_frame, spec)
+
+
+def _with_datetime_columns(data_frame: pd.DataFrame, spec: ParseSpec) -> pd.DataFrame:
+    for name in spec.parse_dates:
+        if name in data_frame.columns and not pd.api.types.is_datetime64_any_dtype(data_frame[name]):
+            # parse_dates leaves the column as strings when any value fails to parse
+            data_frame[name] = _to_datetime(name, data_frame[name])
+    for name in spec.date_columns:
+        if name in data_frame.columns:
+            data_frame[name] = data_frame[name].dt.date
+    return data_frame
+
+
+def _to_datetime(name: str, column: pd.Series) -> pd.Series:
+    converted = pd.to_datetime(column, errors='coerce')
+    invalid = column[converted.isnull() & column.notnull()]
+    if len(invalid):
+        raise ValueError(f"Column '{name}' has {len(invalid)} value(s) that are not a valid date or timestamp, "
+                         f"e.g. '{invalid.iloc[0]}'")
+    return converted
+
+
+def _read_header(stream: BinaryIO, delimiter: str) -> List[str]:
+    stream.seek(0)
+    text_stream = io.TextIOWrapper(stream, encoding=Encoding.Utf8.value, newline='')
+    try:
+        if delimiter is None:
+            return []
+        if requires_python_engine(delimiter):
+            return re.split(delimiter, text_stream.readline().rstrip('\r\n'))
+        return next(csv.reader(text_stream, delimiter=delimiter), [])
+    finally:
+        text_stream.detach()
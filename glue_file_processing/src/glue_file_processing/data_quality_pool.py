@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from datetime import datetime
+from traceback import extract_tb, format_list
+
+from data_quality.model import CheckResult
+
+from .config import Config
+from .csv_parser import read_csv
+from .logger import get_logger
+from .pipeline_configuration import CONFIGURATION
+from .process_steps import ProcessSteps
+from .source_buffer import SourceBuffer
+
+LOGGER = get_logger()
+
+# the rule result attribute holding the formatted traceback of its exception
+STACKTRACE = 'stacktrace'
+
+_WORKER_CONFIG = None
+
+
+@dataclass
+class DataQualityRequest:
+    """The inputs of the data quality check for one file, handed from a run to whoever executes the check."""
+    file_bucket: str
+    file_key: str
+    file_version: str
+    correlation_id: str
+    processed_on: datetime
+    source: SourceBuffer
+
+
+def check_data_quality_from_file(source_path: str, file_bucket: str, file_key: str, file_version: str,
+                                 correlation_id: str, processed_on: datetime) -> CheckResult:
+    """Runs the data quality check in a pool worker on a local copy of the source file.
+
+    The worker makes no AWS calls, every side effect of the check result stays with the parent process.
+    """
+    global _WORKER_CONFIG  # pylint: disable=global-statement
+    if _WORKER_CONFIG is None:
+        _WORKER_CONFIG = Config(CONFIGURATION)
+
+    with open(source_path, 'rb') as stream:
+        source_df = read_csv(stream, _WORKER_CONFIG.delimiter, _WORKER_CONFIG.parser_backend)
+    LOGGER.info(f"Checking data quality of '{file_bucket}/{file_key}' in a pool worker")
+    check_result = ProcessSteps.run_data_quality(source_df, file_bucket, file_key, file_version, correlation_id,
+                                                 processed_on, _WORKER_CONFIG)
+    keep_stacktraces(check_result)
+    return check_result
+
+
+def keep_stacktraces(check_result: CheckResult):
+    """Formats the traceback of every rule exception onto its rule result.
+
+    A traceback is lost when the check result is pickled back to the parent process, which still reports it in
+    the rule error notification.
+    """
+    for rule_result in check_result.rule_results:
+        exception = getattr(rule_result, 'exception', None)
+        if exception is not None:
+            setattr(rule_result, STACKTRACE, ''.join(format_list(extract_tb(exception.__traceback__))))
@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import pandas as pd
+from boto3 import Session
+
+from .catalog_cache import GLUE_SERVICE, TABLE_INPUT_KEYS
+from .logger import get_logger
+from .partition_registrar import PartitionRegistrar
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+LOGGER = get_logger()
+
+ERROR_PARTITION_KEYS = ['year', 'year_month', 'process', 'data_source']
+PARQUET_STORAGE = {
+    'InputFormat': 'org.apache.hadoop.hive.ql.io.parquet.MapredParquetInputFormat',
+    'OutputFormat': 'org.apache.hadoop.hive.ql.io.parquet.MapredParquetOutputFormat',
+    'SerdeInfo': {'SerializationLibrary': 'org.apache.hadoop.hive.ql.io.parquet.serde.ParquetHiveSerDe',
+                  'Parameters': {'serialization.format': '1'}},
+}
+
+TableKey = Tuple[str, str]
+
+
+def arrow_schema(data_frame: pd.DataFrame) -> 'pa.Schema':
+    """The schema a data frame is written to parquet with, when the writer is not given one."""
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    return pa.Schema.from_pandas(data_frame, preserve_index=False)
+
+
+def catalog_type(arrow_type: 'pa.DataType') -> str:
+    """The catalog type of a parquet column, from the Arrow type it was written with."""
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    types = pa.types
+    if types.is_boolean(arrow_type):
+        return 'boolean'
+    if types.is_int8(arrow_type):
+        return 'tinyint'
+    if types.is_int16(arrow_type):
+        return 'smallint'
+    if types.is_int32(arrow_type):
+        return 'int'
+    if types.is_integer(arrow_type):
+        return 'bigint'
+    if types.is_float32(arrow_type):
+        return 'float'
+    if types.is_floating(arrow_type):
+        return 'double'
+    if types.is_decimal(arrow_type):
+        return f"decimal({arrow_type.precision},{arrow_type.scale})"
+    if types.is_date(arrow_type):
+        return 'date'
+    if types.is_timestamp(arrow_type):
+        return 'timestamp'
+    if types.is_binary(arrow_type):
+        return 'binary'
+    return 'string'
+
+
+class ErrorCatalog:
+    """Keeps the error report tables in the catalog in step with the reports the job writes.
+
+    The columns of each table are cached after the first lookup, new columns are added to the table and new
+    partitions registered directly, so error data is queryable as soon as it is written without a crawler run.
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+        self._partitions = PartitionRegistrar(session)
+        self._columns: Dict[TableKey, List[str]] = {}
+        # the summary and detailed reports are written from different threads
+        self._lock = threading.Lock()
+
+    def update(self, database_name: str, table_name: str, table_location: str, schemas: List['pa.Schema'],
+               partition_values: List[str], partition_location: str):
+        # the files of a report may each hold some of the columns, the table has them all
+        column_types = OrderedDict()
+        for schema in schemas:
+            for arrow_field in schema:
+                if arrow_field.name not in ERROR_PARTITION_KEYS:
+                    column_types.setdefault(arrow_field.name, catalog_type(arrow_field.type))
+        columns = [{'Name': name, 'Type': column_type} for name, column_type in column_types.items()]
+        with self._lock:
+            key = (database_name, table_name)
+            if key not in self._columns:
+                self._columns[key] = self._load_columns(database_name, table_name)
+
+            known_columns = self._columns[key]
+            if known_columns is None:
+                self._create_table(database_name, table_name, table_location, columns)
+                self._columns[key] = [column['Name'] for column in columns]
+            else:
+                new_columns = [column for column in columns if column['Name'] not in known_columns]
+                if new_columns:
+                    self._add_columns(database_name, table_name, new_columns)
+                    self._columns[key] = known_columns + [column['Name'] for column in new_columns]
+
+            self._partitions.register(database_name, table_name, partition_values, partition_location)
+
+    def _load_columns(self, database_name: str, table_name: str) -> Optional[List[str]]:
+        glue = self._session.client(GLUE_SERVICE)
+        try:
+            table = glue.get_table(DatabaseName=database_name, Name=table_name)['Table']
+        except glue.exceptions.EntityNotFoundException:
+            return None
+        return [column['Name'] for column in table['StorageDescriptor'].get('Columns', [])]
+
+    def _create_table(self, database_name: str, table_name: str, table_location: str, columns: List[Dict]):
+        storage_descriptor = dict(PARQUET_STORAGE, Columns=columns, Location=table_location)
+        self._session.client(GLUE_SERVICE).create_table(DatabaseName=database_name, TableInput={
+            'Name': table_name,
+            'TableType': 'EXTERNAL_TABLE',
+            'Parameters': {'classification': 'parquet'},
+            'StorageDescriptor': storage_descriptor,
+            'PartitionKeys': [{'Name': name, 'Type': 'string'} for name in ERROR_PARTITION_KEYS]})
+        LOGGER.info(f"Created error table '{database_name}.{table_name}'")
+
+    def _add_columns(self, database_name: str, table_name: str, new_columns: List[Dict]):
+        glue = self._session.client(GLUE_SERVICE)
+        table = glue.get_table(DatabaseName=database_name, Name=table_name)['Table']
+        table_input = {key: value for key, value in table.items() if key in TABLE_INPUT_KEYS}
+        storage_descriptor = dict(table_input['StorageDescriptor'])
+        storage_descriptor['Columns'] = storage_descriptor.get('Columns', []) + new_columns
+        table_input['StorageDescriptor'] = storage_descriptor
+        glue.update_table(DatabaseName=database_name, TableInput=table_input)
+        # existing partitions keep their own descriptor, new ones are registered with the new columns
+        self._partitions.forget_table(database_name, table_name)
+        LOGGER.info(f"Added columns {[column['Name'] for column in new_columns]} to '{database_name}.{table_name}'")
@@ -0,0 +1,136 @@
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, List
+
+import pandas as pd
+from boto3 import Session
+from core.aws import AwsService
+from data_quality.model import RuleResult
+
+from .logger import get_logger
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+LOGGER = get_logger()
+
+RULE_NAME_COLUMN = 'rule_name'
+REPORT_SUFFIX = '.parquet.snappy'
+MAX_DECIMAL_PRECISION = 38
+
+
+def rule_error_key(error_key: str, rule_name: str) -> str:
+    """The key of the file holding the errors of one rule, next to the other rules of the same report."""
+    safe_rule_name = re.sub(r'[^0-9A-Za-z_-]', '_', rule_name)
+    if error_key.endswith(REPORT_SUFFIX):
+        return f"{error_key[:-len(REPORT_SUFFIX)]}_{safe_rule_name}{REPORT_SUFFIX}"
+    return f"{error_key}_{safe_rule_name}"
+
+
+class DetailedErrorReportWriter:
+    """Writes the detailed error report as one parquet file per rule, each with the columns of its own rule only.
+
+    The files share the partition folder of the report, so the error table reads them together, and every file
+    carries the rule name so a query for one rule can skip the files of the others from their statistics. The
+    type of every column is settled once for the whole report, so a column has the same type in every file.
+    """
+
+    def __init__(self, session: Session, max_workers: int = 1):
+        self._session = session
+        self._max_workers = max_workers
+
+    def write(self, rule_results: Iterable[RuleResult], bucket: str, key: str) -> List['pa.Schema']:
+        """Writes the rules that found errors and returns the schema of every file written."""
+        reports = [(rule_result.rule_name, rule_result.errors_df) for rule_result in rule_results
+                   if rule_result.errors_df is not None and not rule_result.errors_df.empty]
+        if not reports:
+            LOGGER.info("There were no data quality errors so no error details file was written.")
+            return []
+
+        column_types = report_column_types([errors_df for _, errors_df in reports])
+        if self._max_workers > 1 and len(reports) > 1:
+            with ThreadPoolExecutor(min(self._max_workers, len(reports))) as executor:
+                schemas = list(executor.map(lambda report: self._write_rule(bucket, key, column_types, *report),
+                                            reports))
+        else:
+            schemas = [self._write_rule(bucket, key, column_types, *report) for report in reports]
+        LOGGER.info(f"Wrote details for {sum(len(errors_df.index) for _, errors_df in reports)} data quality "
+                    f"errors of {len(reports)} rule(s) to s3://{bucket}/{key}")
+        return schemas
+
+    def _write_rule(self, bucket: str, key: str, column_types: Dict[str, 'pa.DataType'], rule_name: str,
+                    errors_df: pd.DataFrame) -> 'pa.Schema':
+        # pyarrow is only needed once a file has errors, so it stays out of the job start-up
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        if RULE_NAME_COLUMN not in errors_df.columns:
+            errors_df = errors_df.assign(**{RULE_NAME_COLUMN: rule_name})
+        schema = pa.schema([pa.field(name, column_types[name]) for name in errors_df.columns])
+        text_columns = {name: _to_text(errors_df[name]) for name in errors_df.columns
+                        if pa.types.is_string(column_types[name])}
+        table = pa.Table.from_pandas(errors_df.assign(**text_columns), schema=schema, preserve_index=False)
+
+        buffer = pa.BufferOutputStream()
+        pq.write_table(table, buffer, compression='snappy')
+        rule_key = rule_error_key(key, rule_name)
+        self._session.client(AwsService.S3.value).put_object(
+            Bucket=bucket, Key=rule_key, Body=buffer.getvalue().to_pybytes())
+        LOGGER.debug(f"Wrote {len(errors_df.index)} errors of rule '{rule_name}' to s3://{bucket}/{rule_key}")
+        return schema
+
+
+def report_column_types(errors_dfs: List[pd.DataFrame]) -> Dict[str, 'pa.DataType']:
+    """The Arrow type of every column of a report, the same whichever rule the column comes from.
+
+    A column whose values, or whose types across rules, can not share one Arrow type is written as text.
+    """
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+    column_types = OrderedDict()
+    # the rule name is added to the files of the rules that do not report it themselves
+    column_types[RULE_NAME_COLUMN] = pa.null()
+    for errors_df in errors_dfs:
+        for name in errors_df.columns:
+            arrow_type = _column_type(name, errors_df[name])
+            column_types[name] = (_common_type(name, column_types[name], arrow_type) if name in column_types
+                                  else arrow_type)
+    # a column that is blank in every rule has no type of its own
+    return OrderedDict((name, pa.string() if pa.types.is_null(arrow_type) else arrow_type)
+                       for name, arrow_type in column_types.items())
+
+
+def _column_type(name: str, column: pd.Series) -> 'pa.DataType':
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    try:
+        return pa.Array.from_pandas(column).type
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        LOGGER.warning(f"Error report column '{name}' holds values of mixed types, it is written as text")
+        return pa.string()
+
+
+def _common_type(name: str, first: 'pa.DataType', second: 'pa.DataType') -> 'pa.DataType':
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    types = pa.types
+    if first.equals(second) or types.is_null(second):
+        return first
+    if types.is_null(first):
+        return second
+    if types.is_integer(first) and types.is_integer(second):
+        return pa.int64()
+    if (types.is_integer(first) or types.is_floating(first)) and \
+            (types.is_integer(second) or types.is_floating(second)):
+        return pa.float64()
+    if types.is_decimal(first) and types.is_decimal(second):
+        scale = max(first.scale, second.scale)
+        digits = max(first.precision - first.scale, second.precision - second.scale)
+        return pa.decimal128(min(MAX_DECIMAL_PRECISION, digits + scale), scale)
+    LOGGER.warning(f"Error report column '{name}' is {first} for one rule and {second} for another, "
+                   f"it is written as text")
+    return pa.string()
+
+
+def _to_text(column: pd.Series) -> pd.Series:
+    # blanks stay blank instead of becoming 'nan' or 'None'
+    return column.map(lambda value: None if pd.isnull(value) else str(value))
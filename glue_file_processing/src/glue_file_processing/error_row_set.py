@@ -0,0 +1,60 @@
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from data_quality.model import RuleResult
+
+from .config import ColumnName
+
+
+class ErrorRowSet:
+    """The indexes of the rows that failed at least one data quality rule, as a sorted array without repeats.
+
+    It takes a few bytes per failing row whatever the size of the error details, so it can be kept for the
+    parquet enrichment while the detailed error frames are released.
+    """
+    __slots__ = ['_rows']
+
+    def __init__(self, rows: Iterable[int] = ()):
+        self._rows = np.unique(np.asarray(rows, dtype=np.int64))
+
+    @classmethod
+    def from_errors(cls, errors_df: pd.DataFrame) -> 'ErrorRowSet':
+        if errors_df is None or errors_df.empty or ColumnName.ROW_INDEX not in errors_df.columns:
+            return cls()
+        return cls(errors_df[ColumnName.ROW_INDEX].values)
+
+    @classmethod
+    def from_rule_results(cls, rule_results: Iterable[RuleResult]) -> 'ErrorRowSet':
+        error_rows = cls()
+        for rule_result in rule_results:
+            error_rows = error_rows.union(cls.from_errors(rule_result.errors_df))
+        return error_rows
+
+    def union(self, other: 'ErrorRowSet') -> 'ErrorRowSet':
+        error_rows = ErrorRowSet()
+        error_rows._rows = np.union1d(self._rows, other._rows)
+        return error_rows
+
+    def mask(self, index: pd.Index) -> np.ndarray:
+        """A boolean array telling for every label of ``index`` whether that row is in error."""
+        return np.isin(np.asarray(index), self._rows)
+
+    def to_array(self) -> np.ndarray:
+        return self._rows.copy()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, row: int) -> bool:
+        position = np.searchsorted(self._rows, row)
+        return position < len(self._rows) and self._rows[position] == row
+
+    def __or__(self, other: 'ErrorRowSet') -> 'ErrorRowSet':
+        return self.union(other)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ErrorRowSet) and np.array_equal(self._rows, other._rows)
+
+    def __repr__(self) -> str:
+        return f"ErrorRowSet({len(self)} rows)"
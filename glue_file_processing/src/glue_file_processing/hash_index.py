@@ -0,0 +1,84 @@
+import json
+import sqlite3
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+
+from .logger import get_logger
+
+LOGGER = get_logger()
+
+
+@dataclass
+class HashRecord:
+    """The outcome of the last successful run of a file with a given content hash."""
+    hash_value: str
+    correlation_id: str
+    file_key: str
+    target_key: str
+    parquet_key: str
+    partition_location: str
+    quality_tags: Dict[str, str] = field(default_factory=dict)
+    recorded_on: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+
+class HashIndex:
+    """Maps the content hash of processed files to the outcome of their run, so resent files can be recognised."""
+
+    def get(self, hash_value: str) -> Optional[HashRecord]:
+        raise NotImplementedError
+
+    def put(self, record: HashRecord):
+        raise NotImplementedError
+
+    def delete(self, hash_value: str):
+        raise NotImplementedError
+
+
+class InMemoryHashIndex(HashIndex):
+    """A hash index held in memory, used in tests."""
+
+    def __init__(self):
+        self._records: Dict[str, HashRecord] = {}
+
+    def get(self, hash_value: str) -> Optional[HashRecord]:
+        return self._records.get(hash_value)
+
+    def put(self, record: HashRecord):
+        self._records[record.hash_value] = record
+
+    def delete(self, hash_value: str):
+        self._records.pop(hash_value, None)
+
+
+class SqliteHashIndex(HashIndex):
+    """A hash index kept in a local SQLite file, shared by every run of a long lived job."""
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        # the result steps run in threads, the lock serialises their access to the connection
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS file_hash (hash_value TEXT PRIMARY KEY, record TEXT NOT NULL)")
+        LOGGER.info(f"Opened hash index '{db_path}'")
+
+    def get(self, hash_value: str) -> Optional[HashRecord]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT record FROM file_hash WHERE hash_value = ?", (hash_value,)).fetchone()
+        return HashRecord(**json.loads(row[0])) if row else None
+
+    def put(self, record: HashRecord):
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO file_hash (hash_value, record) VALUES (?, ?)",
+                                     (record.hash_value, json.dumps(asdict(record))))
+
+    def delete(self, hash_value: str):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM file_hash WHERE hash_value = ?", (hash_value,))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
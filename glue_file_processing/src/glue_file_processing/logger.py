@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import List
 
 from loggings.factory import LoggerFactory
@@ -15,6 +16,8 @@ class Logger:
         return LoggerFactory().create_json_logger(**config)
 
 
+@lru_cache(maxsize=None)
 def get_logger(log_level="INFO"):
+    """The JSON logger of the given level, built once and shared by every module."""
     logger = Logger(message_format=MESSAGE_FORMAT, log_level=log_level)
     return logger.create_logger()
@@ -0,0 +1,65 @@
+import tempfile
+from typing import TYPE_CHECKING
+
+import pandas as pd
+from boto3 import Session
+
+from core.aws import AwsService
+
+from .logger import get_logger
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+LOGGER = get_logger()
+
+
+class ParquetStreamWriter:
+    """Streaming counterpart of the serializer's ``ParquetWriter`` for files too large to hold as one frame.
+
+    Every data frame written becomes a row group of a local file, converted to the same schema the
+    serializer writes whole files with. The file is uploaded to ``bucket``/``key`` when the writer is
+    closed, and discarded without an upload when the block it is used in raises.
+    """
+
+    def __init__(self, session: Session, schema: 'pa.Schema', bucket: str, key: str):
+        # pyarrow is imported when the first chunked file is written, so it stays out of the job start-up
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        self._session = session
+        self._schema = schema
+        self._bucket = bucket
+        self._key = key
+        self._local_file = tempfile.NamedTemporaryFile(suffix='.parquet')
+        self._writer = pq.ParquetWriter(self._local_file.name, schema)
+        self._row_groups = 0
+
+    def write(self, data_frame: pd.DataFrame):
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+        table = pa.Table.from_pandas(data_frame[self._schema.names], schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+        LOGGER.debug(f"Wrote row group {self._row_groups} with {table.num_rows} rows")
+        self._row_groups += 1
+
+    def close(self):
+        try:
+            self._writer.close()
+            self._session.client(AwsService.S3.value).upload_file(self._local_file.name, self._bucket, self._key)
+        finally:
+            self._local_file.close()
+
+    def abort(self):
+        try:
+            self._writer.close()
+        finally:
+            self._local_file.close()
+
+    def __enter__(self) -> 'ParquetStreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,162 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from boto3 import Session
+
+from .catalog_cache import GLUE_SERVICE
+from .logger import get_logger
+
+LOGGER = get_logger()
+
+# the most partitions a single BatchCreatePartition call accepts
+MAX_BATCH_SIZE = 100
+
+TableKey = Tuple[str, str]
+FailureHandler = Callable[[Exception], None]
+
+
+class PendingPartition:
+    """A partition waiting to be created, with the failure handlers of the runs that registered it."""
+    __slots__ = ['partition_input', 'handlers']
+
+    def __init__(self, partition_input: Dict):
+        self.partition_input = partition_input
+        self.handlers: List[FailureHandler] = []
+
+
+class PartitionRegistrar:
+    """Registers table partitions in the catalog, skipping the ones it already knows about.
+
+    New partitions are buffered and created with BatchCreatePartition once the oldest has waited ``max_delay``
+    seconds, when a full batch is waiting, or when ``flush`` is called at shutdown. Partitions that already
+    exist in the catalog are rejected by the batch call, so the existing partitions of a table are never listed.
+
+    A partition that can not be created is reported to the ``on_failure`` handlers of the runs that registered
+    it, so a delayed flush never blames the run that happened to trigger it. The triggering run gets the failure
+    of its own partition raised from ``register``.
+    """
+
+    def __init__(self, session: Session, max_delay: float = 0, clock: Callable[[], float] = time.monotonic):
+        self._session = session
+        self._max_delay = max_delay
+        self._clock = clock
+        self._known: Dict[TableKey, Set[Tuple[str, ...]]] = {}
+        self._storage_descriptors: Dict[TableKey, Dict] = {}
+        self._pending: Dict[TableKey, Dict[Tuple[str, ...], PendingPartition]] = OrderedDict()
+        self._oldest_pending = None
+        self.skipped_count = 0
+        """The number of partitions that were already known"""
+        self.created_count = 0
+        """The number of partitions created"""
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(partitions) for partitions in self._pending.values())
+
+    def register(self, database_name: str, table_name: str, partition_values: List[str], partition_path: str,
+                 on_failure: FailureHandler = None):
+        key = (database_name, table_name)
+        if key not in self._storage_descriptors:
+            self._load_table(database_name, table_name)
+
+        values = tuple(partition_values)
+        if values in self._known[key]:
+            self.skipped_count += 1
+            # a run sharing a partition that is still waiting hears about its failure as well
+            pending = self._pending.get(key, {}).get(values)
+            if pending is not None and on_failure is not None:
+                pending.handlers.append(on_failure)
+            return
+
+        storage_descriptor = dict(self._storage_descriptors[key], Location=partition_path)
+        pending = PendingPartition({'Values': list(values), 'StorageDescriptor': storage_descriptor})
+        if on_failure is not None:
+            pending.handlers.append(on_failure)
+        self._pending.setdefault(key, OrderedDict())[values] = pending
+        self._known[key].add(values)
+        if self._oldest_pending is None:
+            self._oldest_pending = self._clock()
+
+        if self.pending_count >= MAX_BATCH_SIZE or self._clock() - self._oldest_pending >= self._max_delay:
+            failures = self._create_pending()
+            own_error = next((error for partition, error in failures if partition is pending), None)
+            self._report([failure for failure in failures if failure[0] is not pending], raise_unhandled=False)
+            if own_error is not None:
+                raise own_error
+
+    def forget_table(self, database_name: str, table_name: str):
+        """Reloads the table the next time it is seen, after its definition changed."""
+        self._storage_descriptors.pop((database_name, table_name), None)
+
+    def flush(self):
+        """Creates every pending partition, failures go to their handlers and the rest are raised together."""
+        self._report(self._create_pending(), raise_unhandled=True)
+
+    def _create_pending(self) -> List[Tuple[PendingPartition, Exception]]:
+        failures = []
+        while self._pending:
+            (database_name, table_name), partitions = self._pending.popitem(last=False)
+            partitions = list(partitions.values())
+            for start in range(0, len(partitions), MAX_BATCH_SIZE):
+                failures.extend(self._create_partitions(database_name, table_name,
+                                                        partitions[start:start + MAX_BATCH_SIZE]))
+        self._oldest_pending = None
+        return failures
+
+    def _create_partitions(self, database_name: str, table_name: str,
+                           partitions: List[PendingPartition]) -> List[Tuple[PendingPartition, Exception]]:
+        try:
+            response = self._session.client(GLUE_SERVICE).batch_create_partition(
+                DatabaseName=database_name, TableName=table_name,
+                PartitionInputList=[partition.partition_input for partition in partitions])
+        except Exception as ex:  # pylint: disable=broad-except
+            self._forget_partitions(database_name, table_name, [partition.partition_input['Values']
+                                                                for partition in partitions])
+            return [(partition, ex) for partition in partitions]
+
+        errors = {tuple(error['PartitionValues']): error['ErrorDetail'] for error in response.get('Errors', [])}
+        existing = [values for values, detail in errors.items() if detail['ErrorCode'] == 'AlreadyExistsException']
+        for values in existing:
+            del errors[values]
+        self._forget_partitions(database_name, table_name, list(errors))
+        self.skipped_count += len(existing)
+        self.created_count += len(partitions) - len(existing) - len(errors)
+        LOGGER.info(f"Registered {len(partitions) - len(existing) - len(errors)} partition(s) of "
+                    f"'{database_name}.{table_name}', {len(existing)} already existed")
+        failures = []
+        for partition in partitions:
+            values = tuple(partition.partition_input['Values'])
+            if values in errors:
+                failures.append((partition, RuntimeError(
+                    f"Unable to register partition {list(values)} of '{database_name}.{table_name}': "
+                    f"{errors[values]}")))
+        return failures
+
+    @staticmethod
+    def _report(failures: List[Tuple[PendingPartition, Exception]], raise_unhandled: bool):
+        unhandled = []
+        for partition, error in failures:
+            if not partition.handlers:
+                unhandled.append(error)
+            for handler in partition.handlers:
+                try:
+                    handler(error)
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.exception(f"Unable to handle the failed partition {partition.partition_input['Values']}")
+        if unhandled and raise_unhandled:
+            raise RuntimeError(f"Unable to register {len(unhandled)} partition(s): {unhandled}")
+        for error in unhandled:
+            LOGGER.error(str(error))
+
+    def _forget_partitions(self, database_name: str, table_name: str, partition_values: List[Sequence[str]]):
+        # partitions that could not be created are tried again the next time they are registered
+        known = self._known.get((database_name, table_name), set())
+        for values in partition_values:
+            known.discard(tuple(values))
+
+    def _load_table(self, database_name: str, table_name: str):
+        table = self._session.client(GLUE_SERVICE).get_table(DatabaseName=database_name, Name=table_name)['Table']
+        self._storage_descriptors[(database_name, table_name)] = table['StorageDescriptor']
+        # only the partitions registered by this job are remembered, existing ones are rejected on creation
+        self._known.setdefault((database_name, table_name), set())
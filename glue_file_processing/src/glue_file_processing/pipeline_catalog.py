@@ -4,7 +4,9 @@ from gluecatalog.data_types import DataTypes
 from gluecatalog.datacatalog_manager import DataCatalogManager
 from gluecatalog.model import ParquetFormat, Table, Column
 
+from .catalog_cache import TableDefinitionCache
 from .logger import get_logger
+from .partition_registrar import FailureHandler, PartitionRegistrar
 from .pipeline_enum import CatalogDatabase
 from .pipeline_parquet import PipelineParquet
 from .process_steps import ProcessSteps
@@ -15,11 +17,14 @@ LOGGER = get_logger()
 
 
 class PipelineCatalog:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, process_steps: ProcessSteps = None, pipeline_parquet: PipelineParquet = None,
+                 partitions: PartitionRegistrar = None):
         self.__session = session
-        self._pipeline_parquet = PipelineParquet(self.__session)
-        self._process_step = ProcessSteps(self.__session)
+        self._process_step = process_steps or ProcessSteps(self.__session)
+        self._pipeline_parquet = pipeline_parquet or PipelineParquet(self.__session, self._process_step)
         self.catalog_manager = DataCatalogManager(self.__session)
+        self.table_definitions = TableDefinitionCache(self.__session)
+        self.partitions = partitions or PartitionRegistrar(self.__session)
 
     def __get_partition_path(self, target_bucket: str, target_key: str, filename_timestamp_fmt: str):
         parquet_key = self._pipeline_parquet.get_parquet_key(target_key, filename_timestamp_fmt)
@@ -50,14 +55,24 @@ class PipelineCatalog:
                       description=pipeline_name)
         return table
 
-    def update_glue_catalog(self, target_bucket: str, target_key: str, pipeline_name: str, config: Config):
+    def update_glue_catalog(self, target_bucket: str, target_key: str, pipeline_name: str, config: Config,
+                            on_partition_failure: FailureHandler = None):
         table = self.__get_table(target_bucket, target_key, pipeline_name, config)
-        self.catalog_manager.sync_table_definition(CatalogDatabase.Curated.value, table)
+        if self.table_definitions.is_current(CatalogDatabase.Curated.value, table):
+            LOGGER.info(f"Table definition of {pipeline_name} is unchanged, skipping the sync")
+        else:
+            self.catalog_manager.sync_table_definition(CatalogDatabase.Curated.value, table)
+            self.table_definitions.remember(CatalogDatabase.Curated.value, table)
+            self.partitions.forget_table(CatalogDatabase.Curated.value, table.name)
         partition_path = self.__get_partition_path(target_bucket, target_key, config.filename_timestamp_fmt)
         partition_values = self.__get_partition_values(target_key, config.filename_timestamp_fmt)
-        self.catalog_manager.add_table_partition(CatalogDatabase.Curated.value, table, partition_values, partition_path)
+        self.partitions.register(CatalogDatabase.Curated.value, table.name, partition_values, partition_path,
+                                 on_partition_failure)
         LOGGER.info(f"Updated glue catalog for {pipeline_name}")
 
+    def flush_partitions(self):
+        self.partitions.flush()
+
     def is_table_needing_updating_schema(self, database_name: str, table_name: str, current_table_cols: List[str],
                                          current_partition_values: List[str]):
 
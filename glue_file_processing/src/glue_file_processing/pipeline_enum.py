@@ -13,6 +13,7 @@ class TagKeys(Enum):
     CorrelationId = 'correlation_id'
     QualityScoreSummary = 'quality_score_summary'
     QualityStatusSummary = 'quality_status_summary'
+    DuplicateOf = 'duplicate_of'
 
 
 class SnsStatus(Enum):
@@ -29,6 +30,7 @@ class PipelineFolders(Enum):
     ToBeProcessed = "AutomatedStatus/ToBeProcessed"
     Processed = "AutomatedStatus/Processed"
     ProcessFailed = "AutomatedStatus/ProcessFailed"
+    Journal = "AutomatedStatus/Journal"
     Automated = "Automated"
 
 
@@ -41,6 +43,29 @@ class Encoding(Enum):
     Utf8 = 'utf-8'
 
 
+class ParserBackend(Enum):
+    Python = 'python'
+    C = 'c'
+    Arrow = 'pyarrow'
+
+
+class TagFlushPolicy(Enum):
+    Immediate = 'immediate'
+    Stage = 'stage'
+
+
+class JournalStage(Enum):
+    Hashed = 'hashed'
+    ToBeProcessed = 'to_be_processed'
+    QualityChecked = 'quality_checked'
+    SummaryReported = 'summary_reported'
+    DetailedReported = 'detailed_reported'
+    Moved = 'moved'
+    TargetCopied = 'target_copied'
+    ParquetWritten = 'parquet_written'
+    CatalogUpdated = 'catalog_updated'
+
+
 class S3Object(Enum):
     VersionId = 'VersionId'
 
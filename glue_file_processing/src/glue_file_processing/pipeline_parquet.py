@@ -1,20 +1,21 @@
-import typing
+from typing import TYPE_CHECKING
 
 import pandas as pd
 from boto3 import Session
 
-from file_operations.context import Context as FileOperationsContext
-from file_operations.file_operations import S3FileOperations
-from gluecatalog.model import Column
 from gluecatalog.sanitize import sanitize_data_frame_col_names
-from serializer.parquet_util import ParquetUtil
-from serializer.parquet_writer import ParquetWriter
 
 from .logger import get_logger
 from .process_steps import ProcessSteps
+from .error_row_set import ErrorRowSet
 from .transform.extend import with_as_of_date, with_error_columns
 from .config import Config
-from .util.path import get_filename_timestamp, get_root_folder, get_file_name
+from .csv_parser import ParseSpec
+from .source_buffer import SourceBuffer
+from .util.file_key import FileKey
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 
 LOGGER = get_logger()
@@ -26,17 +27,12 @@ class PipelineParquet:
     row_index_col_name = 'row_index'
     correlation_id_col_name = 'correlation_id'
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, process_steps: ProcessSteps = None):
         self._session = session
-        self._process_step = ProcessSteps(self._session)
+        self._process_step = process_steps or ProcessSteps(self._session)
 
     def get_parquet_key(self, target_key: str, fmt: str) -> str:
-        root_folder = get_root_folder(target_key)
-        file_name = get_file_name(target_key, include_extension=False)
-        year, year_month, year_month_day = self.get_partition_values(file_name, fmt)
-        parquet_key = (f"{root_folder}/parquet/"
-                       f"year={year}/year_month={year_month}/year_month_day={year_month_day}/"
-                       f"{file_name}.parquet")
+        parquet_key = FileKey.parse(target_key, fmt).parquet_key
 
         LOGGER.info(f"Calculated parquet key '{parquet_key}'")
         return parquet_key
@@ -46,38 +42,66 @@ class PipelineParquet:
             target_bucket: str,
             target_key: str,
             config: Config,
-            error_indexes: pd.DataFrame,
-            correlation_id: str) -> str:
-        schema_columns = config.catalog_columns(include_calculated_cols=False)
-        parquet_key = self.get_parquet_key(target_key, config.filename_timestamp_fmt)
-        parquet_writer = ParquetWriter(self._session)
-        data_frame = self._get_dataframe(target_bucket, target_key, schema_columns, config.delimiter,
-                                         config.sanitize_columns)
-
-        timestamp = get_filename_timestamp(target_key, config.filename_timestamp_fmt)
-        df_with_as_of_date = with_as_of_date(data_frame, config.as_of_date, timestamp)
-        df_with_error_columns = with_error_columns(df_with_as_of_date, error_indexes, correlation_id, config.schema)
+            error_rows: ErrorRowSet,
+            correlation_id: str,
+            source: SourceBuffer = None) -> str:
+        # the serializer brings in pyarrow, it is imported when the first parquet file is written
+        from serializer.parquet_util import ParquetUtil  # pylint: disable=import-outside-toplevel
 
+        parquet_key = self.get_parquet_key(target_key, config.filename_timestamp_fmt)
         all_schema_columns = config.catalog_columns(include_calculated_cols=True)
         schema = ParquetUtil.create_schema(all_schema_columns)
-        parquet_writer.write_parquet_file(df_with_error_columns, schema, f"s3://{target_bucket}/{parquet_key}")
+
+        if config.parquet_chunk_size:
+            self._write_parquet_in_chunks(target_bucket, target_key, parquet_key, schema, config, error_rows,
+                                          correlation_id, source)
+        else:
+            data_frame = self._get_dataframe(target_bucket, target_key, config, source)
+            df_with_error_columns = self._with_calculated_columns(data_frame, target_key, config, error_rows,
+                                                                  correlation_id)
+            self._process_step.parquet_writer.write_parquet_file(df_with_error_columns, schema,
+                                                            f"s3://{target_bucket}/{parquet_key}")
         LOGGER.info(f"Created parquet file '{parquet_key}'")
         return parquet_key
 
-    def _get_dataframe(self, target_bucket: str, target_key: str, cols_flattened: typing.List[Column], delimiter: str,
-                       sanitize_columns: bool):
-        data_frame = self.__create_dataframe(target_bucket, target_key, delimiter)
-        data_frame = sanitize_data_frame_col_names(data_frame) if sanitize_columns else data_frame
-        return ParquetUtil.convert_data_frame(data_frame, cols_flattened)
-
-    def __create_dataframe(self, target_bucket: str, target_key: str, delimiter: str):
-        target_file_context = FileOperationsContext(file_key=target_key, file_bucket=target_bucket)
-        file_ops = S3FileOperations(session=self._session)
-        return file_ops.get_dataframe(context=target_file_context, delimiter=delimiter, engine='python')
+    @staticmethod
+    def _with_calculated_columns(data_frame: pd.DataFrame, target_key: str, config: Config,
+                                 error_rows: ErrorRowSet, correlation_id: str) -> pd.DataFrame:
+        timestamp = FileKey.parse(target_key, config.filename_timestamp_fmt).timestamp
+        df_with_as_of_date = with_as_of_date(data_frame, config.as_of_date, timestamp)
+        return with_error_columns(df_with_as_of_date, error_rows, correlation_id, config.schema)
+
+    def _write_parquet_in_chunks(self, target_bucket: str, target_key: str, parquet_key: str, schema: 'pa.Schema',
+                                 config: Config, error_rows: ErrorRowSet, correlation_id: str,
+                                 source: SourceBuffer = None):
+        # every chunk becomes a row group, so memory depends on the chunk size not the file size
+        owns_source = source is None
+        if owns_source:
+            source = self._process_step.load_source(target_bucket, target_key, None, config)
+        try:
+            with self._process_step.open_parquet_stream(schema, target_bucket, parquet_key) as parquet_stream:
+                chunks = source.iter_dataframes(config.delimiter, config.parser_backend,
+                                                ParseSpec.from_schema(config.schema), config.parquet_chunk_size)
+                for chunk in chunks:
+                    chunk = sanitize_data_frame_col_names(chunk) if config.sanitize_columns else chunk
+                    parquet_stream.write(self._with_calculated_columns(chunk, target_key, config, error_rows,
+                                                                       correlation_id))
+        finally:
+            if owns_source:
+                source.close()
+
+    def _get_dataframe(self, target_bucket: str, target_key: str, config: Config, source: SourceBuffer = None):
+        # the schema types are applied while parsing, so the frame is never held as strings and typed at once
+        parse_spec = ParseSpec.from_schema(config.schema)
+        if source:
+            data_frame = source.read_dataframe(config.delimiter, config.parser_backend, parse_spec)
+        else:
+            source = self._process_step.load_source(target_bucket, target_key, None, config)
+            try:
+                data_frame = source.read_dataframe(config.delimiter, config.parser_backend, parse_spec)
+            finally:
+                source.close()
+        return sanitize_data_frame_col_names(data_frame) if config.sanitize_columns else data_frame
 
     def get_partition_values(self, file_name: str, fmt: str) -> (str, str, str):
-        as_of_date = get_filename_timestamp(file_name, fmt)
-        year = as_of_date.strftime('%Y')
-        month = as_of_date.strftime('%m')
-        day = as_of_date.strftime('%d')
-        return year, f"{year}{month}", f"{year}{month}{day}"
+        return FileKey.parse(file_name, fmt).partition_values
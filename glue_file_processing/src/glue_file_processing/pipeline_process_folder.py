@@ -32,6 +32,9 @@ class PipelineProcessFolder:
             f"{self._get_timestamp_folder_structure()}/" \
             f"{FileSuffixPrefix.ErrorPrefix.value}{Path(self._file_name).stem}{FileSuffixPrefix.ErrorExtension.value}"
 
+    def journal(self, correlation_id: str):
+        return f"{self._root_folder}/{PipelineFolders.Journal.value}/{correlation_id}"
+
     def _get_timestamp_folder_structure(self):
         year, month = self._processed_on.split('-')[:2]
         return f"{year}/{year}{month}"
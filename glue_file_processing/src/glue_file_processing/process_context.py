@@ -1,4 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .run_journal import RunJournal
+from .tag_accumulator import TagAccumulator
 
 
 @dataclass
@@ -16,3 +20,9 @@ class ProcessContext:
     support_email: str
     error_details_crawler: str
     error_summary_crawler: str
+    file_size: Optional[int] = None
+    hash_value: Optional[str] = None
+    tags: Optional[TagAccumulator] = field(default=None, init=False, repr=False)
+    journal: Optional[RunJournal] = field(default=None, init=False, repr=False)
+    # set once the failure of the run has been sent as an error notification
+    failure_notified: bool = field(default=False, init=False, repr=False)
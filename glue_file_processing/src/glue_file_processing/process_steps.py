@@ -1,31 +1,38 @@
+import time
 from datetime import datetime
-from typing import Tuple, List, Dict
-from os import path
+from typing import TYPE_CHECKING, Tuple, List, Dict, Optional
 
 import pandas as pd
 
 from core.aws import AwsService, AwsRegion
 from file_operations.context import Context as FileOperationsContext
 from file_operations.file_operations import S3FileOperations
-from serializer.parquet_writer import ParquetWriter
 from file_operations.file_stream import ByteStream
 from file_operations.s3_file_stream_builder import S3FileStreamBuilder
 from hashing.stream_hash_generator import StreamHashGenerator
 from hashing.supported_algorithm import SupportedAlgorithm
 from sns.topics import Topic
-from tagger.context import Context as TaggerContext
-from tagger.tagger import Tagger
-from data_quality.rule_manager import RuleManager
+from data_quality.model import RuleResult
 
+from .error_report_writer import DetailedErrorReportWriter
 from .logger import get_logger
 from .notification import Notification
 from .payload_builder import PayloadBuilder
-from .pipeline_enum import S3Object, TagKeys, SnsStatus
+from .pipeline_enum import TagKeys, SnsStatus
 from .process_context import ProcessContext
+from .parquet_stream_writer import ParquetStreamWriter
 from .pipeline_configuration import CONFIGURATION
-from .util.path import get_file_name, get_root_folder, get_filename_timestamp
+from .s3_transition import S3Transition
+from .source_buffer import SourceBuffer
+from .util.file_key import FileKey
+from .util.path import get_root_folder
 from .transform.extend import with_as_of_date, with_as_of_date_from_timestamp
 from .config import Config, ColumnConfig
+from .csv_parser import pandas_engine
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    from serializer.parquet_writer import ParquetWriter
 
 LOGGER = get_logger()
 
@@ -34,6 +41,33 @@ LOGGER = get_logger()
 class ProcessSteps:
     def __init__(self, session):
         self._session = session
+        self._tagger = None
+        self._file_operations = None
+        self._parquet_writer = None
+        self._transition = None
+
+    @property
+    def file_operations(self) -> S3FileOperations:
+        if self._file_operations is None:
+            self._file_operations = S3FileOperations(self._session)
+        return self._file_operations
+
+    @property
+    def transition(self) -> S3Transition:
+        if self._transition is None:
+            self._transition = S3Transition(self._session)
+        return self._transition
+
+    @property
+    def parquet_writer(self) -> 'ParquetWriter':
+        if self._parquet_writer is None:
+            # the serializer, tagger and rule engine are imported on first use so they stay out of the start-up
+            from serializer.parquet_writer import ParquetWriter  # pylint: disable=import-outside-toplevel
+            self._parquet_writer = ParquetWriter(self._session)
+        return self._parquet_writer
+
+    def open_parquet_stream(self, schema: 'pa.Schema', bucket: str, key: str) -> ParquetStreamWriter:
+        return ParquetStreamWriter(self._session, schema, bucket, key)
 
     def _get_file_stream(self, file_bucket: str, file_key: str) -> ByteStream:
         s3_stream_builder = S3FileStreamBuilder(
@@ -43,42 +77,37 @@ class ProcessSteps:
         return s3_file_stream
 
     def delete_file(self, file_ops_context: FileOperationsContext):
-        file_operations = S3FileOperations(self._session)
-        file_operations.delete(file_ops_context)
+        start = time.perf_counter()
+        self.file_operations.delete(file_ops_context)
         LOGGER.info(
-            f"Deleted file '{file_ops_context.file_bucket}/{file_ops_context.file_key}'")
+            f"Deleted file '{file_ops_context.file_bucket}/{file_ops_context.file_key}' "
+            f"in {(time.perf_counter() - start) * 1000:.0f} ms")
 
-    def move_file(self, file_ops_context: FileOperationsContext):
-        self.copy_file(file_ops_context)
+    def move_file(self, file_ops_context: FileOperationsContext, size: Optional[int] = None) -> Optional[str]:
+        version_id = self.copy_file(file_ops_context, size)
         self.delete_file(file_ops_context)
-
-    def copy_file(self, file_ops_context: FileOperationsContext):
-        S3FileOperations(self._session).copy(file_ops_context)
-        LOGGER.info(f"Copied file from '{file_ops_context.file_bucket}/{file_ops_context.file_key}' to "
-                    f"'{file_ops_context.target_bucket}/{file_ops_context.target_key}'")
-
-    def write_detailed_error_report(self, data_frames, bucket, key):
-        if all(df.empty for df in data_frames):
-            return pd.DataFrame(columns=['row_index'])
-
-        df = ParquetWriter(self._session).write_parquet_file_noschema(
-            data_frames=data_frames,
-            bucket=bucket,
-            key=key
-        )
-        error_count = len(df.index)
-        if error_count > 0:
-            LOGGER.info(f"Wrote details for {error_count} data quality errors to s3://{bucket}/{key}.")
-        else:
-            LOGGER.info(f"There were no data quality errors so no error details file was written.")
-
-        return df
+        return version_id
+
+    def copy_file(self, file_ops_context: FileOperationsContext, size: Optional[int] = None) -> Optional[str]:
+        """Copies the file server side and returns the version id of the copy."""
+        result = self.transition.copy(
+            file_bucket=file_ops_context.file_bucket,
+            file_key=file_ops_context.file_key,
+            file_version_id=file_ops_context.file_version_id,
+            target_bucket=file_ops_context.target_bucket,
+            target_key=file_ops_context.target_key,
+            size=size)
+        return result.version_id
+
+    def write_detailed_error_report(self, rule_results: List[RuleResult], bucket: str, key: str,
+                                    max_workers: int = 1) -> List['pa.Schema']:
+        return DetailedErrorReportWriter(self._session, max_workers).write(rule_results, bucket, key)
 
     def write_summary_error_report(self, summary_df, bucket, key, config):
-        timestamp = get_filename_timestamp(key, config.filename_timestamp_fmt)
+        timestamp = FileKey.parse(key, config.filename_timestamp_fmt).timestamp
         summary_df = with_as_of_date_from_timestamp(summary_df, timestamp)
 
-        ParquetWriter(self._session).write_parquet_file_noschema(
+        self.parquet_writer.write_parquet_file_noschema(
             data_frames=[summary_df],
             bucket=bucket,
             key=key
@@ -89,11 +118,7 @@ class ProcessSteps:
         return summary_df
 
     def get_version_id(self, target_bucket: str, target_key: str):
-        obj = self._session.client(AwsService.S3.value).get_object(
-            Bucket=target_bucket,
-            Key=target_key
-        )
-        return obj[S3Object.VersionId.value]
+        return self.transition.get_version_id(target_bucket, target_key)
 
     def calculate_hash(self, file_bucket: str, file_key: str) -> str:
         s3_file_stream = self._get_file_stream(file_bucket=file_bucket, file_key=file_key)
@@ -103,12 +128,20 @@ class ProcessSteps:
         LOGGER.info(f"Calculated hash for '{file_bucket}/{file_key}'")
         return hash_value
 
+    def load_source(self, file_bucket: str, file_key: str, file_version_id: str, config: Config) -> SourceBuffer:
+        source = SourceBuffer(self._session, file_bucket, file_key, file_version_id,
+                              max_memory_size=config.source_buffer_max_memory)
+        return source.load()
+
     def tag_file(self, tags: dict, file_bucket: str, file_key: str, file_version_id: str):
-        tagger = Tagger(session=self._session, allowed_tags=[
-            key.value for key in TagKeys])
+        from tagger.context import Context as TaggerContext  # pylint: disable=import-outside-toplevel
+
+        if self._tagger is None:
+            from tagger.tagger import Tagger  # pylint: disable=import-outside-toplevel
+            self._tagger = Tagger(session=self._session, allowed_tags=[key.value for key in TagKeys])
         tagger_context = TaggerContext(
             file_key=file_key, file_bucket=file_bucket, file_version_id=file_version_id)
-        tagger.put_tags(tags, tagger_context)
+        self._tagger.put_tags(tags, tagger_context)
         tag_keys = ', '.join(tags.keys())
         LOGGER.info(f"Tagged file '{file_bucket}/{file_key}' with {tag_keys}")
 
@@ -119,11 +152,29 @@ class ProcessSteps:
             file_version: str,
             correlation_id: str,
             processed_on: datetime,
+            config: Config,
+            source: SourceBuffer = None):
+        if source:
+            source_df = source.get_dataframe(config.delimiter, config.parser_backend)
+        else:
+            file_context = FileOperationsContext(file_key, file_bucket)
+            source_df = self.file_operations.get_dataframe(context=file_context, delimiter=config.delimiter,
+                                                           engine=pandas_engine(config.parser_backend))
+        return self.run_data_quality(source_df, file_bucket, file_key, file_version, correlation_id, processed_on,
+                                     config)
+
+    @staticmethod
+    def run_data_quality(
+            source_df: pd.DataFrame,
+            file_bucket: str,
+            file_key: str,
+            file_version: str,
+            correlation_id: str,
+            processed_on: datetime,
             config: Config):
-        file_ops = S3FileOperations(session=self._session)
-        file_context = FileOperationsContext(file_key, file_bucket)
-        source_df = file_ops.get_dataframe(context=file_context, delimiter=config.delimiter, engine='python')
-        timestamp = get_filename_timestamp(file_key, config.filename_timestamp_fmt)
+        from data_quality.rule_manager import RuleManager  # pylint: disable=import-outside-toplevel
+
+        timestamp = FileKey.parse(file_key, config.filename_timestamp_fmt).timestamp
         source_df_with_asofdate = with_as_of_date(source_df, config.as_of_date, timestamp)
 
         return RuleManager.check_data_quality(
@@ -143,32 +194,17 @@ class ProcessSteps:
             self._session, payload, context.correlation_id)
 
     def get_target_key(self, file_key: str, fmt: str) -> str:
-        root_folder = get_root_folder(file_key)
-        file_name = get_file_name(file_key)
-        year, month, _ = self._extract_dateparts(file_name, fmt)
-        target_key = f"{root_folder}/{year}/{year}{month}/{file_name}"
+        target_key = FileKey.parse(file_key, fmt).target_key
         LOGGER.info(f"Calculated target key '{target_key}'")
         return target_key
 
     def get_error_key(self, file_key: str, fmt: str, level: str) -> str:
-        business_area, business_process, data_source = self.extract_business_details(file_key)
-        file_name = get_file_name(file_key)
-        file_name_noext = path.splitext(file_name)[0]
-        year, month, _ = self._extract_dateparts(file_name, fmt)
-        area_error_root = f'{business_area}/error_reporting/{level}'
-        target_key = (
-            f"{area_error_root}/year={year}/year_month={year}{month}/"
-            f"process={business_process}/data_source={data_source}/"
-            f"{file_name_noext}.parquet.snappy")
+        target_key = FileKey.parse(file_key, fmt).error_key(level)
         LOGGER.info(f"Calculated {level} error key '{target_key}'")
         return target_key
 
     def _extract_dateparts(self, file_name: str, fmt: str) -> Tuple[str, str, str]:
-        as_of_date = get_filename_timestamp(file_name, fmt)
-        year = as_of_date.strftime('%Y')
-        month = as_of_date.strftime('%m')
-        day = as_of_date.strftime('%d')
-        return year, month, day
+        return FileKey.parse(file_name, fmt).date_parts
 
     def extract_business_details(self, file_key: str):
         root_folder = get_root_folder(file_key)
@@ -180,11 +216,7 @@ class ProcessSteps:
         return f"{business_area.lower()}_errors_{reporting_level.lower()}"
 
     def extract_detail_partition_values(self, file_key: str, fmt: str) -> List[str]:
-        root_folder = get_root_folder(file_key)
-        root_parts = root_folder.split('/')
-        file_name = get_file_name(file_key)
-        year, month, _ = self._extract_dateparts(file_name, fmt)
-        return [year, f"{year}{month}", root_parts[1], root_parts[2]]
+        return FileKey.parse(file_key, fmt).detail_partition_values
 
     @staticmethod
     def is_calculated_column(col_info: Dict) -> bool:
@@ -1,7 +1,10 @@
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from os import path, remove
 from traceback import extract_tb, format_list
-from typing import List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Generator, List, Optional
 from datetime import datetime
-import pandas as pd
 
 from core.aws import AwsRegion, AwsService
 from file_operations.context import Context as FileOperationsContext
@@ -9,17 +12,31 @@ from file_operations.exceptions import MissingValueError
 from sns.topics import Topic
 from data_quality.model import CheckResult, RuleException, RuleStatus, RuleResult
 from tagger.exceptions import TaggerException
-from gluecatalog.crawler import start_crawler
 from .boto_session import BotoSession
+from .client_registry import CLIENT_REGISTRY
+from .error_catalog import ErrorCatalog, arrow_schema
+from .error_row_set import ErrorRowSet
+from .hash_index import HashIndex, HashRecord, SqliteHashIndex
 from .logger import get_logger
+from .partition_registrar import PartitionRegistrar
 from .pipeline_catalog import PipelineCatalog
 from .pipeline_configuration import CONFIGURATION
-from .pipeline_enum import TagKeys, TagValues, SnsStatus, CatalogDatabase
+from .pipeline_enum import TagKeys, TagValues, SnsStatus, CatalogDatabase, JournalStage
 from .pipeline_parquet import PipelineParquet
 from .pipeline_process_folder import PipelineProcessFolder
 from .process_context import ProcessContext
 from .process_steps import ProcessSteps
+from .run_journal import RunJournal
+from .source_buffer import SourceBuffer
+from .state_store import S3StateStore
+from .step_scheduler import StepScheduler
+from .tag_accumulator import TagAccumulator
+from .util.file_key import FileKey
 from .config import Config
+from .data_quality_pool import STACKTRACE, DataQualityRequest, check_data_quality_from_file
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 
 LOGGER = get_logger()
@@ -45,6 +62,16 @@ ERROR_SUBJECT = "{business_process} Failed"
 URI = "{s3_aws_service}://{file_bucket}/{file_key}"
 
 
+class BatchProcessingError(Exception):
+    def __init__(self, failed_files: List[str], unnotified_files: List[str] = None,
+                 skipped: List[ProcessContext] = None):
+        self.failed_files = failed_files
+        # the failed files nobody was told about, only a retry of the run would surface these
+        self.unnotified_files = unnotified_files or []
+        self.skipped = skipped or []
+        super().__init__(f"Unable to process {len(failed_files)} file(s): {', '.join(failed_files)}")
+
+
 class ErrorReportLevel:
     DETAILED = 'detailed'
     SUMMARY = 'summary'
@@ -52,76 +79,349 @@ class ErrorReportLevel:
 
 class Processor:
     def __init__(self):
-        self._session = BotoSession().get_session(AwsRegion.EUIreland)
-        self._process_steps = ProcessSteps(self._session)
-        self.pipeline_catalog = PipelineCatalog(self._session)
         self.config = Config(CONFIGURATION)
+        CLIENT_REGISTRY.configure(max_pool_connections=self.config.client_pool_size)
+        self._session = BotoSession().get_shared_session(AwsRegion.EUIreland)
+        self._process_steps = ProcessSteps(self._session)
+        self._pipeline_parquet = PipelineParquet(self._session, self._process_steps)
+        self.pipeline_catalog = PipelineCatalog(
+            self._session, self._process_steps, self._pipeline_parquet,
+            PartitionRegistrar(self._session, max_delay=self.config.partition_flush_delay))
+        self.error_catalog = ErrorCatalog(self._session)
+        self.hash_index: Optional[HashIndex] = (
+            SqliteHashIndex(self.config.hash_index_path) if self.config.hash_index_path else None)
+
+    def run_batch(self, contexts: List[ProcessContext],
+                  has_time: Callable[[], bool] = None) -> List[ProcessContext]:
+        """Runs every file in the same process, one failing file does not stop the rest of the batch.
+
+        With ``max_workers`` above one the data quality checks run in a process pool, while every S3, SNS and
+        catalog call stays in this process. ``has_time`` is asked before every file is started, once it returns
+        false the remaining files are skipped and returned untouched.
+        """
+        failures: Dict[str, ProcessContext] = {}
+        started = 0
+        try:
+            if self.config.max_workers > 1 and len(contexts) > 1:
+                started = self._run_batch_in_pool(contexts, failures, has_time)
+            else:
+                for context in contexts:
+                    if has_time and not has_time():
+                        break
+                    started += 1
+                    self._run_isolated(self._file_uri(context), context, failures, self.run, context)
+        finally:
+            try:
+                self.close()
+            except Exception:  # pylint: disable=broad-except
+                # partitions registered by a file are reported against it, only unattributed failures get here
+                LOGGER.exception("Unable to register the remaining catalog partitions")
+
+        skipped = contexts[started:]
+        LOGGER.info(f"Processed {started - len(failures)} of {len(contexts)} file(s)"
+                    f"{f', skipped {len(skipped)} for lack of time' if skipped else ''}")
+        CLIENT_REGISTRY.log_stats()
+        if failures:
+            raise BatchProcessingError(
+                list(failures),
+                [file_uri for file_uri, context in failures.items() if not context.failure_notified],
+                skipped)
+        return skipped
+
+    def close(self):
+        """Registers the catalog partitions still waiting, call once no more files will be processed."""
+        self.pipeline_catalog.flush_partitions()
+
+    def _run_batch_in_pool(self, contexts: List[ProcessContext], failures: Dict[str, ProcessContext],
+                           has_time: Callable[[], bool] = None) -> int:
+        LOGGER.info(f"Checking data quality of {len(contexts)} files with {self.config.max_workers} processes")
+        started = 0
+        with tempfile.TemporaryDirectory() as work_dir, ProcessPoolExecutor(self.config.max_workers) as pool:
+            # keep as many files ahead as there are workers, so the pool stays busy while results are handled
+            in_flight = deque()
+            for index, context in enumerate(contexts):
+                if has_time and not has_time():
+                    break
+                started += 1
+                # the uri is taken up front, the run moves the file on from its raw location
+                file_uri = self._file_uri(context)
+                source_path = path.join(work_dir, str(index))
+                submitted = self._run_isolated(file_uri, context, failures, self._submit_file, context, pool,
+                                               source_path)
+                in_flight.append((file_uri, context, submitted))
+                if len(in_flight) > self.config.max_workers:
+                    file_uri, context, submitted = in_flight.popleft()
+                    self._run_isolated(file_uri, context, failures, self._finish_file, submitted)
+            while in_flight:
+                file_uri, context, submitted = in_flight.popleft()
+                self._run_isolated(file_uri, context, failures, self._finish_file, submitted)
+        return started
+
+    def _submit_file(self, context: ProcessContext, pool: ProcessPoolExecutor, source_path: str):
+        stages = self._run_stages(context)
+        request = next(stages, None)
+        if request is None:
+            return None
+        try:
+            request.source.write_to(source_path)
+            future = pool.submit(check_data_quality_from_file, source_path, request.file_bucket, request.file_key,
+                                 request.file_version, request.correlation_id, request.processed_on)
+        except Exception as ex:  # pylint: disable=broad-except
+            self._resume(stages, lambda: stages.throw(ex))
+            return None
+        return stages, future, source_path
+
+    def _finish_file(self, submitted):
+        # nothing left to do when the file did not reach the data quality check
+        if not submitted:
+            return
+        stages, future, source_path = submitted
+        try:
+            check_result = future.result()
+        except Exception as ex:  # pylint: disable=broad-except
+            # thrown into the run stages so the error is handled exactly as in a single file run
+            self._resume(stages, lambda: stages.throw(ex))
+        else:
+            self._resume(stages, lambda: stages.send(check_result))
+        finally:
+            remove(source_path)
 
-    def run(self, context: ProcessContext):
-        pipeline_process_folder = PipelineProcessFolder(context.file_key, context.processed_on)
+    @staticmethod
+    def _file_uri(context: ProcessContext) -> str:
+        return f"{context.file_bucket}/{context.file_key}"
+
+    @staticmethod
+    def _run_isolated(file_uri: str, context: ProcessContext, failures: Dict[str, ProcessContext], func, *args):
         try:
-            self._tag_file_with_hash(file_bucket=context.file_bucket, file_key=context.file_key,
-                                     file_version_id=context.file_version_id)
-            self._copy_from_raw_to_to_be_processed(context, pipeline_process_folder.to_be_processed)
+            return func(*args)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception(f"Processing failed for file '{file_uri}', continuing with the rest of the batch")
+            failures[file_uri] = context
+            return None
 
-            self._tag_file_with_correlation_id(context)
+    @staticmethod
+    def _resume(stages: Generator, step):
+        try:
+            step()
+        except StopIteration:
+            return
+        raise RuntimeError("The run stages yielded more than one data quality request")
+
+    def run(self, context: ProcessContext):
+        stages = self._run_stages(context)
+        request = next(stages, None)
+        if request is None:
+            return
+        try:
             check_result = self._process_steps.check_data_quality(
-                file_bucket=context.file_bucket,
-                file_key=context.file_key,
-                file_version=context.file_version_id,
-                correlation_id=context.correlation_id,
-                processed_on=datetime.strptime(context.processed_on, "%Y-%m-%dT%H:%M:%S.%fZ"),
-                config=self.config)
+                file_bucket=request.file_bucket,
+                file_key=request.file_key,
+                file_version=request.file_version,
+                correlation_id=request.correlation_id,
+                processed_on=request.processed_on,
+                config=self.config,
+                source=request.source)
+        except Exception as ex:  # pylint: disable=broad-except
+            self._resume(stages, lambda: stages.throw(ex))
+        else:
+            self._resume(stages, lambda: stages.send(check_result))
+
+    def _run_stages(self, context: ProcessContext) -> Generator[DataQualityRequest, CheckResult, None]:
+        """The steps of a run, paused at the data quality check which is sent back in by the caller.
+
+        A run retried after the data quality check takes the recorded result from its journal and carries on
+        with the first stage it had not completed.
+        """
+        pipeline_process_folder = PipelineProcessFolder(context.file_key, context.processed_on)
+        source = None
+        finished = False
+        context.tags = TagAccumulator(self._process_steps.tag_file, self.config.tag_flush_policy)
+        context.journal = self._open_journal(context, pipeline_process_folder)
+        try:
+            check_result = context.journal.check_result()
+            if check_result is not None:
+                context.journal.restore(context)
+                LOGGER.info(f"Data quality of '{context.file_bucket}/{context.file_key}' was checked by an earlier "
+                            f"attempt, carrying on from there")
+            else:
+                source = self._process_steps.load_source(file_bucket=context.file_bucket, file_key=context.file_key,
+                                                         file_version_id=context.file_version_id, config=self.config)
+                context.file_size = source.size
+                context.hash_value = source.hash_value
+                if context.journal.done(JournalStage.ToBeProcessed):
+                    context.journal.restore(context)
+                else:
+                    self._tag_file_with_hash(context, hash_value=source.hash_value)
+                    context.journal.record(JournalStage.Hashed, context)
+                    self._copy_from_raw_to_to_be_processed(context, pipeline_process_folder.to_be_processed)
+
+                    self._tag_file_with_correlation_id(context)
+                    context.journal.record(JournalStage.ToBeProcessed, context)
+                earlier_run = self._find_earlier_run(context)
+                if earlier_run:
+                    self._handle_resent_file(context, pipeline_process_folder, earlier_run)
+                    finished = True
+                    return
+                check_result = yield DataQualityRequest(
+                    file_bucket=context.file_bucket,
+                    file_key=context.file_key,
+                    file_version=context.file_version_id,
+                    correlation_id=context.correlation_id,
+                    processed_on=datetime.strptime(context.processed_on, "%Y-%m-%dT%H:%M:%S.%fZ"),
+                    source=source)
+                # the untyped frame is only needed by the data quality rules, parquet re-reads the buffer typed
+                source.release_dataframes()
+                context.journal.record_check_result(context, check_result)
 
             self._tag_file_with_quality_score(context, check_result)
-            self._create_summary_error_report(context, check_result)
-            error_indexes = self._create_detailed_error_report(context, check_result)
-            self._handle_result(
-                context,
-                pipeline_process_folder,
-                check_result.has_passed(),
-                error_indexes=error_indexes)
-            rule_errors = [result for result in check_result.rule_results if result.status == RuleStatus.Error]
-            if rule_errors:
-                self._send_rule_error_notification(context, rule_errors)
+            self._run_result_steps(context, pipeline_process_folder, check_result, source)
+            finished = True
 
         except TaggerException as ex:
             LOGGER.exception(f"Pipeline failed due to tagging error: {ex}")
             self._handle_failed_pipeline(context, pipeline_process_folder)
+            finished = True
         except RuleException as ex:
             LOGGER.exception(f"Unable to run Data Quality rules due to error: {ex}")
             self._handle_failed_pipeline(context, pipeline_process_folder)
+            finished = True
         except MissingValueError as mve:
             LOGGER.exception(f"Unable to complete pipeline due to missing value {mve}")
             raise
         except Exception as ex:
             self._handle_unknown_errors(context, ex)
             raise
-
-    def _handle_result(self, context: ProcessContext, pipeline_process_folder: PipelineProcessFolder, has_passed: bool,
-                       error_indexes):
+        finally:
+            if source:
+                source.close()
+            self._flush_remaining_tags(context)
+            # a run that did not finish keeps its journal for the retry
+            if finished:
+                context.journal.clear()
+
+    def _open_journal(self, context: ProcessContext, pipeline_process_folder: PipelineProcessFolder) -> RunJournal:
+        store = S3StateStore(self._session, context.file_bucket) if self.config.run_journal else None
+        return RunJournal(store, pipeline_process_folder.journal(context.correlation_id))
+
+    def _run_result_steps(self, context: ProcessContext, pipeline_process_folder: PipelineProcessFolder,
+                          check_result: CheckResult, source: SourceBuffer):
+        scheduler = StepScheduler(self.config.step_workers)
+        scheduler.add('summary_report', lambda: self._create_summary_error_report(context, check_result))
+        scheduler.add('detailed_report', lambda: self._create_detailed_error_report(context, check_result))
+        scheduler.add('result',
+                      lambda *_: self._handle_result(context, pipeline_process_folder, check_result.has_passed()),
+                      'summary_report', 'detailed_report')
+        scheduler.add('catalog_parquet',
+                      lambda target_key, error_rows: self._handle_catalog_parquet(
+                          context, target_key, error_rows, source),
+                      'result', 'detailed_report')
+        scheduler.add('rule_error_notification',
+                      lambda _: self._send_rule_error_notifications(context, check_result),
+                      'result')
+        if self.hash_index:
+            scheduler.add('hash_index',
+                          lambda target_key, parquet_key: self._remember_run(
+                              context, check_result, target_key, parquet_key),
+                          'result', 'catalog_parquet')
+        scheduler.run()
+
+    def _handle_result(self, context: ProcessContext, pipeline_process_folder: PipelineProcessFolder,
+                       has_passed: bool) -> Optional[str]:
+        # write the data quality tags here so tagging errors are still handled by run
+        context.tags.flush()
         if has_passed:
-            target_key = self._handle_successful_quality_check(
-                context=context, pipeline_process_folder=pipeline_process_folder)
-            self._handle_catalog_parquet(context, target_key, error_indexes)
-        else:
-            self._handle_failed_pipeline(
+            return self._handle_successful_quality_check(
                 context=context, pipeline_process_folder=pipeline_process_folder)
-
-    def _handle_catalog_parquet(self, context, target_key: str, error_indexes):
-        parquet_key = None
+        self._handle_failed_pipeline(
+            context=context, pipeline_process_folder=pipeline_process_folder)
+        return None
+
+    def _handle_catalog_parquet(self, context, target_key: Optional[str], error_rows: ErrorRowSet,
+                                source: SourceBuffer) -> Optional[str]:
+        # there is no target key when the file failed its data quality check
+        if target_key is None:
+            return None
+        parquet_key = context.journal.get(JournalStage.ParquetWritten).get('parquet_key')
         try:
-            parquet_key = self._write_parquet_file(
-                context=context, target_key=target_key, error_indexes=error_indexes)
-            self.pipeline_catalog.update_glue_catalog(
-                context.target_bucket,
-                target_key,
-                context.pipeline_name,
-                self.config)
+            if parquet_key is None:
+                parquet_key = self._write_parquet_file(
+                    context=context, target_key=target_key, error_rows=error_rows, source=source)
+                context.journal.record(JournalStage.ParquetWritten, context, parquet_key=parquet_key)
+            if not self._completed_before(context, JournalStage.CatalogUpdated, parquet_key=parquet_key):
+                self.pipeline_catalog.update_glue_catalog(
+                    context.target_bucket,
+                    target_key,
+                    context.pipeline_name,
+                    self.config,
+                    on_partition_failure=lambda ex: self._handle_late_catalog_error(context, parquet_key, ex))
+                context.journal.record(JournalStage.CatalogUpdated, context, parquet_key=parquet_key)
         except Exception as ex:  # pylint: disable=broad-except
             LOGGER.exception(f'Unable to create Parquet/Catalog: {ex}')
             self._delete_parquet_file(context.target_bucket, parquet_key)
             self._send_parquet_catalog_error_notification(context, ex)
+            return None
+        return parquet_key
+
+    def _handle_late_catalog_error(self, context: ProcessContext, parquet_key: str, exception: Exception):
+        # the partition was flushed after the run of the file, so it is handled as a catalog failure of that file
+        LOGGER.error(f"Unable to register the partition of '{context.file_bucket}/{context.file_key}': {exception}")
+        self._delete_parquet_file(context.target_bucket, parquet_key)
+        self._forget_run(context, parquet_key)
+        self._send_parquet_catalog_error_notification(context, exception)
+
+    def _find_earlier_run(self, context: ProcessContext) -> Optional[HashRecord]:
+        if self.hash_index is None or self.config.force_reprocess:
+            return None
+        earlier_run = self.hash_index.get(context.hash_value)
+        if earlier_run is None:
+            return None
+
+        # the file name sets the target, as of date and partition, so only a file resent as is can be skipped
+        target_key = self._find_target_key(context, self.config.filename_timestamp_fmt)
+        if self._pipeline_parquet.get_parquet_key(target_key, self.config.filename_timestamp_fmt) \
+                != earlier_run.parquet_key:
+            LOGGER.info(f"File '{context.file_bucket}/{context.file_key}' has the same content as "
+                        f"'{earlier_run.file_key}' under another name, it will be processed")
+            return None
+        return earlier_run
+
+    def _handle_resent_file(self, context: ProcessContext, pipeline_process_folder: PipelineProcessFolder,
+                            earlier_run: HashRecord):
+        LOGGER.info(f"File '{context.file_bucket}/{context.file_key}' was processed before by run "
+                    f"'{earlier_run.correlation_id}', reusing its parquet file '{earlier_run.parquet_key}'")
+        tags = dict(earlier_run.quality_tags, **{TagKeys.DuplicateOf.value: earlier_run.correlation_id})
+        context.tags.add(tags, file_bucket=context.file_bucket, file_key=context.file_key,
+                         file_version_id=context.file_version_id)
+        self._handle_successful_quality_check(context=context, pipeline_process_folder=pipeline_process_folder)
+
+    def _remember_run(self, context: ProcessContext, check_result: CheckResult, target_key: Optional[str],
+                      parquet_key: Optional[str]):
+        # only runs that got all the way to the catalog can be reused
+        if target_key is None or parquet_key is None:
+            return
+        try:
+            self.hash_index.put(HashRecord(
+                hash_value=context.hash_value,
+                correlation_id=context.correlation_id,
+                file_key=context.file_key,
+                target_key=target_key,
+                parquet_key=parquet_key,
+                partition_location=f"s3://{context.target_bucket}/{parquet_key.rsplit('/', 1)[0]}/",
+                quality_tags={key: str(value) for key, value in self._quality_tags(check_result).items()}))
+        except Exception as ex:  # pylint: disable=broad-except
+            LOGGER.warning(f"Unable to remember the run of '{context.file_bucket}/{context.file_key}': {ex}")
+
+    def _forget_run(self, context: ProcessContext, parquet_key: str):
+        # a resent file must not be matched to a parquet file that was deleted
+        if self.hash_index is None:
+            return
+        try:
+            earlier_run = self.hash_index.get(context.hash_value)
+            if earlier_run is not None and earlier_run.correlation_id == context.correlation_id \
+                    and earlier_run.parquet_key == parquet_key:
+                self.hash_index.delete(context.hash_value)
+        except Exception as ex:  # pylint: disable=broad-except
+            LOGGER.warning(f"Unable to forget the run of '{context.file_bucket}/{context.file_key}': {ex}")
 
     def _handle_successful_quality_check(self, context: ProcessContext, pipeline_process_folder: PipelineProcessFolder):
         try:
@@ -139,6 +439,7 @@ class Processor:
             self._move_from_to_be_processed_to_error(
                 context, pipeline_process_folder.error)
             self._tag_file_with_failed(context)
+            context.tags.flush()
             self._handle_unknown_errors(context, ex)
             raise
         else:
@@ -150,6 +451,7 @@ class Processor:
             self._move_from_to_be_processed_to_error(
                 context, pipeline_process_folder.error)
             self._tag_file_with_failed(context)
+            context.tags.flush()
             self._send_pipeline_error_notification(context)
         except Exception as ex:  # pylint: disable=broad-except
             self._handle_unknown_errors(context, ex)
@@ -160,88 +462,106 @@ class Processor:
         self._send_unknown_error_notification(
             context=context,
             exception=exception)
+        context.failure_notified = True
 
-    def _calculate_hash(self, file_bucket: str, file_key: str):
-        return self._process_steps.calculate_hash(file_bucket, file_key)
+    @staticmethod
+    def _flush_remaining_tags(context: ProcessContext):
+        try:
+            context.tags.flush()
+        except Exception as ex:  # pylint: disable=broad-except
+            LOGGER.exception(f"Unable to write the remaining tags for '{context.file_bucket}/{context.file_key}': {ex}")
+        context.tags.log_summary()
 
-    def _tag_file_with_hash(self, file_bucket: str, file_key: str, file_version_id: str):
-        hash_value = self._calculate_hash(file_bucket, file_key)
-        self._process_steps.tag_file(
-            {TagKeys.Hash.value: hash_value}, file_bucket=file_bucket, file_key=file_key,
-            file_version_id=file_version_id)
+    def _tag_file_with_hash(self, context: ProcessContext, hash_value: str):
+        context.tags.add({TagKeys.Hash.value: hash_value}, file_bucket=context.file_bucket,
+                         file_key=context.file_key, file_version_id=context.file_version_id)
 
     def _tag_file_with_correlation_id(self, context: ProcessContext):
-        self._process_steps.tag_file(tags={TagKeys.CorrelationId.value: context.correlation_id},
-                                     file_key=context.file_key, file_bucket=context.file_bucket,
-                                     file_version_id=context.file_version_id)
+        context.tags.add(tags={TagKeys.CorrelationId.value: context.correlation_id},
+                         file_key=context.file_key, file_bucket=context.file_bucket,
+                         file_version_id=context.file_version_id)
 
     def _tag_file_with_processed(self, context: ProcessContext):
         tags = {TagKeys.Status.value: TagValues.Processed.value}
-        self._process_steps.tag_file(tags, file_bucket=context.file_bucket, file_key=context.file_key,
-                                     file_version_id=context.file_version_id)
+        context.tags.add(tags, file_bucket=context.file_bucket, file_key=context.file_key,
+                         file_version_id=context.file_version_id)
 
     def _tag_file_with_quality_score(self, context: ProcessContext, check_result: CheckResult):
+        context.tags.add(self._quality_tags(check_result), file_key=context.file_key, file_bucket=context.file_bucket,
+                         file_version_id=context.file_version_id)
+
+    @staticmethod
+    def _quality_tags(check_result: CheckResult) -> Dict[str, str]:
         results = check_result.rule_results
         score_summary = [f"{rule_result.rule_name}={rule_result.score}" for rule_result in results if
                          rule_result.score is not None]
         score_summary_str = ":".join(score_summary)
         status_summary = [f"{rule_result.rule_name}={rule_result.status}" for rule_result in results]
         status_summary_str = ":".join(status_summary)
-        tags = {TagKeys.QualityScore.value: check_result.overall_score,
+        return {TagKeys.QualityScore.value: check_result.overall_score,
                 TagKeys.QualityScoreSummary.value: score_summary_str,
                 TagKeys.QualityStatusSummary.value: status_summary_str}
 
-        self._process_steps.tag_file(tags, file_key=context.file_key, file_bucket=context.file_bucket,
-                                     file_version_id=context.file_version_id)
-
-    def _create_detailed_error_report(self, context: ProcessContext, check_result: CheckResult):
-        error_dataframes = [result.errors_df for result in check_result.rule_results]
+    def _create_detailed_error_report(self, context: ProcessContext, check_result: CheckResult) -> ErrorRowSet:
+        error_rows = ErrorRowSet.from_rule_results(check_result.rule_results)
+        LOGGER.info(f"{len(error_rows)} row(s) failed at least one data quality rule")
+        # a resumed run only has the failing row indexes, so a report written before the retry is kept
+        if context.journal.done(JournalStage.DetailedReported):
+            return error_rows
 
         error_key = self._process_steps.get_error_key(
             context.file_key,
             self.config.filename_timestamp_fmt,
             ErrorReportLevel.DETAILED)
-        df = self._process_steps.write_detailed_error_report(
-            data_frames=error_dataframes,
+        schemas = self._process_steps.write_detailed_error_report(
+            rule_results=check_result.rule_results,
             bucket=context.target_bucket,
-            key=error_key)
-        return self._detect_and_update_schema_changes(
-            context=context, df=df, col='row_index', crawler=context.error_details_crawler, reporting_level=ErrorReportLevel.DETAILED)
+            key=error_key,
+            max_workers=self.config.report_workers)
+        self._release_error_details(check_result)
+        self._detect_and_update_schema_changes(
+            context=context, schemas=schemas, crawler=context.error_details_crawler,
+            reporting_level=ErrorReportLevel.DETAILED, error_key=error_key)
+        context.journal.record(JournalStage.DetailedReported, context)
+        return error_rows
+
+    @staticmethod
+    def _release_error_details(check_result: CheckResult):
+        # the check result lives on for the tags, notifications and hash index, which only read the rule
+        # statuses and scores, so the detailed frames are dropped once the failing rows are in an ErrorRowSet
+        for rule_result in check_result.rule_results:
+            rule_result.errors_df = None
 
     def _detect_and_update_schema_changes(
             self,
             context: ProcessContext,
-            df: pd.DataFrame,
-            col: Optional[str],
+            schemas: List['pa.Schema'],
             crawler: str,
-            reporting_level: str):
-        count = len(df.index)
-        if count:
-            partition_values = self._process_steps.extract_detail_partition_values(
-                context.file_key,
-                self.config.filename_timestamp_fmt)
-            table_columns = list(df.columns)
-            business_area, _, _ = self._process_steps.extract_business_details(
-                context.file_key)
-            table_name = self._process_steps.error_table_name(business_area, reporting_level)
-
-            LOGGER.info(f"Checking error schema status with partition values {partition_values} and "
-                        f"columns {table_columns}")
-            needs_update = self.pipeline_catalog.is_table_needing_updating_schema(CatalogDatabase.Curated.value,
-                                                                                  table_name,
-                                                                                  table_columns,
-                                                                                  partition_values)
-            if needs_update:
-                LOGGER.info("Schema changes detected, will run the schema crawler")
+            reporting_level: str,
+            error_key: str):
+        # nothing was written when there were no errors to report
+        if schemas:
+            file_key = FileKey.parse(context.file_key, self.config.filename_timestamp_fmt)
+            partition_values = file_key.detail_partition_values
+            table_name = self._process_steps.error_table_name(file_key.business_area, reporting_level)
+            table_location = f"s3://{context.target_bucket}/{error_key.split('/year=')[0]}/"
+            partition_location = f"s3://{context.target_bucket}/{error_key.rsplit('/', 1)[0]}/"
+
+            LOGGER.info(f"Updating error table '{table_name}' with partition values {partition_values}")
+            try:
+                self.error_catalog.update(CatalogDatabase.Curated.value, table_name, table_location, schemas,
+                                          partition_values, partition_location)
+            except Exception as ex:  # pylint: disable=broad-except
+                LOGGER.warning(f"Unable to update error table '{table_name}' directly, will run the schema "
+                               f"crawler: {ex}")
+                from gluecatalog.crawler import start_crawler  # pylint: disable=import-outside-toplevel
                 start_crawler(
                     session=self._session,
                     crawler_name=crawler)
-            else:
-                LOGGER.info("No schema change detected, will not run the schema crawler")
-        if col:
-            return df[[col]]
 
     def _create_summary_error_report(self, context: ProcessContext, check_result: CheckResult):
+        if context.journal.done(JournalStage.SummaryReported):
+            return
         summary_df = check_result.summary_df
 
         error_key = self._process_steps.get_error_key(
@@ -257,65 +577,79 @@ class Processor:
 
         self._detect_and_update_schema_changes(
             context=context,
-            df=written_summary_df,
-            col=None,
+            schemas=[arrow_schema(written_summary_df)] if not written_summary_df.empty else [],
             crawler=context.error_summary_crawler,
-            reporting_level=ErrorReportLevel.SUMMARY)
+            reporting_level=ErrorReportLevel.SUMMARY,
+            error_key=error_key)
+        context.journal.record(JournalStage.SummaryReported, context)
 
     def _tag_file_with_failed(self, context: ProcessContext):
-        self._process_steps.tag_file(tags={TagKeys.Status.value: TagValues.Failed.value},
-                                     file_bucket=context.file_bucket, file_key=context.file_key,
-                                     file_version_id=context.file_version_id)
+        context.tags.add(tags={TagKeys.Status.value: TagValues.Failed.value},
+                         file_bucket=context.file_bucket, file_key=context.file_key,
+                         file_version_id=context.file_version_id)
 
     def _copy_from_raw_to_to_be_processed(self, context: ProcessContext, target_key: str):
         LOGGER.debug("Starting copy from raw to be processed")
+        # the copy carries the tags over, so they must be written before it
+        context.tags.flush()
         file_operations_context = self._get_file_operations_context(file_bucket=context.file_bucket,
                                                                     file_key=context.file_key,
                                                                     file_version_id=context.file_version_id,
                                                                     target_bucket=context.file_bucket,
                                                                     target_key=target_key)
-        self._process_steps.copy_file(file_operations_context)
-        version_id = self._process_steps.get_version_id(
-            context.file_bucket, target_key)
-        context.file_version_id = version_id
+        context.file_version_id = self._process_steps.copy_file(file_operations_context, size=context.file_size)
         context.file_key = target_key
         LOGGER.debug(f"Finished copy from raw to be processed {target_key}")
 
     def _move_from_to_be_processed_to_error(self, context: ProcessContext, target_key: str):
+        context.tags.flush()
+        if self._completed_before(context, JournalStage.Moved, target_key=target_key):
+            return
         file_operations_context = self._get_file_operations_context(file_bucket=context.file_bucket,
                                                                     file_key=context.file_key,
                                                                     target_bucket=context.file_bucket,
                                                                     target_key=target_key,
                                                                     file_version_id=context.file_version_id)
-        self._process_steps.move_file(file_operations_context)
-        version_id = self._process_steps.get_version_id(
-            context.file_bucket, target_key)
-        context.file_version_id = version_id
+        context.file_version_id = self._process_steps.move_file(file_operations_context, size=context.file_size)
         context.file_key = target_key
+        context.journal.record(JournalStage.Moved, context, target_key=target_key)
 
     def _move_file_from_to_be_processed_to_processed(self, context: ProcessContext, target_key: str):
         LOGGER.debug("Moving file to processed")
+        context.tags.flush()
+        if self._completed_before(context, JournalStage.Moved, target_key=target_key):
+            return
         file_operations_context = self._get_file_operations_context(file_bucket=context.file_bucket,
                                                                     file_key=context.file_key,
                                                                     target_bucket=context.file_bucket,
                                                                     target_key=target_key,
                                                                     file_version_id=context.file_version_id)
-        self._process_steps.move_file(file_operations_context)
-        version_id = self._process_steps.get_version_id(
-            context.file_bucket, target_key)
-        context.file_version_id = version_id
+        context.file_version_id = self._process_steps.move_file(file_operations_context, size=context.file_size)
         context.file_key = target_key
+        context.journal.record(JournalStage.Moved, context, target_key=target_key)
 
     def _find_target_key(self, context: ProcessContext, fmt: str):
         return self._process_steps.get_target_key(context.file_key, fmt)
 
     def _copy_file_from_processed_to_target(self, context: ProcessContext, target_key):
+        context.tags.flush()
+        if self._completed_before(context, JournalStage.TargetCopied, target_key=target_key):
+            return
         file_operations_context = self._get_file_operations_context(file_bucket=context.file_bucket,
                                                                     file_key=context.file_key,
                                                                     file_version_id=context.file_version_id,
                                                                     target_bucket=context.target_bucket,
                                                                     target_key=target_key)
-        self._process_steps.copy_file(file_operations_context)
+        self._process_steps.copy_file(file_operations_context, size=context.file_size)
+        context.journal.record(JournalStage.TargetCopied, context, target_key=target_key)
+
+    @staticmethod
+    def _completed_before(context: ProcessContext, stage: JournalStage, **data) -> bool:
+        """Whether an earlier attempt of the run completed the stage with the same data."""
+        if context.journal.done(stage) and context.journal.get(stage) == data:
+            LOGGER.info(f"Stage '{stage.value}' was completed by an earlier attempt, skipping it")
+            return True
+        return False
 
     def _send_success_notification(self, context: ProcessContext, target_key):
         msg = SUCCESS_MSG.format(business_process=context.business_process, pipeline_name=context.pipeline_name,
@@ -347,10 +681,15 @@ class Processor:
             business_process=context.business_process)
         self._send_error_notification(context, subject, msg)
 
+    def _send_rule_error_notifications(self, context: ProcessContext, check_result: CheckResult):
+        rule_errors = [result for result in check_result.rule_results if result.status == RuleStatus.Error]
+        if rule_errors:
+            self._send_rule_error_notification(context, rule_errors)
+
     def _send_rule_error_notification(self, context: ProcessContext, rule_errors: List[RuleResult]):
         msgs = [f"Rule: {rule_error.rule_name}\n"
                 f"Error:{rule_error.exception}\n\n"
-                f"Details:{self._exception_stacktrace(rule_error.exception)}"
+                f"Details:{self._rule_stacktrace(rule_error)}"
                 for rule_error in rule_errors]
         subject = RULE_ERROR_SUBJECT.format(business_process=context.business_process)
         msg = RULE_ERROR_MSG.format(pipeline_name=context.pipeline_name, file=context.file_key, rules="\n\n".join(msgs))
@@ -374,14 +713,14 @@ class Processor:
         self._process_steps.send_notification(context, Topic.Error, AwsRegion.EUIreland, SnsStatus.Failed, subject, msg,
                                               context.support_email)
 
-    def _write_parquet_file(self, context: ProcessContext, target_key, error_indexes):
-        pipeline_parquet = PipelineParquet(self._session)
-        return pipeline_parquet.create_parquet(
+    def _write_parquet_file(self, context: ProcessContext, target_key, error_rows: ErrorRowSet, source: SourceBuffer):
+        return self._pipeline_parquet.create_parquet(
             context.target_bucket,
             target_key=target_key,
             config=self.config,
-            error_indexes=error_indexes,
-            correlation_id=context.correlation_id)
+            error_rows=error_rows,
+            correlation_id=context.correlation_id,
+            source=source)
 
     def _delete_parquet_file(self, target_bucket, parquet_key):
         if parquet_key:
@@ -398,6 +737,11 @@ class Processor:
         return FileOperationsContext(file_key=file_key, file_bucket=file_bucket, file_version_id=file_version_id,
                                      target_key=target_key, target_bucket=target_bucket)
 
+    @staticmethod
+    def _rule_stacktrace(rule_error: RuleResult) -> str:
+        # a check run in a pool worker comes back with its traceback already formatted
+        return getattr(rule_error, STACKTRACE, None) or Processor._exception_stacktrace(rule_error.exception)
+
     @staticmethod
     def _exception_stacktrace(exception: Exception) -> str:
         stacktrace = extract_tb(exception.__traceback__)
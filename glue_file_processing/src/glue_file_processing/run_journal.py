@@ -0,0 +1,153 @@
+import json
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+from .logger import get_logger
+from .pipeline_enum import JournalStage
+from .state_store import StateStore
+from .transform import ColumnName
+
+if TYPE_CHECKING:
+    from data_quality.model import CheckResult
+    from .process_context import ProcessContext  # pylint: disable=cyclic-import
+
+LOGGER = get_logger()
+
+JOURNAL_SUFFIX = '.json'
+CHECK_RESULT_SUFFIX = '.check_result.json'
+# the parts of the context a stage changes, a resumed run carries on from their recorded values
+FILE_ATTRIBUTES = ['file_key', 'file_version_id', 'file_size', 'hash_value']
+
+
+class RunJournal:
+    """Records the stages a run has completed, so a retry of the same run carries on after the last of them.
+
+    Every stage is recorded with the file location it left behind and the data later stages need. The data
+    quality result is kept next to the journal, so a retry after the check does not parse and check the file
+    again. Only the statuses, scores and failing row indexes of its rules are kept, a retry that still has to
+    write the detailed error report reports the failing rows by index only.
+    The journal is removed once the run has finished, successfully or not.
+    Without a state store nothing is kept and every run starts from the beginning.
+    """
+
+    def __init__(self, store: Optional[StateStore], key: str):
+        self._store = store
+        self._key = key
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict] = {}
+        self._file: Dict = {}
+        if store:
+            self._load()
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self._stages)
+
+    def done(self, stage: JournalStage) -> bool:
+        return stage.value in self._stages
+
+    def get(self, stage: JournalStage) -> Dict:
+        return self._stages.get(stage.value, {})
+
+    def record(self, stage: JournalStage, context: 'ProcessContext', **data):
+        with self._lock:
+            self._stages[stage.value] = data
+            self._file = {attribute: getattr(context, attribute) for attribute in FILE_ATTRIBUTES}
+            self._save()
+
+    def restore(self, context: 'ProcessContext'):
+        for attribute, value in self._file.items():
+            setattr(context, attribute, value)
+
+    def record_check_result(self, context: 'ProcessContext', check_result: 'CheckResult'):
+        if self._store:
+            try:
+                body = json.dumps(check_result_document(check_result)).encode('utf-8')
+                self._store.put(self._key + CHECK_RESULT_SUFFIX, body)
+            except Exception as ex:  # pylint: disable=broad-except
+                LOGGER.warning(f"Unable to keep the data quality result of run '{self._key}': {ex}")
+                return
+        self.record(JournalStage.QualityChecked, context, passed=check_result.has_passed())
+
+    def check_result(self) -> Optional['CheckResult']:
+        if not self._store or not self.done(JournalStage.QualityChecked):
+            return None
+        body = self._store.get(self._key + CHECK_RESULT_SUFFIX)
+        return check_result_from_document(json.loads(body.decode('utf-8'))) if body else None
+
+    def clear(self):
+        with self._lock:
+            had_stages = bool(self._stages)
+            self._stages = {}
+            self._file = {}
+            if self._store and had_stages:
+                try:
+                    self._store.delete(self._key + JOURNAL_SUFFIX)
+                    self._store.delete(self._key + CHECK_RESULT_SUFFIX)
+                except Exception as ex:  # pylint: disable=broad-except
+                    LOGGER.warning(f"Unable to remove the journal of run '{self._key}': {ex}")
+
+    def _load(self):
+        body = self._store.get(self._key + JOURNAL_SUFFIX)
+        if body:
+            journal = json.loads(body.decode('utf-8'))
+            self._stages = journal['stages']
+            self._file = journal['file']
+            LOGGER.info(f"Resuming run '{self._key}' after stages {list(self._stages)}")
+
+    def _save(self):
+        if not self._store:
+            return
+        try:
+            body = json.dumps({'stages': self._stages, 'file': self._file}).encode('utf-8')
+            self._store.put(self._key + JOURNAL_SUFFIX, body)
+        except Exception as ex:  # pylint: disable=broad-except
+            # the run goes on, a retry simply repeats the stages that were not kept
+            LOGGER.warning(f"Unable to record the stages of run '{self._key}': {ex}")
+
+
+def check_result_document(check_result: 'CheckResult') -> Dict:
+    """The parts of a data quality result the stages after the check use, as plain JSON values."""
+    return {
+        'overall_score': _to_number(check_result.overall_score),
+        'rules': [{
+            'rule_name': rule_result.rule_name,
+            'status': rule_result.status.name,
+            'score': _to_number(rule_result.score),
+            'error_rows': _error_rows(rule_result.errors_df),
+            'exception': _exception_description(getattr(rule_result, 'exception', None))
+        } for rule_result in check_result.rule_results]
+    }
+
+
+def check_result_from_document(document: Dict) -> 'CheckResult':
+    # the rule engine is imported when a run is resumed, so it stays out of the job start-up
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+    from data_quality import model  # pylint: disable=import-outside-toplevel
+
+    rule_results = []
+    for rule in document['rules']:
+        errors_df = pd.DataFrame({ColumnName.ROW_INDEX: rule['error_rows']}) if rule['error_rows'] is not None \
+            else None
+        rule_result = model.RuleResult(model.RuleStatus[rule['status']], rule['score'], rule['rule_name'],
+                                        errors_df)
+        if rule['exception']:
+            rule_result.exception = model.RuleException(rule['exception'])
+        rule_results.append(rule_result)
+    return model.CheckResult(document['overall_score'], rule_results)
+
+
+def _error_rows(errors_df) -> Optional[list]:
+    if errors_df is None:
+        return None
+    if ColumnName.ROW_INDEX not in errors_df.columns:
+        return []
+    return [int(row) for row in errors_df[ColumnName.ROW_INDEX]]
+
+
+def _to_number(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _exception_description(exception: Optional[Exception]) -> Optional[str]:
+    return f"{exception.__class__.__name__}: {exception}" if exception else None
@@ -0,0 +1,111 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from boto3 import Session
+
+from core.aws import AwsService
+
+from .logger import get_logger
+from .pipeline_enum import S3Object
+
+LOGGER = get_logger()
+
+# the largest object a single CopyObject request accepts
+MAX_COPY_OBJECT_SIZE = 5 * 1024 * 1024 * 1024
+COPY_PART_SIZE = 512 * 1024 * 1024
+MAX_PART_COUNT = 10000
+
+
+@dataclass
+class TransitionResult:
+    bucket: str
+    key: str
+    version_id: Optional[str]
+    elapsed: float
+
+
+class S3Transition:
+    """Server side copies between S3 locations that never download the object body.
+
+    The version id of the new object is taken from the copy response, objects larger than a
+    single CopyObject request allows are copied part by part with UploadPartCopy.
+    """
+
+    def __init__(self, session: Session, multipart_threshold: int = MAX_COPY_OBJECT_SIZE,
+                 part_size: int = COPY_PART_SIZE):
+        self._client = session.client(AwsService.S3.value)
+        self._multipart_threshold = multipart_threshold
+        self._part_size = part_size
+
+    def copy(self, file_bucket: str, file_key: str, file_version_id: Optional[str], target_bucket: str,
+             target_key: str, size: Optional[int] = None) -> TransitionResult:
+        start = time.perf_counter()
+        copy_source = {'Bucket': file_bucket, 'Key': file_key}
+        if file_version_id:
+            copy_source['VersionId'] = file_version_id
+
+        if size is None:
+            size = self.head(file_bucket, file_key, file_version_id)['ContentLength']
+
+        if size > self._multipart_threshold:
+            version_id = self._multipart_copy(copy_source, size, target_bucket, target_key)
+        else:
+            response = self._client.copy_object(CopySource=copy_source, Bucket=target_bucket, Key=target_key)
+            version_id = response.get(S3Object.VersionId.value)
+
+        if version_id is None:
+            version_id = self.get_version_id(target_bucket, target_key)
+
+        result = TransitionResult(target_bucket, target_key, version_id, time.perf_counter() - start)
+        LOGGER.info(f"Copied file from '{file_bucket}/{file_key}' to '{target_bucket}/{target_key}' "
+                    f"in {result.elapsed * 1000:.0f} ms")
+        return result
+
+    def head(self, file_bucket: str, file_key: str, file_version_id: Optional[str] = None) -> dict:
+        request = {'Bucket': file_bucket, 'Key': file_key}
+        if file_version_id:
+            request['VersionId'] = file_version_id
+        return self._client.head_object(**request)
+
+    def get_version_id(self, file_bucket: str, file_key: str) -> Optional[str]:
+        return self.head(file_bucket, file_key).get(S3Object.VersionId.value)
+
+    def _multipart_copy(self, copy_source: dict, size: int, target_bucket: str, target_key: str) -> Optional[str]:
+        # UploadPartCopy does not carry the metadata and tags over, so they are copied across explicitly
+        source = self.head(copy_source['Bucket'], copy_source['Key'], copy_source.get('VersionId'))
+        upload_request = {'Bucket': target_bucket, 'Key': target_key, 'Metadata': source.get('Metadata', {})}
+        if source.get('ContentType'):
+            upload_request['ContentType'] = source['ContentType']
+        upload_id = self._client.create_multipart_upload(**upload_request)['UploadId']
+
+        part_size = max(self._part_size, math.ceil(size / MAX_PART_COUNT))
+        try:
+            parts = []
+            for part_number, offset in enumerate(range(0, size, part_size), start=1):
+                last_byte = min(offset + part_size, size) - 1
+                response = self._client.upload_part_copy(
+                    Bucket=target_bucket, Key=target_key, UploadId=upload_id, PartNumber=part_number,
+                    CopySource=copy_source, CopySourceRange=f"bytes={offset}-{last_byte}")
+                parts.append({'ETag': response['CopyPartResult']['ETag'], 'PartNumber': part_number})
+
+            response = self._client.complete_multipart_upload(
+                Bucket=target_bucket, Key=target_key, UploadId=upload_id, MultipartUpload={'Parts': parts})
+        except Exception:
+            self._client.abort_multipart_upload(Bucket=target_bucket, Key=target_key, UploadId=upload_id)
+            raise
+
+        version_id = response.get(S3Object.VersionId.value)
+        tagging_request = {'Bucket': copy_source['Bucket'], 'Key': copy_source['Key']}
+        if copy_source.get('VersionId'):
+            tagging_request['VersionId'] = copy_source['VersionId']
+        tag_set = self._client.get_object_tagging(**tagging_request)['TagSet']
+        if tag_set:
+            put_request = {'Bucket': target_bucket, 'Key': target_key, 'Tagging': {'TagSet': tag_set}}
+            if version_id:
+                put_request['VersionId'] = version_id
+            self._client.put_object_tagging(**put_request)
+
+        LOGGER.info(f"Copied {size} bytes to '{target_bucket}/{target_key}' in {len(parts)} parts")
+        return version_id
@@ -0,0 +1,114 @@
+import hashlib
+import io
+import shutil
+import tempfile
+from typing import Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+from boto3 import Session
+
+from core.aws import AwsService
+
+from .csv_parser import ParseSpec, iter_csv, read_csv
+from .logger import get_logger
+from .pipeline_enum import ParserBackend
+
+LOGGER = get_logger()
+
+READ_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class SourceBuffer:
+    """Local copy of a source object, downloaded once per run.
+
+    The object is hashed while it downloads and is kept in memory until it grows past
+    ``max_memory_size`` bytes, at which point it is spooled to a temporary file on local disk.
+    The parsed data frame is cached so every stage of the run shares a single parse.
+    """
+
+    def __init__(self, session: Session, file_bucket: str, file_key: str, file_version_id: Optional[str],
+                 max_memory_size: int):
+        self._session = session
+        self._file_bucket = file_bucket
+        self._file_key = file_key
+        self._file_version_id = file_version_id
+        self._max_memory_size = max_memory_size
+        self._buffer = None
+        self._size = 0
+        self._hash_value = None
+        self._data_frames: Dict[Tuple[str, ParserBackend], pd.DataFrame] = {}
+
+    @property
+    def hash_value(self) -> str:
+        return self._hash_value
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def is_spooled(self) -> bool:
+        return not isinstance(self._buffer, io.BytesIO)
+
+    def load(self) -> 'SourceBuffer':
+        request = {'Bucket': self._file_bucket, 'Key': self._file_key}
+        if self._file_version_id:
+            request['VersionId'] = self._file_version_id
+        body = self._session.client(AwsService.S3.value).get_object(**request)['Body']
+
+        hash_generator = hashlib.sha256()
+        self._buffer = io.BytesIO()
+        for chunk in iter(lambda: body.read(READ_CHUNK_SIZE), b''):
+            hash_generator.update(chunk)
+            self._write(chunk)
+        self._hash_value = hash_generator.hexdigest()
+
+        LOGGER.info(f"Loaded {self._size} bytes from '{self._file_bucket}/{self._file_key}'"
+                    f"{' (spooled to disk)' if self.is_spooled else ''}")
+        LOGGER.info(f"Calculated hash for '{self._file_bucket}/{self._file_key}' while loading it")
+        return self
+
+    def _write(self, chunk: bytes):
+        self._size += len(chunk)
+        if not self.is_spooled and self._size > self._max_memory_size:
+            spool = tempfile.TemporaryFile()
+            spool.write(self._buffer.getbuffer())
+            self._buffer.close()
+            self._buffer = spool
+        self._buffer.write(chunk)
+
+    def get_dataframe(self, delimiter: str, backend: ParserBackend) -> pd.DataFrame:
+        cache_key = (delimiter, backend)
+        if cache_key not in self._data_frames:
+            self._data_frames[cache_key] = read_csv(self._buffer, delimiter, backend)
+            LOGGER.info(f"Parsed '{self._file_bucket}/{self._file_key}' into a data frame using the "
+                        f"{backend.value} parser")
+        return self._data_frames[cache_key]
+
+    def read_dataframe(self, delimiter: str, backend: ParserBackend, spec: ParseSpec) -> pd.DataFrame:
+        """Parses the buffer into a typed data frame, the result is not cached."""
+        data_frame = read_csv(self._buffer, delimiter, backend, spec)
+        LOGGER.info(f"Parsed '{self._file_bucket}/{self._file_key}' into a typed data frame using the "
+                    f"{backend.value} parser")
+        return data_frame
+
+    def iter_dataframes(self, delimiter: str, backend: ParserBackend, spec: ParseSpec,
+                        chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Parses the buffer into typed data frames of at most ``chunk_size`` rows."""
+        LOGGER.info(f"Parsing '{self._file_bucket}/{self._file_key}' in chunks of {chunk_size} rows")
+        return iter_csv(self._buffer, delimiter, backend, spec, chunk_size)
+
+    def write_to(self, path: str):
+        """Writes the downloaded object to a local file, for readers in other processes."""
+        self._buffer.seek(0)
+        with open(path, 'wb') as local_file:
+            shutil.copyfileobj(self._buffer, local_file, READ_CHUNK_SIZE)
+
+    def release_dataframes(self):
+        self._data_frames.clear()
+
+    def close(self):
+        self.release_dataframes()
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
@@ -0,0 +1,58 @@
+from typing import Dict, Optional
+
+from boto3 import Session
+from core.aws import AwsService
+
+from .logger import get_logger
+
+LOGGER = get_logger()
+
+
+class StateStore:
+    """Keeps small documents by key, for state that has to outlive a single attempt of a run."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def put(self, key: str, body: bytes):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+
+class InMemoryStateStore(StateStore):
+    """A state store held in memory, used in tests."""
+
+    def __init__(self):
+        self.documents: Dict[str, bytes] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.documents.get(key)
+
+    def put(self, key: str, body: bytes):
+        self.documents[key] = body
+
+    def delete(self, key: str):
+        self.documents.pop(key, None)
+
+
+class S3StateStore(StateStore):
+    """A state store keeping every document as an object of one bucket."""
+
+    def __init__(self, session: Session, bucket: str):
+        self._session = session
+        self._bucket = bucket
+
+    def get(self, key: str) -> Optional[bytes]:
+        s3 = self._session.client(AwsService.S3.value)
+        try:
+            return s3.get_object(Bucket=self._bucket, Key=key)['Body'].read()
+        except s3.exceptions.NoSuchKey:
+            return None
+
+    def put(self, key: str, body: bytes):
+        self._session.client(AwsService.S3.value).put_object(Bucket=self._bucket, Key=key, Body=body)
+
+    def delete(self, key: str):
+        self._session.client(AwsService.S3.value).delete_object(Bucket=self._bucket, Key=key)
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+from .logger import get_logger
+
+LOGGER = get_logger()
+
+
+@dataclass
+class Step:
+    name: str
+    func: Callable[..., Any]
+    depends_on: Tuple[str, ...]
+
+
+class StepScheduler:
+    """Runs the steps of a run on a thread pool, each step as soon as the steps it depends on have finished.
+
+    A step is called with the results of its dependencies, in the order they are listed. Once a step fails
+    no further steps are started, the steps already running are waited for, and the error of the first
+    failed step in the order the steps were added is raised, as it would have been when run one by one.
+    With a single worker the steps simply run in the order they were added.
+    """
+
+    def __init__(self, max_workers: int):
+        self._max_workers = max_workers
+        self._steps: Dict[str, Step] = OrderedDict()
+
+    def add(self, name: str, func: Callable[..., Any], *depends_on: str) -> 'StepScheduler':
+        unknown = [dependency for dependency in depends_on if dependency not in self._steps]
+        if unknown:
+            raise ValueError(f"Step '{name}' depends on steps that have not been added: {unknown}")
+        self._steps[name] = Step(name, func, depends_on)
+        return self
+
+    def run(self) -> Dict[str, Any]:
+        if self._max_workers <= 1:
+            results = {}
+            for step in self._steps.values():
+                results[step.name] = step.func(*[results[dependency] for dependency in step.depends_on])
+            return results
+        return self._run_concurrently()
+
+    def _run_concurrently(self) -> Dict[str, Any]:
+        results = {}
+        errors = {}
+        pending = list(self._steps.values())
+        running: Dict[Future, Step] = {}
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            while pending or running:
+                if not errors:
+                    for step in [step for step in pending if all(name in results for name in step.depends_on)]:
+                        pending.remove(step)
+                        arguments = [results[dependency] for dependency in step.depends_on]
+                        running[pool.submit(step.func, *arguments)] = step
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    if future.exception() is not None:
+                        errors[step.name] = future.exception()
+                    else:
+                        results[step.name] = future.result()
+
+        if errors:
+            skipped = [step.name for step in pending]
+            if skipped:
+                LOGGER.info(f"Skipped steps {skipped} after a failed step")
+            raise next(errors[name] for name in self._steps if name in errors)
+        return results
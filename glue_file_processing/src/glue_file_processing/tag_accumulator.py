@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from .logger import get_logger
+from .pipeline_enum import TagFlushPolicy
+
+LOGGER = get_logger()
+
+ObjectVersion = Tuple[str, str, str]
+
+
+class TagAccumulator:
+    """Buffers tag changes per object version and writes them with one tagging call per object.
+
+    With the ``Stage`` policy tags are only written when ``flush`` is called, which the processor does
+    before the object is copied (copies carry the tags over) and at the end of the run.
+    The ``Immediate`` policy writes every change straight away.
+    """
+
+    def __init__(self, tag_file: Callable[..., None], policy: TagFlushPolicy):
+        self._tag_file = tag_file
+        self._policy = policy
+        self._pending: Dict[ObjectVersion, Dict[str, str]] = OrderedDict()
+        self.requested_count = 0
+        """The number of tag changes requested"""
+        self.call_count = 0
+        """The number of tagging calls made to S3"""
+
+    @property
+    def saved_count(self) -> int:
+        return self.requested_count - self.call_count
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def add(self, tags: dict, file_bucket: str, file_key: str, file_version_id: str):
+        self.requested_count += 1
+        self._pending.setdefault((file_bucket, file_key, file_version_id), {}).update(tags)
+        if self._policy == TagFlushPolicy.Immediate:
+            self.flush()
+
+    def flush(self):
+        while self._pending:
+            # pending tags are dropped before the call so a failing tag set is not retried by the next flush
+            (file_bucket, file_key, file_version_id), tags = self._pending.popitem(last=False)
+            self.call_count += 1
+            self._tag_file(tags, file_bucket=file_bucket, file_key=file_key, file_version_id=file_version_id)
+
+    def log_summary(self):
+        LOGGER.info(f"Applied {self.requested_count} tag change(s) with {self.call_count} tagging call(s), "
+                    f"saved {self.saved_count}")
@@ -4,11 +4,13 @@ e.g. if you need to join two dataframes to calculate the new value then it does
 """
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Union
+from typing import Dict
 
+import numpy as np
 import pandas as pd
 
 from ..config import AsOfDateConfig, ColumnName, AsOfDateSource, ColumnConfig
+from ..error_row_set import ErrorRowSet
 
 
 def with_as_of_date(
@@ -23,28 +25,23 @@ def with_as_of_date(
 
 
 def with_error_columns(df: pd.DataFrame,
-                       error_indexes: pd.DataFrame,
+                       error_rows: ErrorRowSet,
                        correlation_id: str,
                        schema_config: Dict[str, ColumnConfig]):
-    # make a copy of the original data frame in order to maintain the guarantee of not changing data we are passed
-    df = df = df.copy(deep=True)
-    # we only care if there have been errors, not how many so we ignore multiple errors on the same row
-    error_indexes = error_indexes.drop_duplicates(inplace=False)
+    # a shallow copy is enough to leave the data frame we are passed unchanged, as we only add columns to it
+    df = df.copy(deep=False)
+    positions = _column_positions(schema_config, ColumnName.ROW_INDEX, ColumnName.CORRELATION_ID,
+                                  ColumnName.CONFIDENCE_LEVEL)
 
-    # set error index to row index so we can merge with main data frame by it
-    error_indexes.set_index(ColumnName.ROW_INDEX, inplace=True)
-    error_indexes[ColumnName.CONFIDENCE_LEVEL] = Decimal(0)
+    # we only care if there have been errors, not how many, so a row is in error if its index is in the error rows
+    in_error = error_rows.mask(df.index)
+    confidence_level = np.full(len(df.index), Decimal(1), dtype=object)
+    confidence_level[in_error] = Decimal(0)
 
     # set the row index and correlation position, probably to the end of the result
-    _insert_column_at_schema_position_inplace(df, schema_config, ColumnName.ROW_INDEX, df.index)
-    _insert_column_at_schema_position_inplace(df, schema_config, ColumnName.CORRELATION_ID, correlation_id)
-
-    # set a default confidence level of 1, we will update with the error information at the next step
-    _insert_column_at_schema_position_inplace(df, schema_config, ColumnName.CONFIDENCE_LEVEL, Decimal(1))
-
-    # if we encountered any errors, set the confidence level to zero
-    df.update(error_indexes)
-
+    df.insert(loc=positions[ColumnName.ROW_INDEX], column=ColumnName.ROW_INDEX, value=df.index)
+    df.insert(loc=positions[ColumnName.CORRELATION_ID], column=ColumnName.CORRELATION_ID, value=correlation_id)
+    df.insert(loc=positions[ColumnName.CONFIDENCE_LEVEL], column=ColumnName.CONFIDENCE_LEVEL, value=confidence_level)
     return df
 
 
@@ -65,16 +62,7 @@ def with_as_of_date_from_dataset(
     return df.rename(columns={source_column: ColumnName.AS_OF_DATE})
 
 
-def _insert_column_at_schema_position_inplace(
-        df: pd.DataFrame,
-        schema_config: Dict[str, ColumnConfig],
-        column_name: str,
-        value: Union[pd.Series, str, Decimal]):
-    column_loc = _column_position(schema_config, column_name)
-    df.insert(loc=column_loc, column=column_name, value=value)
-
-
-def _column_position(schema_config: Dict[str, ColumnConfig], column_name: str) -> int:
+def _column_positions(schema_config: Dict[str, ColumnConfig], *column_names: str) -> Dict[str, int]:
     # this checks for the sanitized column name position!
-    column_names = list(schema_config.keys())
-    return column_names.index(column_name)
+    positions = {name: position for position, name in enumerate(schema_config)}
+    return {column_name: positions[column_name] for column_name in column_names}
@@ -0,0 +1,110 @@
+from functools import lru_cache, wraps
+from os import path
+from typing import List, Tuple
+
+from .path import get_file_name, get_filename_timestamp, get_root_folder
+
+
+def _derived(method):
+    """A property worked out on first use and kept on the key, as ``cached_property`` does not exist before 3.8."""
+    name = method.__name__
+
+    @property
+    @wraps(method)
+    def derived(self):
+        try:
+            return self._derived[name]
+        except KeyError:
+            value = self._derived[name] = method(self)
+            return value
+    return derived
+
+
+class FileKey:
+    """An S3 key of an incoming file, parsed once into its business details and timestamp.
+
+    A key looks like ``<business area>/<process>/<data source>/.../<file name>``, wherever in the landing
+    folders the file is, and all the keys derived from it (target, error reports, parquet, partitions) only
+    depend on the root folder, the file name and the timestamp in it. Use ``FileKey.parse`` so a key seen
+    before is not parsed again.
+    """
+    __slots__ = ['key', 'fmt', 'root_folder', 'business_area', 'process', 'data_source', 'file_name',
+                 'timestamp', '_derived']
+
+    def __init__(self, key: str, fmt: str):
+        root_folder = get_root_folder(key)
+        root_parts = root_folder.split('/') + [None, None]
+        self._set(key=key, fmt=fmt, root_folder=root_folder, business_area=root_parts[0], process=root_parts[1],
+                  data_source=root_parts[2], file_name=get_file_name(key),
+                  timestamp=get_filename_timestamp(key, fmt), _derived={})
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def parse(key: str, fmt: str) -> 'FileKey':
+        return FileKey(key, fmt)
+
+    def _set(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"FileKey is immutable, '{name}' can not be set")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"FileKey is immutable, '{name}' can not be deleted")
+
+    @_derived
+    def base_name(self) -> str:
+        return get_file_name(self.key, include_extension=False)
+
+    @_derived
+    def date_parts(self) -> Tuple[str, str, str]:
+        return self.timestamp.strftime('%Y'), self.timestamp.strftime('%m'), self.timestamp.strftime('%d')
+
+    @_derived
+    def partition_values(self) -> Tuple[str, str, str]:
+        """The year, year_month and year_month_day partition of the parquet file."""
+        year, month, day = self.date_parts
+        return year, f"{year}{month}", f"{year}{month}{day}"
+
+    @_derived
+    def target_key(self) -> str:
+        year, month, _ = self.date_parts
+        return f"{self.root_folder}/{year}/{year}{month}/{self.file_name}"
+
+    @_derived
+    def parquet_key(self) -> str:
+        year, year_month, year_month_day = self.partition_values
+        return (f"{self.root_folder}/parquet/"
+                f"year={year}/year_month={year_month}/year_month_day={year_month_day}/"
+                f"{self.base_name}.parquet")
+
+    @_derived
+    def _detail_partition_values(self) -> Tuple[str, str, str, str]:
+        year, month, _ = self.date_parts
+        return year, f"{year}{month}", self.process, self.data_source
+
+    @property
+    def detail_partition_values(self) -> List[str]:
+        """The year, year_month, process and data_source partition of the error reports."""
+        return list(self._detail_partition_values)
+
+    def error_key(self, level: str) -> str:
+        name = f'error_key_{level}'
+        if name not in self._derived:
+            year, month, _ = self.date_parts
+            file_name_noext = path.splitext(self.file_name)[0]
+            self._derived[name] = (
+                f"{self.business_area}/error_reporting/{level}/year={year}/year_month={year}{month}/"
+                f"process={self.process}/data_source={self.data_source}/"
+                f"{file_name_noext}.parquet.snappy")
+        return self._derived[name]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FileKey) and (self.key, self.fmt) == (other.key, other.fmt)
+
+    def __hash__(self) -> int:
+        return hash((self.key, self.fmt))
+
+    def __repr__(self) -> str:
+        return f"FileKey('{self.key}', '{self.fmt}')"
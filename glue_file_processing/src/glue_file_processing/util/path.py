@@ -1,5 +1,12 @@
 import re
 from datetime import datetime
+from functools import lru_cache
+from typing import Pattern
+
+# strftime directives of fixed width, any other directive falls back to the default pattern
+TIMESTAMP_DIRECTIVES = {'Y': r'\d{4}', 'y': r'\d{2}', 'm': r'\d{2}', 'd': r'\d{2}', 'H': r'\d{2}', 'M': r'\d{2}',
+                        'S': r'\d{2}', 'j': r'\d{3}', 'f': r'\d{6}', '%': '%'}
+DEFAULT_TIMESTAMP_PATTERN = r'\d{4}\d{2}\d{2}\d{2}\d{2}\d{2}'
 
 
 def get_root_folder(file_key: str):
@@ -12,9 +19,24 @@ def get_file_name(file_key: str, include_extension: bool = True) -> str:
     return file_name if include_extension else file_name.split(".")[0]
 
 
+@lru_cache(maxsize=32)
+def timestamp_pattern(filename_timestamp_fmt: str) -> Pattern:
+    """The regex finding a timestamp of the given format in a file name, compiled once per format."""
+    parts = re.split(r'(%.)', filename_timestamp_fmt)
+    pattern = []
+    for part in parts:
+        if part.startswith('%') and len(part) == 2:
+            if part[1] not in TIMESTAMP_DIRECTIVES:
+                return re.compile(DEFAULT_TIMESTAMP_PATTERN)
+            pattern.append(TIMESTAMP_DIRECTIVES[part[1]])
+        else:
+            pattern.append(re.escape(part))
+    return re.compile(''.join(pattern))
+
+
 def get_filename_timestamp(filename: str, filename_timestamp_fmt: str) -> datetime:
     try:
-        match = re.search(r'\d{4}\d{2}\d{2}\d{2}\d{2}\d{2}', get_file_name(filename))
+        match = timestamp_pattern(filename_timestamp_fmt).search(get_file_name(filename))
         return datetime.strptime(match.group(), filename_timestamp_fmt)
     except Exception as ex:
         raise ValueError(
@@ -0,0 +1,103 @@
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from boto3 import Session
+
+from .logger import get_logger
+
+LOGGER = get_logger()
+
+SQS_SERVICE = 'sqs'
+SQS_MAX_MESSAGES = 10
+
+
+@dataclass
+class Message:
+    message_id: str
+    body: Dict
+    receipt_handle: str
+    receive_count: int
+
+
+class WorkQueue:
+    """A queue of files to process with SQS semantics.
+
+    A received message is hidden for ``visibility_timeout`` seconds, it is removed once processed with
+    ``delete`` and becomes visible again when the timeout expires or it is handed back with ``retry``.
+    """
+
+    def receive(self, max_messages: int, visibility_timeout: int, wait_time: int) -> List[Message]:
+        raise NotImplementedError
+
+    def delete(self, message: Message):
+        raise NotImplementedError
+
+    def retry(self, message: Message, delay: int):
+        raise NotImplementedError
+
+
+class InMemoryWorkQueue(WorkQueue):
+    """A work queue held in memory, used when running locally and in tests."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._messages: Dict[str, Message] = {}
+        self._visible_at: Dict[str, float] = {}
+
+    def __len__(self):
+        return len(self._messages)
+
+    def send(self, body: Dict) -> str:
+        message_id = str(uuid.uuid4())
+        self._messages[message_id] = Message(message_id, body, receipt_handle=message_id, receive_count=0)
+        self._visible_at[message_id] = self._clock()
+        return message_id
+
+    def receive(self, max_messages: int, visibility_timeout: int, wait_time: int) -> List[Message]:
+        now = self._clock()
+        received = []
+        for message_id, message in self._messages.items():
+            if len(received) == max_messages:
+                break
+            if self._visible_at[message_id] <= now:
+                message.receive_count += 1
+                self._visible_at[message_id] = now + visibility_timeout
+                received.append(Message(message_id, message.body, message.receipt_handle, message.receive_count))
+        return received
+
+    def delete(self, message: Message):
+        self._messages.pop(message.message_id, None)
+        self._visible_at.pop(message.message_id, None)
+
+    def retry(self, message: Message, delay: int):
+        if message.message_id in self._visible_at:
+            self._visible_at[message.message_id] = self._clock() + delay
+
+
+class SqsWorkQueue(WorkQueue):
+    def __init__(self, session: Session, queue_url: str):
+        self._client = session.client(SQS_SERVICE)
+        self._queue_url = queue_url
+
+    def receive(self, max_messages: int, visibility_timeout: int, wait_time: int) -> List[Message]:
+        response = self._client.receive_message(
+            QueueUrl=self._queue_url,
+            MaxNumberOfMessages=min(max_messages, SQS_MAX_MESSAGES),
+            VisibilityTimeout=visibility_timeout,
+            WaitTimeSeconds=wait_time,
+            AttributeNames=['ApproximateReceiveCount'])
+        return [Message(message_id=message['MessageId'],
+                        body=json.loads(message['Body']),
+                        receipt_handle=message['ReceiptHandle'],
+                        receive_count=int(message['Attributes']['ApproximateReceiveCount']))
+                for message in response.get('Messages', [])]
+
+    def delete(self, message: Message):
+        self._client.delete_message(QueueUrl=self._queue_url, ReceiptHandle=message.receipt_handle)
+
+    def retry(self, message: Message, delay: int):
+        self._client.change_message_visibility(QueueUrl=self._queue_url, ReceiptHandle=message.receipt_handle,
+                                               VisibilityTimeout=delay)
@@ -0,0 +1,95 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from .logger import get_logger
+from .process_context import ProcessContext
+from .processor import Processor
+from .work_queue import Message, WorkQueue
+
+LOGGER = get_logger()
+
+VISIBILITY_TIMEOUT = 15 * 60
+MAX_RECEIVE_COUNT = 3
+RETRY_DELAY = 60
+IDLE_TIMEOUT = 5 * 60
+WAIT_TIME = 20
+BATCH_SIZE = 1
+
+
+@dataclass
+class WorkerStats:
+    processed: int = 0
+    retried: int = 0
+    abandoned: int = 0
+
+
+class Worker:
+    """Keeps one Processor alive and runs it for every file event taken from a work queue.
+
+    A message is deleted once its file has been processed. A failed message is handed back to the queue
+    after a delay that grows with the number of attempts, and is dropped after ``max_receive_count`` attempts.
+    The worker stops after ``idle_timeout`` seconds without messages or when ``stop`` is called.
+    """
+
+    def __init__(self, processor: Processor, queue: WorkQueue, job_variables: Dict,
+                 visibility_timeout: int = VISIBILITY_TIMEOUT, max_receive_count: int = MAX_RECEIVE_COUNT,
+                 retry_delay: int = RETRY_DELAY, idle_timeout: int = IDLE_TIMEOUT, wait_time: int = WAIT_TIME,
+                 batch_size: int = BATCH_SIZE, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._processor = processor
+        self._queue = queue
+        self._job_variables = job_variables
+        self._visibility_timeout = visibility_timeout
+        self._max_receive_count = max_receive_count
+        self._retry_delay = retry_delay
+        self._idle_timeout = idle_timeout
+        self._wait_time = wait_time
+        self._batch_size = batch_size
+        self._clock = clock
+        self._sleep = sleep
+        self._stopping = False
+        self.stats = WorkerStats()
+
+    def stop(self, *_):
+        """Finishes the message in progress and stops, usable as a signal handler."""
+        LOGGER.info("Stop requested, the worker will exit after the current message")
+        self._stopping = True
+
+    def run(self) -> WorkerStats:
+        idle_since = self._clock()
+        while not self._stopping:
+            messages = self._queue.receive(self._batch_size, self._visibility_timeout, self._wait_time)
+            if not messages:
+                if self._clock() - idle_since >= self._idle_timeout:
+                    LOGGER.info(f"No messages for {self._idle_timeout} seconds, shutting down")
+                    break
+                self._sleep(1)
+                continue
+
+            for message in messages:
+                self._handle(message)
+            idle_since = self._clock()
+
+        self._processor.close()
+        LOGGER.info(f"Worker finished: {self.stats.processed} processed, {self.stats.retried} retried, "
+                    f"{self.stats.abandoned} abandoned")
+        return self.stats
+
+    def _handle(self, message: Message):
+        try:
+            context = ProcessContext(**dict(self._job_variables, **message.body))
+            self._processor.run(context)
+        except Exception:  # pylint: disable=broad-except
+            if message.receive_count >= self._max_receive_count:
+                LOGGER.exception(f"Message {message.message_id} failed {message.receive_count} time(s), dropping it")
+                self._queue.delete(message)
+                self.stats.abandoned += 1
+            else:
+                delay = self._retry_delay * message.receive_count
+                LOGGER.exception(f"Message {message.message_id} failed, retrying in {delay} seconds")
+                self._queue.retry(message, delay)
+                self.stats.retried += 1
+        else:
+            self._queue.delete(message)
+            self.stats.processed += 1
@@ -1,10 +1,15 @@
+import json
 import sys
 from collections import namedtuple
+from typing import List
 
 from awsglue.utils import getResolvedOptions
 from glue_file_processing.process_context import ProcessContext
 from glue_file_processing.processor import Processor
-from pip._internal.operations.freeze import freeze
+
+MANIFEST_ARG = "manifest"
+PACKAGES_ARG = "print_packages"
+WORK_ITEM_ARGS = ["correlation_id", "file_bucket", "file_key", "file_version_id", "processed_on"]
 
 
 def get_arguments():
@@ -17,13 +22,31 @@ def get_arguments():
     return ContextVariables(**args)
 
 
-def main():
+def get_work_items(context_variables) -> List[ProcessContext]:
+    """One context per file to process, the files come from the manifest argument when the run has several."""
+    job_variables = context_variables._asdict()
+    if f"--{MANIFEST_ARG}" in sys.argv:
+        manifest = json.loads(getResolvedOptions(sys.argv, [MANIFEST_ARG])[MANIFEST_ARG])
+    else:
+        manifest = [{arg: job_variables[arg] for arg in WORK_ITEM_ARGS}]
+
+    return [ProcessContext(**dict(job_variables, **work_item)) for work_item in manifest]
+
+
+def print_packages():
+    """Lists the installed packages when the job is started with --print_packages, walking them slows the start."""
+    if f"--{PACKAGES_ARG}" not in sys.argv:
+        return
+    from pip._internal.operations.freeze import freeze  # pylint: disable=import-outside-toplevel
     for _package in freeze(local_only=True):
         print(_package)
 
+
+def main():
+    print_packages()
+
     context_variables = get_arguments()
-    context = ProcessContext(**context_variables._asdict())
-    Processor().run(context)
+    Processor().run_batch(get_work_items(context_variables))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,32 @@
+import random
+from typing import Dict, List
+
+from glue_file_processing.src.glue_file_processing.pipeline_configuration import CONFIGURATION
+
+VALUE_GENERATORS = {
+    'STRING': lambda rnd: f"value {rnd.randint(0, 10000)}",
+    'INT': lambda rnd: str(rnd.randint(-100000, 100000)),
+    'DECIMAL': lambda rnd: f"{rnd.uniform(-100000, 100000):.6f}",
+    'TIMESTAMP': lambda rnd: f"2019-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T10:30:00",
+    'DATE': lambda rnd: f"2019-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+    'BOOLEAN': lambda rnd: rnd.choice(['true', 'false']),
+}
+
+
+def source_columns(pipeline_config: Dict = None) -> List[Dict]:
+    pipeline_config = pipeline_config or CONFIGURATION
+    return [col for col in pipeline_config['schema']
+            if 'name' in col and str(col.get('is_calculated', 'false')).lower() != 'true']
+
+
+def synthetic_csv(row_count: int, pipeline_config: Dict = None, seed: int = 42) -> bytes:
+    """Builds a CSV file with ``row_count`` rows of random values matching the configured schema."""
+    pipeline_config = pipeline_config or CONFIGURATION
+    delimiter = pipeline_config.get('delimiter', ',')
+    columns = source_columns(pipeline_config)
+    rnd = random.Random(seed)
+
+    lines = [delimiter.join(col['name'] for col in columns)]
+    for _ in range(row_count):
+        lines.append(delimiter.join(VALUE_GENERATORS[col['type']](rnd) for col in columns))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
@@ -0,0 +1,23 @@
+import io
+import os
+import timeit
+
+from pytest import mark
+
+from glue_file_processing.src.glue_file_processing.csv_parser import read_csv
+from glue_file_processing.src.glue_file_processing.pipeline_enum import ParserBackend
+from .synthetic import synthetic_csv
+
+ROW_COUNT = 100000
+
+
+@mark.skipif(not os.getenv('RUN_BENCHMARKS'), reason="Benchmarks are run on demand with RUN_BENCHMARKS=1.")
+def test_csv_parser_backends():
+    data = synthetic_csv(ROW_COUNT)
+    timings = {}
+    for backend in ParserBackend:
+        timings[backend] = min(timeit.repeat(lambda: read_csv(io.BytesIO(data), ',', backend), number=1, repeat=3))
+
+    for backend, seconds in timings.items():
+        print(f"{backend.value:>8}: {seconds:.3f}s for {ROW_COUNT} rows ({len(data) / seconds / 1e6:.1f} MB/s)")
+    assert timings[ParserBackend.C] < timings[ParserBackend.Python]
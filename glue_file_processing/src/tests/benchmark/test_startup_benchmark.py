@@ -0,0 +1,16 @@
+import os
+
+from pytest import mark
+
+from ..processor.test_startup import MODULE, import_in_new_interpreter
+
+# on short files the start-up is most of the run, raise the budget only for a reason
+IMPORT_BUDGET_SECONDS = float(os.getenv('IMPORT_BUDGET_SECONDS', '2.0'))
+
+
+@mark.skipif(not os.getenv('RUN_BENCHMARKS'), reason="Benchmarks are run on demand with RUN_BENCHMARKS=1.")
+def test_processor_import_time():
+    seconds = min(import_in_new_interpreter(MODULE)['seconds'] for _ in range(3))
+
+    assert seconds < IMPORT_BUDGET_SECONDS, \
+        f"Importing the processor took {seconds:.3f}s, the budget is {IMPORT_BUDGET_SECONDS:.3f}s"
@@ -0,0 +1,39 @@
+import os
+import timeit
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from pytest import mark
+
+from glue_file_processing.src.glue_file_processing.config import ColumnConfig, ColumnName
+from glue_file_processing.src.glue_file_processing.error_row_set import ErrorRowSet
+from glue_file_processing.src.glue_file_processing.transform.extend import with_error_columns
+from ..processor.extend_reference import reference_with_error_columns
+
+ROW_COUNT = 1000000
+ERROR_RATE = 0.05
+
+
+@mark.skipif(not os.getenv('RUN_BENCHMARKS'), reason="Benchmarks are run on demand with RUN_BENCHMARKS=1.")
+def test_with_error_columns():
+    rnd = np.random.RandomState(42)
+    df = pd.DataFrame({
+        'name': [f"value {value}" for value in rnd.randint(0, 10000, ROW_COUNT)],
+        'amount': [Decimal(int(value)) for value in rnd.randint(-100000, 100000, ROW_COUNT)],
+        'count': rnd.randint(0, 1000, ROW_COUNT)})
+    error_indexes = pd.DataFrame({ColumnName.ROW_INDEX: rnd.randint(0, ROW_COUNT, int(ROW_COUNT * ERROR_RATE))})
+    schema_config = {name: ColumnConfig(name, 'STRING', True) for name in
+                     ['name', 'amount', 'count', ColumnName.ROW_INDEX, ColumnName.CORRELATION_ID,
+                      ColumnName.CONFIDENCE_LEVEL]}
+
+    timings = {
+        'reference': min(timeit.repeat(lambda: reference_with_error_columns(df, error_indexes, 'id', schema_config),
+                                       number=1, repeat=3)),
+        'optimised': min(timeit.repeat(lambda: with_error_columns(df, ErrorRowSet.from_errors(error_indexes), 'id',
+                                                                  schema_config), number=1, repeat=3))
+    }
+
+    for name, seconds in timings.items():
+        print(f"{name:>10}: {seconds:.3f}s for {ROW_COUNT} rows")
+    assert timings['optimised'] < timings['reference']
@@ -0,0 +1,26 @@
+"""The original implementation of ``with_error_columns``, kept to check the optimised one against."""
+from decimal import Decimal
+from typing import Dict
+
+import pandas as pd
+
+from glue_file_processing.src.glue_file_processing.config import ColumnName, ColumnConfig
+
+
+def reference_with_error_columns(df: pd.DataFrame,
+                                 error_indexes: pd.DataFrame,
+                                 correlation_id: str,
+                                 schema_config: Dict[str, ColumnConfig]):
+    df = df.copy(deep=True)
+    error_indexes = error_indexes.drop_duplicates(inplace=False)
+    error_indexes.set_index(ColumnName.ROW_INDEX, inplace=True)
+    error_indexes[ColumnName.CONFIDENCE_LEVEL] = Decimal(0)
+
+    column_names = list(schema_config.keys())
+    df.insert(loc=column_names.index(ColumnName.ROW_INDEX), column=ColumnName.ROW_INDEX, value=df.index)
+    df.insert(loc=column_names.index(ColumnName.CORRELATION_ID), column=ColumnName.CORRELATION_ID,
+              value=correlation_id)
+    df.insert(loc=column_names.index(ColumnName.CONFIDENCE_LEVEL), column=ColumnName.CONFIDENCE_LEVEL,
+              value=Decimal(1))
+    df.update(error_indexes)
+    return df
@@ -0,0 +1,64 @@
+from unittest.mock import MagicMock
+
+import boto3
+from core.aws import AwsRegion
+from gluecatalog.data_types import DataTypes
+from gluecatalog.model import Column, ParquetFormat, Table
+from moto import mock_glue
+from pytest import mark
+
+from glue_file_processing.src.glue_file_processing.boto_session import BotoSession
+from glue_file_processing.src.glue_file_processing.catalog_cache import FINGERPRINT_PARAMETER, \
+    TableDefinitionCache, table_fingerprint
+
+database_name = "curated"
+
+
+def create_table(columns):
+    return Table(name="test_pipeline", columns=columns, s3_location="s3://target_bucket/a/b/c/parquet/",
+                 storage_format=ParquetFormat(), partition_cols=[Column("year", DataTypes.STRING)],
+                 description="test_pipeline")
+
+
+test_table_definition = [
+    ([Column("name", DataTypes.STRING)], [Column("name", DataTypes.STRING)], True),
+    ([Column("name", DataTypes.STRING)], [Column("name", DataTypes.STRING), Column("amount", DataTypes.STRING)], False)
+]
+
+
+@mock_glue
+class TestTableDefinitionCache:
+    @mark.parametrize("synced_columns, current_columns, is_current", test_table_definition)
+    def test_is_current(self, synced_columns, current_columns, is_current):
+        glue = boto3.client('glue', region_name=AwsRegion.EUIreland.value)
+        glue.create_database(DatabaseInput={'Name': database_name})
+        glue.create_table(DatabaseName=database_name, TableInput={'Name': 'test_pipeline'})
+        session = BotoSession().get_session(AwsRegion.EUIreland)
+
+        synced_table = create_table(synced_columns)
+        assert TableDefinitionCache(session).is_current(database_name, synced_table) is False
+        TableDefinitionCache(session).remember(database_name, synced_table)
+
+        # a new cache has nothing in memory, so this reads the fingerprint stored in the catalog
+        assert TableDefinitionCache(session).is_current(database_name, create_table(current_columns)) is is_current
+
+    def test_missing_table(self):
+        glue = boto3.client('glue', region_name=AwsRegion.EUIreland.value)
+        glue.create_database(DatabaseInput={'Name': database_name})
+        session = BotoSession().get_session(AwsRegion.EUIreland)
+
+        assert TableDefinitionCache(session).is_current(
+            database_name, create_table([Column("name", DataTypes.STRING)])) is False
+
+
+def test_remember_skips_the_update_when_the_fingerprint_is_stored():
+    table = create_table([Column("name", DataTypes.STRING)])
+    session = MagicMock()
+    glue = session.client.return_value
+    glue.get_table.return_value = {'Table': {'Name': table.name,
+                                             'Parameters': {FINGERPRINT_PARAMETER: table_fingerprint(table)}}}
+
+    TableDefinitionCache(session).remember(database_name, table)
+
+    assert glue.get_table.call_count == 1
+    glue.update_table.assert_not_called()
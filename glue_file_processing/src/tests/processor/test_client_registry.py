@@ -0,0 +1,38 @@
+from boto3 import Session
+from core.aws import AwsRegion
+
+from glue_file_processing.src.glue_file_processing.boto_session import BotoSession, SharedSession
+from glue_file_processing.src.glue_file_processing.client_registry import ClientRegistry
+
+
+def test_clients_are_reused():
+    registry = ClientRegistry(max_pool_connections=25)
+    session = SharedSession(BotoSession().get_session(AwsRegion.EUIreland), registry)
+
+    s3_client = session.client('s3')
+    assert session.client('s3') is s3_client
+    assert SharedSession(BotoSession().get_session(AwsRegion.EUIreland), registry).client('s3') is s3_client
+    assert session.client('sns') is not s3_client
+    assert s3_client.meta.config.max_pool_connections == 25
+    assert (registry.created_count, registry.reused_count) == (2, 2)
+
+
+def test_clients_with_extra_arguments_are_not_shared():
+    registry = ClientRegistry()
+    session = SharedSession(BotoSession().get_session(AwsRegion.EUIreland), registry)
+
+    s3_client = session.client('s3')
+    assert session.client('s3', endpoint_url='http://localhost:5000') is not s3_client
+    assert session.client('s3', region_name='us-east-1') is not s3_client
+    assert registry.created_count == 3
+
+
+def test_sessions_with_other_credentials_get_their_own_clients():
+    registry = ClientRegistry()
+    session = SharedSession(Session(aws_access_key_id='first', aws_secret_access_key='x',
+                                    region_name=AwsRegion.EUIreland.value), registry)
+    other_session = SharedSession(Session(aws_access_key_id='second', aws_secret_access_key='x',
+                                          region_name=AwsRegion.EUIreland.value), registry)
+
+    assert other_session.client('s3') is not session.client('s3')
+    assert registry.created_count == 2
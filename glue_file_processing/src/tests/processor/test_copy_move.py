@@ -5,6 +5,7 @@ from pytest import mark
 
 from glue_file_processing.src.glue_file_processing.boto_session import BotoSession
 from glue_file_processing.src.glue_file_processing.process_steps import ProcessSteps
+from glue_file_processing.src.glue_file_processing.s3_transition import S3Transition
 
 test_copy = [
     ({"file_key": "a/b/c.txt", "file_bucket": "tests",
@@ -16,6 +17,11 @@ test_move = [
       "target_key": "d/e/f.txt", "target_bucket": "tests"}, True)
 ]
 
+test_multipart_copy = [
+    ({"file_key": "a/b/g.txt", "file_bucket": "tests",
+      "target_key": "d/e/g.txt", "target_bucket": "tests"}, 11 * 1024 * 1024, 5 * 1024 * 1024, 3)
+]
+
 
 @mock_s3
 class TestCopyMove:
@@ -62,3 +68,37 @@ class TestCopyMove:
         is_exists = s3_helper.s3_key_exists(file_bucket=input_data["file_bucket"],
                                             file_key=input_data["file_key"])
         assert not is_exists == expected
+
+    @mark.parametrize("input_data, expected", test_copy)
+    def test_copy_returns_version_id(self, s3_helper, input_data, expected):
+        s3_helper.create_bucket(file_bucket=input_data["file_bucket"])
+        s3_helper.create_file_key(file_bucket=input_data["file_bucket"], file_key=input_data["file_key"],
+                                  file_data="this is a tests file")
+        file_operation_context = FileOperationsContext(file_bucket=input_data["file_bucket"],
+                                                       file_key=input_data["file_key"],
+                                                       target_bucket=input_data["target_bucket"],
+                                                       target_key=input_data["target_key"]
+                                                       )
+        version_id = ProcessSteps(BotoSession().get_session(AwsRegion.EUIreland)
+                                  ).copy_file(file_operation_context)
+        assert version_id == s3_helper.get_version(file_bucket=input_data["target_bucket"],
+                                                   file_key=input_data["target_key"])
+
+    @mark.parametrize("input_data, size, part_size, part_count", test_multipart_copy)
+    def test_multipart_copy(self, s3_helper, input_data, size, part_size, part_count):
+        file_data = bytes(range(256)) * (size // 256)
+        s3_helper.create_bucket(file_bucket=input_data["file_bucket"])
+        s3_helper.create_file_key(file_bucket=input_data["file_bucket"], file_key=input_data["file_key"],
+                                  file_data=file_data)
+        session = BotoSession().get_session(AwsRegion.EUIreland)
+        session.client('s3').put_object_tagging(Bucket=input_data["file_bucket"], Key=input_data["file_key"],
+                                                Tagging={'TagSet': [{'Key': 'hash', 'Value': 'abc'}]})
+
+        result = S3Transition(session, multipart_threshold=part_size, part_size=part_size).copy(
+            file_bucket=input_data["file_bucket"], file_key=input_data["file_key"], file_version_id=None,
+            target_bucket=input_data["target_bucket"], target_key=input_data["target_key"])
+
+        assert result.version_id == s3_helper.get_version(file_bucket=input_data["target_bucket"],
+                                                          file_key=input_data["target_key"])
+        assert s3_helper.get_binary_content(input_data["target_bucket"], input_data["target_key"]) == file_data
+        assert s3_helper.get_tagging(input_data["target_bucket"], input_data["target_key"]) == {'hash': 'abc'}
@@ -0,0 +1,118 @@
+import io
+import re
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+from pytest import mark, raises
+
+from glue_file_processing.src.glue_file_processing.config import Config
+from glue_file_processing.src.glue_file_processing.csv_parser import ParseSpec, read_csv, requires_python_engine
+from glue_file_processing.src.glue_file_processing.pipeline_enum import ParserBackend
+
+file_data = ('Name,Amount,Date\n'
+             '"Test, Ltd",20.340,2019-11-10\n'
+             'Test2,,2019-11-11\n')
+
+test_backends = [(backend,) for backend in ParserBackend]
+
+test_delimiters = [
+    (',', False),
+    ('|', False),
+    ('||', True),
+    (None, True)
+]
+
+
+@mark.parametrize("backend", test_backends)
+def test_backends_read_strings(backend):
+    df = read_csv(io.BytesIO(file_data.encode('utf-8')), ',', backend[0])
+
+    expected_df = read_csv(io.BytesIO(file_data.encode('utf-8')), ',', ParserBackend.Python)
+    assert list(df.columns) == ['Name', 'Amount', 'Date']
+    assert list(df['Name']) == ['Test, Ltd', 'Test2']
+    assert df['Amount'][0] == '20.340'
+    assert pd.isnull(df['Amount'][1])
+    assert df.fillna('').values.tolist() == expected_df.fillna('').values.tolist()
+
+
+@mark.parametrize("delimiter, expected", test_delimiters)
+def test_requires_python_engine(delimiter, expected):
+    assert requires_python_engine(delimiter) == expected
+
+
+@mark.parametrize("backend", test_backends)
+def test_multi_character_delimiter_falls_back_to_python(backend):
+    data = file_data.replace(',', '||').replace('"Test|| Ltd"', 'Test Ltd').encode('utf-8')
+    df = read_csv(io.BytesIO(data), r'\|\|', backend[0])
+    assert list(df.columns) == ['Name', 'Amount', 'Date']
+    assert list(df['Name']) == ['Test Ltd', 'Test2']
+
+
+TYPED_CONFIG = Config({'delimiter': ',', 'file_name_timestamp': '%Y%m%d%H%M%S',
+                       "schema": [
+                           {"name": "asofdate", "type": "DATE", "is_calculated": "true"},
+                           {"name": "OrderDate", "type": "TIMESTAMP"},
+                           {"name": "TradeDate", "type": "DATE"},
+                           {"name": "TranType", "type": "STRING"},
+                           {"name": "Quantity", "type": "DECIMAL"},
+                           {"name": "Price", "type": "DECIMAL(5,2)"},
+                           {"name": "Units", "type": "INT"},
+                           {"name": "IsFixed", "type": "BOOLEAN"}
+                       ]})
+
+typed_file_data = ('OrderDate,TradeDate,TranType,Quantity,Price,Units,IsFixed\n'
+                   '"2019-11-10T17:07:01","2019-11-10","Test","34.3445566",1.005,3,true\n'
+                   ',,,,,,\n')
+
+
+def test_parse_spec_from_schema():
+    spec = ParseSpec.from_schema(TYPED_CONFIG.schema)
+    assert spec.dtype == {'TranType': str}
+    assert sorted(spec.converters.keys()) == ['IsFixed', 'Price', 'Quantity', 'Units']
+    assert spec.timestamp_columns == ['OrderDate']
+    assert spec.date_columns == ['TradeDate']
+
+
+@mark.parametrize("backend", test_backends)
+def test_backends_read_typed(backend):
+    spec = ParseSpec.from_schema(TYPED_CONFIG.schema)
+    df = read_csv(io.BytesIO(typed_file_data.encode('utf-8')), ',', backend[0], spec)
+
+    assert df['OrderDate'][0] == pd.Timestamp('2019-11-10T17:07:01')
+    assert df['TradeDate'][0] == date(2019, 11, 10)
+    assert df['TranType'][0] == 'Test'
+    assert df['Quantity'][0] == Decimal('34.3445566')
+    assert df['Price'][0] == Decimal('1.01')
+    assert df['Units'][0] == 3
+    assert df['IsFixed'][0] is True
+    assert all(pd.isnull(value) for value in df.iloc[1])
+
+
+def test_python_backend_by_default():
+    schema = [{"name": "asofdate", "type": "DATE", "is_calculated": "true"}]
+    assert Config({'schema': schema}).parser_backend == ParserBackend.Python
+    assert Config({'schema': schema, 'parser_backend': 'pyarrow'}).parser_backend == ParserBackend.Arrow
+
+
+test_invalid_values = [
+    ('Units', 'three', "not a valid integer: 'three'"),
+    ('IsFixed', 'maybe', "not a valid boolean: 'maybe'"),
+    ('Quantity', 'lots', "not a valid DECIMAL: 'lots'"),
+    ('Price', '1' * 40, "not a valid DECIMAL(5,2)"),
+    ('Price', '12345.67', "not a valid DECIMAL(5,2): '12345.67'"),
+    ('OrderDate', 'yesterday', "not a valid date or timestamp, e.g. 'yesterday'")
+]
+
+
+@mark.parametrize("column, value, message", test_invalid_values)
+@mark.parametrize("backend", test_backends)
+def test_backends_reject_invalid_values(backend, column, value, message):
+    spec = ParseSpec.from_schema(TYPED_CONFIG.schema)
+    values = {'OrderDate': '2019-11-10T17:07:01', 'TradeDate': '2019-11-10', 'TranType': 'Test',
+              'Quantity': '34.3445566', 'Price': '1.005', 'Units': '3', 'IsFixed': 'true', column: value}
+    data = ','.join(values.keys()) + '\n' + ','.join(values.values()) + '\n'
+
+    with raises(ValueError, match=re.escape(f"Column '{column}'")) as error:
+        read_csv(io.BytesIO(data.encode('utf-8')), ',', backend[0], spec)
+    assert message in str(error.value)
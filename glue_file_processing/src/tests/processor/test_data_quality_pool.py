@@ -0,0 +1,25 @@
+import pickle
+
+from data_quality.model import CheckResult, RuleResult, RuleStatus
+
+from glue_file_processing.src.glue_file_processing.data_quality_pool import STACKTRACE, keep_stacktraces
+
+
+def failing_rule():
+    raise KeyError('missing_column')
+
+
+def test_stacktrace_survives_the_pool():
+    rule_result = RuleResult(RuleStatus.Error, 0.0, 'blank')
+    try:
+        failing_rule()
+    except KeyError as ex:
+        rule_result.exception = ex
+    check_result = CheckResult(0.0, [rule_result, RuleResult(RuleStatus.Pass, 1.0, 'duplicates')])
+
+    keep_stacktraces(check_result)
+    returned = pickle.loads(pickle.dumps(check_result))
+
+    assert returned.rule_results[0].exception.__traceback__ is None
+    assert 'in failing_rule' in getattr(returned.rule_results[0], STACKTRACE)
+    assert getattr(returned.rule_results[1], STACKTRACE, None) is None
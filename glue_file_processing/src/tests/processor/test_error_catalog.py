@@ -0,0 +1,98 @@
+from datetime import date
+from decimal import Decimal
+
+import boto3
+import pandas as pd
+from core.aws import AwsRegion
+from moto import mock_glue
+from pytest import mark
+
+from glue_file_processing.src.glue_file_processing.boto_session import BotoSession
+from glue_file_processing.src.glue_file_processing.error_catalog import ErrorCatalog, arrow_schema, catalog_type
+
+database_name = "curated"
+table_name = "cfm_errors_detailed"
+location = "s3://target_bucket/CFM/error_reporting/detailed/"
+partition_location = f"{location}year=2019/year_month=201911/process=Everest/data_source=Holdings/"
+partition_values = ['2019', '201911', 'Everest', 'Holdings']
+
+
+def create_database():
+    glue = boto3.client('glue', region_name=AwsRegion.EUIreland.value)
+    glue.create_database(DatabaseInput={'Name': database_name})
+    return glue
+
+
+def table_columns(glue):
+    table = glue.get_table(DatabaseName=database_name, Name=table_name)['Table']
+    return [(column['Name'], column['Type']) for column in table['StorageDescriptor']['Columns']]
+
+
+def catalog_partitions(glue):
+    partitions = glue.get_partitions(DatabaseName=database_name, TableName=table_name)['Partitions']
+    return sorted(partition['Values'] for partition in partitions)
+
+
+test_types = [
+    (pd.Series([1, 2]), 'bigint'),
+    (pd.Series([1.5]), 'double'),
+    (pd.Series([True]), 'boolean'),
+    (pd.Series(pd.to_datetime(['2019-11-21'])), 'timestamp'),
+    (pd.Series([date(2019, 11, 21)]), 'date'),
+    (pd.Series([Decimal('1.50'), Decimal('12.25')]), 'decimal(4,2)'),
+    (pd.Series(['a']), 'string'),
+    (pd.Series([None]), 'string')
+]
+
+
+@mark.parametrize("series, expected", test_types)
+def test_catalog_type(series, expected):
+    schema = arrow_schema(pd.DataFrame({'column': series}))
+    assert catalog_type(schema.field('column').type) == expected
+
+
+@mock_glue
+class TestErrorCatalog:
+    def test_creates_missing_table(self):
+        glue = create_database()
+        error_catalog = ErrorCatalog(BotoSession().get_session(AwsRegion.EUIreland))
+        schema = arrow_schema(pd.DataFrame({'row_index': [1], 'rule_name': ['blank'], 'year': ['2019']}))
+
+        error_catalog.update(database_name, table_name, location, [schema], partition_values, partition_location)
+
+        assert table_columns(glue) == [('row_index', 'bigint'), ('rule_name', 'string')]
+        assert catalog_partitions(glue) == [partition_values]
+
+    def test_creates_date_and_decimal_columns(self):
+        glue = create_database()
+        error_catalog = ErrorCatalog(BotoSession().get_session(AwsRegion.EUIreland))
+        schema = arrow_schema(pd.DataFrame({'asofdate': [date(2019, 11, 21)], 'Amount': [Decimal('20.34')]}))
+
+        error_catalog.update(database_name, table_name, location, [schema], partition_values, partition_location)
+
+        assert table_columns(glue) == [('asofdate', 'date'), ('Amount', 'decimal(4,2)')]
+
+    def test_adds_new_columns_once(self):
+        glue = create_database()
+        error_catalog = ErrorCatalog(BotoSession().get_session(AwsRegion.EUIreland))
+        schema = arrow_schema(pd.DataFrame({'row_index': [1]}))
+        error_catalog.update(database_name, table_name, location, [schema], partition_values, partition_location)
+
+        schema = arrow_schema(pd.DataFrame({'row_index': [1], 'Amount': [1.5]}))
+        error_catalog.update(database_name, table_name, location, [schema], partition_values, partition_location)
+        error_catalog.update(database_name, table_name, location, [schema],
+                             ['2019', '201912', 'Everest', 'Holdings'], partition_location)
+
+        assert table_columns(glue) == [('row_index', 'bigint'), ('Amount', 'double')]
+        assert catalog_partitions(glue) == [partition_values, ['2019', '201912', 'Everest', 'Holdings']]
+
+    def test_known_columns_are_cached(self):
+        create_database()
+        error_catalog = ErrorCatalog(BotoSession().get_session(AwsRegion.EUIreland))
+        schema = arrow_schema(pd.DataFrame({'row_index': [1]}))
+        error_catalog.update(database_name, table_name, location, [schema], partition_values, partition_location)
+
+        boto3.client('glue', region_name=AwsRegion.EUIreland.value).delete_table(
+            DatabaseName=database_name, Name=table_name)
+        # nothing new is known to be missing, so the catalog is not called again
+        error_catalog.update(database_name, table_name, location, [schema], partition_values, partition_location)
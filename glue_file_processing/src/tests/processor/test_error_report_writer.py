@@ -0,0 +1,77 @@
+import pandas as pd
+import pyarrow
+import pyarrow.parquet
+from data_quality.model import RuleResult, RuleStatus
+from moto import mock_s3
+from pytest import mark
+
+from core.aws import AwsRegion
+from glue_file_processing.src.glue_file_processing.boto_session import BotoSession
+from glue_file_processing.src.glue_file_processing.error_catalog import catalog_type
+from glue_file_processing.src.glue_file_processing.error_report_writer import (
+    DetailedErrorReportWriter, rule_error_key)
+
+bucket = 'test'
+error_key = 'CFM/error_reporting/detailed/year=2020/year_month=202002/process=Everest/data_source=Holdings/' \
+            'Holdings20200205233143.parquet.snappy'
+
+test_rule_keys = [
+    ('blank', 'Holdings20200205233143_blank.parquet.snappy'),
+    ('column names', 'Holdings20200205233143_column_names.parquet.snappy')
+]
+
+
+@mark.parametrize("rule_name, expected_file_name", test_rule_keys)
+def test_rule_error_key(rule_name, expected_file_name):
+    assert rule_error_key(error_key, rule_name) == f"{error_key.rsplit('/', 1)[0]}/{expected_file_name}"
+
+
+@mock_s3
+@mark.parametrize("max_workers", [1, 4])
+def test_write_one_file_per_rule(s3_helper, max_workers):
+    s3_helper.create_bucket(bucket)
+    rule_results = [
+        RuleResult(RuleStatus.Fail, 0.5, 'blank', pd.DataFrame({'row_index': [1, 2], 'blank_column': ['a', 'b']})),
+        RuleResult(RuleStatus.Pass, 1.0, 'duplicates', pd.DataFrame(columns=['row_index'])),
+        RuleResult(RuleStatus.Fail, 0.9, 'outliers', pd.DataFrame({'row_index': [2], 'outlier_value': [1.5]}))
+    ]
+
+    writer = DetailedErrorReportWriter(BotoSession().get_session(AwsRegion.EUIreland), max_workers)
+    written = writer.write(rule_results, bucket, error_key)
+
+    assert [schema.names for schema in written] == [['row_index', 'blank_column', 'rule_name'],
+                                                    ['row_index', 'outlier_value', 'rule_name']]
+    assert s3_helper.s3_key_exists(bucket, rule_error_key(error_key, 'duplicates')) is False
+    outliers = pyarrow.parquet.read_table(pyarrow.BufferReader(
+        s3_helper.get_binary_content(bucket, rule_error_key(error_key, 'outliers'))))
+    assert outliers.schema.names == ['row_index', 'outlier_value', 'rule_name']
+    assert outliers.to_pydict()['rule_name'] == ['outliers']
+
+
+@mock_s3
+def test_write_without_errors(s3_helper):
+    writer = DetailedErrorReportWriter(BotoSession().get_session(AwsRegion.EUIreland))
+
+    assert writer.write([RuleResult(RuleStatus.Pass, 1.0, 'blank')], bucket, error_key) == []
+
+
+@mock_s3
+def test_columns_share_one_type_across_rules(s3_helper):
+    s3_helper.create_bucket(bucket)
+    rule_results = [
+        RuleResult(RuleStatus.Fail, 0.5, 'blank', pd.DataFrame({'row_index': [1, 2], 'value': [3, None]})),
+        RuleResult(RuleStatus.Fail, 0.9, 'format', pd.DataFrame({'row_index': [4, 5], 'value': ['x', None]})),
+        RuleResult(RuleStatus.Fail, 0.9, 'mixed', pd.DataFrame({'row_index': [6, 7, 8], 'other': [1, 'a', None]}))
+    ]
+
+    writer = DetailedErrorReportWriter(BotoSession().get_session(AwsRegion.EUIreland))
+    written = writer.write(rule_results, bucket, error_key)
+
+    assert [dict(zip(schema.names, map(catalog_type, schema.types))) for schema in written] == [
+        {'row_index': 'bigint', 'value': 'string', 'rule_name': 'string'},
+        {'row_index': 'bigint', 'value': 'string', 'rule_name': 'string'},
+        {'row_index': 'bigint', 'other': 'string', 'rule_name': 'string'}]
+    blank, _, mixed = [pyarrow.parquet.read_table(pyarrow.BufferReader(s3_helper.get_binary_content(
+        bucket, rule_error_key(error_key, rule_result.rule_name)))) for rule_result in rule_results]
+    assert blank.to_pydict()['value'] == ['3.0', None]
+    assert mixed.to_pydict()['other'] == ['1', 'a', None]
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from data_quality.model import RuleResult, RuleStatus
+
+from glue_file_processing.src.glue_file_processing.error_row_set import ErrorRowSet
+
+
+def rule_result(row_indexes):
+    errors_df = pd.DataFrame({'row_index': row_indexes, 'rule_name': 'rule'}, columns=['row_index', 'rule_name'])
+    return RuleResult(RuleStatus.Fail, 0.0, 'rule', errors_df)
+
+
+def test_repeated_rows_are_counted_once():
+    error_rows = ErrorRowSet([5, 1, 5, 3])
+
+    assert len(error_rows) == 3
+    assert list(error_rows.to_array()) == [1, 3, 5]
+    assert 3 in error_rows
+    assert 4 not in error_rows
+
+
+def test_union():
+    assert ErrorRowSet([1, 3]) | ErrorRowSet([3, 7]) == ErrorRowSet([1, 3, 7])
+    assert len(ErrorRowSet().union(ErrorRowSet())) == 0
+
+
+def test_from_rule_results():
+    error_rows = ErrorRowSet.from_rule_results([rule_result([4, 2]), rule_result([]), rule_result([2, 9])])
+
+    assert error_rows == ErrorRowSet([2, 4, 9])
+
+
+def test_from_errors_without_rows():
+    assert len(ErrorRowSet.from_errors(pd.DataFrame())) == 0
+    assert len(ErrorRowSet.from_errors(pd.DataFrame(columns=['row_index']))) == 0
+
+
+def test_mask():
+    index = pd.RangeIndex(10, 15)
+    mask = ErrorRowSet([0, 11, 14, 20]).mask(index)
+
+    assert np.array_equal(mask, [False, True, False, False, True])
@@ -1,7 +1,8 @@
 from datetime import datetime, date
 import decimal
+import random
 
-from pytest import raises
+from pytest import mark, raises
 
 import pandas as pd
 
@@ -9,6 +10,8 @@ from glue_file_processing.src.glue_file_processing.transform.extend import (
     with_as_of_date,
     with_error_columns)
 from glue_file_processing.src.glue_file_processing.config import AsOfDateConfig, AsOfDateSource, ColumnName, ColumnConfig
+from glue_file_processing.src.glue_file_processing.error_row_set import ErrorRowSet
+from .extend_reference import reference_with_error_columns
 
 
 def test_with_as_of_date_from_timestamp_empty():
@@ -152,7 +155,7 @@ def test_with_error_columns_empty():
     error_indexes = pd.DataFrame(columns=[ColumnName.ROW_INDEX])
     correlation_id = ''
 
-    with_error_columns(df, error_indexes, correlation_id, schema_config)
+    with_error_columns(df, ErrorRowSet.from_errors(error_indexes), correlation_id, schema_config)
 
 
 def test_with_error_columns_all_wrong():
@@ -167,7 +170,7 @@ def test_with_error_columns_all_wrong():
         'correlation_id': ColumnConfig('correlation_id', 'INT', True),
         'confidence_level': ColumnConfig('confidence_level', 'INT', True),
     }
-    dfe = with_error_columns(df, error_indexes, '1', schema_config)
+    dfe = with_error_columns(df, ErrorRowSet.from_errors(error_indexes), '1', schema_config)
 
     assert list(dfe['confidence_level']) == [0, 0]
 
@@ -180,7 +183,7 @@ def test_with_confidence_level_all_correct():
         'correlation_id': ColumnConfig('correlation_id', 'INT', True),
         'confidence_level': ColumnConfig('confidence_level', 'INT', True),
     }
-    dfe = with_error_columns(df, error_indexes, 'a', schema_config)
+    dfe = with_error_columns(df, ErrorRowSet.from_errors(error_indexes), 'a', schema_config)
 
     assert list(dfe['confidence_level']) == [1, 1]
     assert list(dfe['row_index']) == [0, 1]
@@ -199,7 +202,7 @@ def test_with_error_columns_mixed():
         'confidence_level': ColumnConfig('confidence_level', 'INT', True),
     }
 
-    dfe = with_error_columns(df, error_indexes, 'a', schema_config)
+    dfe = with_error_columns(df, ErrorRowSet.from_errors(error_indexes), 'a', schema_config)
     assert list(dfe['row_index']) == [0, 1]
     assert list(dfe['confidence_level']) == [0, 1]
     assert list(dfe['correlation_id']) == ['a', 'a']
@@ -214,7 +217,39 @@ def test_with_confidence_level_mixed():
         'confidence_level': ColumnConfig('confidence_level', 'INT', True),
     }
 
-    dfe = with_error_columns(df, error_indexes, 'a', schema_config)
+    dfe = with_error_columns(df, ErrorRowSet.from_errors(error_indexes), 'a', schema_config)
     assert list(dfe['row_index']) == [0, 1]
     assert list(dfe['confidence_level']) == [1, 0]
     assert list(dfe['correlation_id']) == ['a', 'a']
+
+
+def random_error_frame(seed: int):
+    rnd = random.Random(seed)
+    row_count = rnd.randint(0, 50)
+    df = pd.DataFrame({
+        'name': [f"name {rnd.randint(0, 10)}" for _ in range(row_count)],
+        'amount': [decimal.Decimal(rnd.randint(-100, 100)) for _ in range(row_count)],
+        'count': [rnd.randint(0, 1000) for _ in range(row_count)]})
+    # error rows repeat when a row breaks several rules, and rows past the end of the frame are ignored
+    error_rows = [rnd.randint(0, row_count + 5) for _ in range(rnd.randint(0, row_count * 2))]
+    error_indexes = pd.DataFrame({ColumnName.ROW_INDEX: error_rows}, columns=[ColumnName.ROW_INDEX])
+
+    # the calculated columns go anywhere in the schema, in the order they are added
+    column_names = ['name', 'amount', 'count']
+    calculated = [ColumnName.ROW_INDEX, ColumnName.CORRELATION_ID, ColumnName.CONFIDENCE_LEVEL]
+    for offset, position in enumerate(sorted(rnd.randint(0, len(column_names)) for _ in calculated)):
+        column_names.insert(position + offset, calculated[offset])
+    schema_config = {name: ColumnConfig(name, 'STRING', True) for name in column_names}
+    return df, error_indexes, schema_config
+
+
+@mark.parametrize("seed", range(50))
+def test_with_error_columns_matches_reference(seed):
+    df, error_indexes, schema_config = random_error_frame(seed)
+    original = df.copy(deep=True)
+
+    expected = reference_with_error_columns(df, error_indexes, 'id', schema_config)
+    actual = with_error_columns(df, ErrorRowSet.from_errors(error_indexes), 'id', schema_config)
+
+    pd.testing.assert_frame_equal(expected, actual)
+    pd.testing.assert_frame_equal(original, df)
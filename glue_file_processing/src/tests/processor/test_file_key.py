@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from pytest import mark, raises
+
+from glue_file_processing.src.glue_file_processing.util.file_key import FileKey
+from glue_file_processing.src.glue_file_processing.util.path import get_filename_timestamp
+
+fmt = '%Y%m%d%H%M%S'
+file_key = 'CFM/Everest/Holdings/AutomatedStatus/Processed/Holdings20191121233126.csv'
+
+
+def test_parses_key():
+    key = FileKey(file_key, fmt)
+
+    assert (key.business_area, key.process, key.data_source) == ('CFM', 'Everest', 'Holdings')
+    assert key.file_name == 'Holdings20191121233126.csv'
+    assert key.timestamp == datetime(2019, 11, 21, 23, 31, 26)
+
+
+def test_derived_keys():
+    key = FileKey(file_key, fmt)
+
+    assert key.target_key == 'CFM/Everest/Holdings/2019/201911/Holdings20191121233126.csv'
+    assert key.parquet_key == ('CFM/Everest/Holdings/parquet/year=2019/year_month=201911/year_month_day=20191121/'
+                               'Holdings20191121233126.parquet')
+    assert key.error_key('detailed') == ('CFM/error_reporting/detailed/year=2019/year_month=201911/'
+                                         'process=Everest/data_source=Holdings/Holdings20191121233126.parquet.snappy')
+    assert key.partition_values == ('2019', '201911', '20191121')
+    assert key.detail_partition_values == ['2019', '201911', 'Everest', 'Holdings']
+
+
+def test_target_key_derives_the_same_keys():
+    key = FileKey(file_key, fmt)
+    target = FileKey(key.target_key, fmt)
+
+    assert target.target_key == key.target_key
+    assert target.parquet_key == key.parquet_key
+    assert target.error_key('summary') == key.error_key('summary')
+
+
+def test_parse_reuses_keys():
+    assert FileKey.parse(file_key, fmt) is FileKey.parse(file_key, fmt)
+    assert FileKey.parse(file_key, fmt) == FileKey(file_key, fmt)
+
+
+def test_is_immutable():
+    key = FileKey(file_key, fmt)
+
+    with raises(AttributeError):
+        key.file_name = 'Holdings20191122233126.csv'
+    with raises(AttributeError):
+        key.other = 'value'
+
+
+test_timestamps = [
+    ('Holdings20191121233126.csv', '%Y%m%d%H%M%S', datetime(2019, 11, 21, 23, 31, 26)),
+    ('Holdings_2019-11-21.csv', '%Y-%m-%d', datetime(2019, 11, 21)),
+    ('Holdings21112019.csv', '%d%m%Y', datetime(2019, 11, 21)),
+]
+
+
+@mark.parametrize("file_name, timestamp_fmt, expected", test_timestamps)
+def test_timestamp_of_format(file_name, timestamp_fmt, expected):
+    assert FileKey(f'CFM/Everest/Holdings/{file_name}', timestamp_fmt).timestamp == expected
+
+
+def test_unparseable_timestamp():
+    with raises(ValueError):
+        FileKey('CFM/Everest/Holdings/Holdings.csv', fmt)
+    with raises(ValueError):
+        get_filename_timestamp('Holdings.csv', fmt)
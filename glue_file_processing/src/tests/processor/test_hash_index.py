@@ -0,0 +1,44 @@
+from pytest import mark
+
+from glue_file_processing.src.glue_file_processing.hash_index import (
+    HashRecord, InMemoryHashIndex, SqliteHashIndex)
+
+
+def record(hash_value, correlation_id='1'):
+    return HashRecord(hash_value=hash_value, correlation_id=correlation_id,
+                      file_key='CFM/Everest/Holdings/AutomatedStatus/Processed/Holdings20191121233126.csv',
+                      target_key='CFM/Everest/Holdings/2019/201911/Holdings20191121233126.csv',
+                      parquet_key='CFM/Everest/Holdings/parquet/year=2019/year_month=201911/'
+                                  'year_month_day=20191121/Holdings20191121233126.parquet',
+                      partition_location='s3://curated/CFM/Everest/Holdings/parquet/year=2019/year_month=201911/'
+                                         'year_month_day=20191121/',
+                      quality_tags={'overall_quality_score': '1.0'},
+                      recorded_on='2019-11-21T23:40:00')
+
+
+@mark.parametrize("index_type", ['memory', 'sqlite'])
+def test_get_and_put(tmp_path, index_type):
+    hash_index = InMemoryHashIndex() if index_type == 'memory' else SqliteHashIndex(str(tmp_path / 'index.db'))
+
+    assert hash_index.get('abc') is None
+    hash_index.put(record('abc'))
+    hash_index.put(record('abc', correlation_id='2'))
+    hash_index.put(record('def'))
+
+    assert hash_index.get('abc') == record('abc', correlation_id='2')
+    assert hash_index.get('def') == record('def')
+
+    hash_index.delete('abc')
+    hash_index.delete('missing')
+
+    assert hash_index.get('abc') is None
+    assert hash_index.get('def') == record('def')
+
+
+def test_sqlite_index_outlives_the_process(tmp_path):
+    db_path = str(tmp_path / 'index.db')
+    hash_index = SqliteHashIndex(db_path)
+    hash_index.put(record('abc'))
+    hash_index.close()
+
+    assert SqliteHashIndex(db_path).get('abc') == record('abc')
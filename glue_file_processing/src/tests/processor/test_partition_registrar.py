@@ -0,0 +1,104 @@
+import boto3
+from core.aws import AwsRegion
+from moto import mock_glue
+from pytest import mark, raises
+
+from glue_file_processing.src.glue_file_processing.boto_session import BotoSession
+from glue_file_processing.src.glue_file_processing.partition_registrar import PartitionRegistrar
+
+database_name = "curated"
+table_name = "test_pipeline"
+location = "s3://target_bucket/a/b/c/parquet"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def create_catalog(existing_partitions):
+    glue = boto3.client('glue', region_name=AwsRegion.EUIreland.value)
+    glue.create_database(DatabaseInput={'Name': database_name})
+    create_table(glue, table_name)
+    for values in existing_partitions:
+        glue.create_partition(DatabaseName=database_name, TableName=table_name, PartitionInput={
+            'Values': values, 'StorageDescriptor': {'Location': f"{location}/{'/'.join(values)}"}})
+    return glue
+
+
+def create_table(glue, name):
+    glue.create_table(DatabaseName=database_name, TableInput={
+        'Name': name,
+        'StorageDescriptor': {'Columns': [{'Name': 'name', 'Type': 'string'}], 'Location': location},
+        'PartitionKeys': [{'Name': 'year', 'Type': 'string'}, {'Name': 'year_month', 'Type': 'string'}]})
+
+
+def catalog_partitions(glue):
+    partitions = glue.get_partitions(DatabaseName=database_name, TableName=table_name)['Partitions']
+    return sorted(partition['Values'] for partition in partitions)
+
+
+test_register = [
+    # partitions already in the catalog, partitions registered, created, skipped
+    ([], [['2019', '201910'], ['2019', '201910'], ['2019', '201911']], 2, 1),
+    ([['2019', '201910']], [['2019', '201910'], ['2019', '201911']], 1, 1)
+]
+
+
+@mock_glue
+class TestPartitionRegistrar:
+    @mark.parametrize("existing, registered, created, skipped", test_register)
+    def test_register(self, existing, registered, created, skipped):
+        glue = create_catalog(existing)
+        registrar = PartitionRegistrar(BotoSession().get_session(AwsRegion.EUIreland))
+
+        for values in registered:
+            registrar.register(database_name, table_name, values, f"{location}/{'/'.join(values)}")
+
+        assert (registrar.created_count, registrar.skipped_count) == (created, skipped)
+        assert catalog_partitions(glue) == sorted(map(list, set(map(tuple, existing + registered))))
+
+    def test_buffered_until_delay(self):
+        glue = create_catalog([])
+        clock = FakeClock()
+        registrar = PartitionRegistrar(BotoSession().get_session(AwsRegion.EUIreland), max_delay=60, clock=clock)
+
+        registrar.register(database_name, table_name, ['2019', '201910'], f"{location}/2019/201910")
+        registrar.register(database_name, table_name, ['2019', '201911'], f"{location}/2019/201911")
+        assert registrar.pending_count == 2
+        assert catalog_partitions(glue) == []
+
+        clock.now = 61
+        registrar.register(database_name, table_name, ['2019', '201912'], f"{location}/2019/201912")
+        assert registrar.pending_count == 0
+        assert len(catalog_partitions(glue)) == 3
+
+    def test_delayed_failure_reported_to_registering_run(self):
+        glue = create_catalog([])
+        create_table(glue, 'other_pipeline')
+        clock = FakeClock()
+        registrar = PartitionRegistrar(BotoSession().get_session(AwsRegion.EUIreland), max_delay=60, clock=clock)
+        failures = {'first': [], 'second': []}
+
+        registrar.register(database_name, table_name, ['2019', '201910'], f"{location}/2019/201910",
+                           failures['first'].append)
+        glue.delete_table(DatabaseName=database_name, Name=table_name)
+        clock.now = 61
+        registrar.register(database_name, 'other_pipeline', ['2019', '201911'], f"{location}/2019/201911",
+                           failures['second'].append)
+
+        assert len(failures['first']) == 1
+        assert failures['second'] == []
+        assert registrar.created_count == 1
+
+    def test_flush_raises_unattributed_failures(self):
+        glue = create_catalog([])
+        registrar = PartitionRegistrar(BotoSession().get_session(AwsRegion.EUIreland), max_delay=60)
+
+        registrar.register(database_name, table_name, ['2019', '201910'], f"{location}/2019/201910")
+        glue.delete_table(DatabaseName=database_name, Name=table_name)
+        with raises(RuntimeError, match="Unable to register 1 partition"):
+            registrar.flush()
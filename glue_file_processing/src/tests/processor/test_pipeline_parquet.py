@@ -4,7 +4,6 @@ import decimal
 from contextlib import contextmanager
 from typing import List
 
-import pandas as pd
 import pyarrow
 from core.aws import AwsRegion
 from gluecatalog.sanitize import sanitize_column_name
@@ -18,6 +17,7 @@ from glue_file_processing.src.glue_file_processing.pipeline_configuration import
 from glue_file_processing.src.glue_file_processing.pipeline_configuration import ConfigurationException
 from glue_file_processing.src.glue_file_processing.pipeline_parquet import PipelineParquet
 from glue_file_processing.src.glue_file_processing.config import Config
+from glue_file_processing.src.glue_file_processing.error_row_set import ErrorRowSet
 
 
 @contextmanager
@@ -121,12 +121,12 @@ class TestPipelineParquet:
     def test_create_parquet_2(self, initialise, s3_helper, test_case, test_result, source_bucket, source_key,
                               target_bucket, target_key, source_data_columns, expected_parquet_column_names, config,
                               expected_key):
-        error_indexes = pd.DataFrame(columns=['row_index'])
+        error_rows = ErrorRowSet()
         correlation_id = 'xyz-123'
         initialise.create_bucket_key(s3_helper, source_bucket, source_key, source_data_columns, target_bucket)
         logger.info(f"Running test case {test_case}")
         with test_result:
-            parquet_key = self.pipeline_parquet.create_parquet(target_bucket, target_key, Config(config), error_indexes,
+            parquet_key = self.pipeline_parquet.create_parquet(target_bucket, target_key, Config(config), error_rows,
                                                                correlation_id)
             assert parquet_key == expected_key
             file_content = pyarrow.py_buffer(s3_helper.get_binary_content(target_bucket, expected_key))
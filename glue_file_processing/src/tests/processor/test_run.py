@@ -10,7 +10,8 @@ from pytest import mark, raises, fixture
 from sns.topics import Topic
 
 from glue_file_processing.src.glue_file_processing.pipeline_configuration import CONFIGURATION
-from glue_file_processing.src.glue_file_processing.processor import Processor
+from glue_file_processing.src.glue_file_processing.hash_index import InMemoryHashIndex
+from glue_file_processing.src.glue_file_processing.processor import Processor, BatchProcessingError
 
 # assume for testing that the last parameter is the column list
 source_data_columns = CONFIGURATION['schema']
@@ -96,7 +97,9 @@ class TestRun:
         process_context = context(**context_input)
 
         with patch(
-                'glue_file_processing.src.glue_file_processing.pipeline_catalog.DataCatalogManager') as mock_catalog_manager:
+                'glue_file_processing.src.glue_file_processing.pipeline_catalog.DataCatalogManager') as mock_catalog_manager, \
+                patch('glue_file_processing.src.glue_file_processing.processor.ErrorCatalog'), \
+                patch('glue_file_processing.src.glue_file_processing.processor.PartitionRegistrar'):
             instance = mock_catalog_manager.return_value
             instance.is_table_needing_updating_schema.return_value = False
             Processor().run(context=process_context)
@@ -147,7 +150,9 @@ class TestRun:
         process_context = context(**context_input)
 
         with patch(
-                'glue_file_processing.src.glue_file_processing.pipeline_catalog.DataCatalogManager') as mock_catalog_manager:
+                'glue_file_processing.src.glue_file_processing.pipeline_catalog.DataCatalogManager') as mock_catalog_manager, \
+                patch('glue_file_processing.src.glue_file_processing.processor.ErrorCatalog'), \
+                patch('glue_file_processing.src.glue_file_processing.processor.PartitionRegistrar'):
             instance = mock_catalog_manager.return_value
             instance.is_table_needing_updating_schema.return_value = False
             Processor().run(context=process_context)
@@ -169,6 +174,147 @@ class TestRun:
             Processor().run(context=process_context)
 
 
+@mock_glue
+@mock_sns
+@mock_s3
+def test_run_batch_continues_after_failure(context):
+    contexts = [context(**dict(test_data_success[0][0], correlation_id=str(index),
+                               file_key=f"BusinessArea/BusinessProcess/DataSource/Automated/test{index}.txt"))
+                for index in range(3)]
+    processed = []
+
+    def run(process_context):
+        processed.append(process_context.correlation_id)
+        if process_context.correlation_id == '1':
+            raise ValueError("broken file")
+        if process_context.correlation_id == '2':
+            process_context.failure_notified = True
+            raise ValueError("reported failure")
+
+    processor = Processor()
+    with patch.object(processor, 'run', side_effect=run):
+        with raises(BatchProcessingError) as error:
+            processor.run_batch(contexts)
+
+    assert processed == ['0', '1', '2']
+    assert error.value.failed_files == ["raw_bucket/BusinessArea/BusinessProcess/DataSource/Automated/test1.txt",
+                                        "raw_bucket/BusinessArea/BusinessProcess/DataSource/Automated/test2.txt"]
+    assert error.value.unnotified_files == [
+        "raw_bucket/BusinessArea/BusinessProcess/DataSource/Automated/test1.txt"]
+
+
+@mock_glue
+@mock_sns
+@mock_s3
+def test_run_batch_skips_files_once_out_of_time(context):
+    contexts = [context(**dict(test_data_success[0][0], correlation_id=str(index))) for index in range(3)]
+    remaining_files = iter([True, True, False])
+
+    processor = Processor()
+    with patch.object(processor, 'run') as run:
+        skipped = processor.run_batch(contexts, has_time=lambda: next(remaining_files))
+
+    assert run.call_count == 2
+    assert skipped == contexts[2:]
+
+
+@mock_glue
+@mock_sns
+@mock_s3
+def test_run_batch_in_process_pool(context, initialise, target_key, s3_helper):
+    passing_input, passing_data = test_data_success[0]
+    failing_input, failing_data = test_run_missing_columns_failure[0]
+    failing_input = dict(failing_input, file_bucket=passing_input["file_bucket"])
+    contexts = []
+    for context_input, file_data in [(passing_input, passing_data), (failing_input, failing_data)]:
+        initialise.create_bucket_key(s3_helper, context_input["file_bucket"], context_input["file_key"], file_data,
+                                     context_input["target_bucket"])
+        version_id = s3_helper.get_version(file_bucket=context_input["file_bucket"],
+                                           file_key=context_input["file_key"])
+        contexts.append(context(**dict(context_input, file_version_id=version_id)))
+    topic_arn = s3_helper.create_topic(Topic.Error.value, AwsRegion.EUIreland.value)
+    for process_context in contexts:
+        process_context.account_number = topic_arn.split(':')[-2]
+
+    with patch(
+            'glue_file_processing.src.glue_file_processing.pipeline_catalog.DataCatalogManager') as mock_catalog_manager, \
+            patch('glue_file_processing.src.glue_file_processing.processor.ErrorCatalog'), \
+            patch('glue_file_processing.src.glue_file_processing.processor.PartitionRegistrar'):
+        instance = mock_catalog_manager.return_value
+        instance.is_table_needing_updating_schema.return_value = False
+        processor = Processor()
+        processor.config.max_workers = 2
+        processor.run_batch(contexts)
+
+    assert s3_helper.s3_key_exists(
+        passing_input["target_bucket"], target_key.get_target_key(passing_input["file_key"])) is True
+    assert s3_helper.s3_key_exists(
+        failing_input["target_bucket"], target_key.get_target_key(failing_input["file_key"])) is False
+
+
+@mock_glue
+@mock_sns
+@mock_s3
+def test_run_skips_resent_file(context, initialise, target_key, s3_helper):
+    context_input, file_data = test_data_success[0]
+    with patch(
+            'glue_file_processing.src.glue_file_processing.pipeline_catalog.DataCatalogManager') as mock_catalog_manager, \
+            patch('glue_file_processing.src.glue_file_processing.processor.ErrorCatalog'), \
+            patch('glue_file_processing.src.glue_file_processing.processor.PartitionRegistrar'):
+        instance = mock_catalog_manager.return_value
+        instance.is_table_needing_updating_schema.return_value = False
+        processor = Processor()
+        processor.hash_index = InMemoryHashIndex()
+        with patch.object(processor._process_steps, 'check_data_quality',
+                          wraps=processor._process_steps.check_data_quality) as check_data_quality:
+            for correlation_id in ['1', '2']:
+                initialise.create_bucket_key(s3_helper, context_input["file_bucket"], context_input["file_key"],
+                                             file_data, context_input["target_bucket"])
+                version_id = s3_helper.get_version(file_bucket=context_input["file_bucket"],
+                                                   file_key=context_input["file_key"])
+                processor.run(context(**dict(context_input, correlation_id=correlation_id,
+                                             file_version_id=version_id)))
+
+    assert check_data_quality.call_count == 1
+    tags = s3_helper.get_tagging(context_input["target_bucket"], target_key.get_target_key(context_input["file_key"]))
+    assert tags['duplicate_of'] == '1'
+    assert tags['correlation_id'] == '2'
+    assert tags['status'] == 'processed'
+
+
+@mock_glue
+@mock_sns
+@mock_s3
+def test_run_processes_resent_file_after_delayed_partition_failure(context, initialise, target_key, s3_helper):
+    context_input, file_data = test_data_success[0]
+    with patch(
+            'glue_file_processing.src.glue_file_processing.pipeline_catalog.DataCatalogManager') as mock_catalog_manager, \
+            patch('glue_file_processing.src.glue_file_processing.processor.ErrorCatalog'), \
+            patch('glue_file_processing.src.glue_file_processing.processor.PartitionRegistrar') as mock_registrar:
+        instance = mock_catalog_manager.return_value
+        instance.is_table_needing_updating_schema.return_value = False
+        processor = Processor()
+        processor.hash_index = InMemoryHashIndex()
+        with patch.object(processor._process_steps, 'check_data_quality',
+                          wraps=processor._process_steps.check_data_quality) as check_data_quality:
+            for correlation_id in ['1', '2']:
+                initialise.create_bucket_key(s3_helper, context_input["file_bucket"], context_input["file_key"],
+                                             file_data, context_input["target_bucket"])
+                version_id = s3_helper.get_version(file_bucket=context_input["file_bucket"],
+                                                   file_key=context_input["file_key"])
+                processor.run(context(**dict(context_input, correlation_id=correlation_id,
+                                             file_version_id=version_id)))
+                if correlation_id == '1':
+                    # the partition of the first run fails when it is flushed after the run
+                    on_failure = mock_registrar.return_value.register.call_args[0][4]
+                    on_failure(RuntimeError("Partition registration failed"))
+
+    assert check_data_quality.call_count == 2
+    tags = s3_helper.get_tagging(context_input["target_bucket"], target_key.get_target_key(context_input["file_key"]))
+    assert 'duplicate_of' not in tags
+    assert tags['correlation_id'] == '2'
+
+
 test_data = [
     ({"correlation_id": 'testrun:' + str(uuid.uuid4()),
       "file_key": "CFM/Everest/Holdings/Automated/Holdings20191121233126.csv",
@@ -0,0 +1,94 @@
+import json
+
+import pandas as pd
+from data_quality.model import CheckResult, RuleException, RuleResult, RuleStatus
+
+from glue_file_processing.src.glue_file_processing.pipeline_enum import JournalStage
+from glue_file_processing.src.glue_file_processing.run_journal import RunJournal, CHECK_RESULT_SUFFIX
+from glue_file_processing.src.glue_file_processing.state_store import InMemoryStateStore
+
+journal_key = 'CFM/Everest/Holdings/AutomatedStatus/Journal/run-1'
+
+
+def passed_check():
+    return CheckResult(1.0, [RuleResult(RuleStatus.Pass, 1.0, 'blank', pd.DataFrame(columns=['row_index']))])
+
+
+def test_retry_resumes_after_recorded_stages(context):
+    store = InMemoryStateStore()
+    process_context = context(correlation_id='run-1', file_bucket='raw', file_version_id='1',
+                              file_key='CFM/Everest/Holdings/Automated/Holdings20191121233126.csv',
+                              target_bucket='curated', processed_on='2019-07-30T10:00:54.129Z',
+                              business_process='CFM', pipeline_name='holdings', business_email='',
+                              account_number='', support_email='', error_details_crawler='',
+                              error_summary_crawler='')
+    journal = RunJournal(store, journal_key)
+    assert journal.resumed is False
+
+    process_context.file_key = 'CFM/Everest/Holdings/AutomatedStatus/ToBeProcessed/Holdings20191121233126.csv'
+    process_context.file_version_id = '2'
+    process_context.hash_value = 'abc'
+    journal.record(JournalStage.ToBeProcessed, process_context)
+    journal.record_check_result(process_context, passed_check())
+
+    retried = RunJournal(store, journal_key)
+    process_context.file_key = 'CFM/Everest/Holdings/Automated/Holdings20191121233126.csv'
+    retried.restore(process_context)
+
+    assert retried.resumed is True
+    assert retried.done(JournalStage.QualityChecked) is True
+    assert retried.get(JournalStage.QualityChecked) == {'passed': True}
+    assert retried.done(JournalStage.Moved) is False
+    assert retried.check_result().has_passed() is True
+    assert process_context.file_key.endswith('ToBeProcessed/Holdings20191121233126.csv')
+    assert process_context.file_version_id == '2'
+    assert process_context.hash_value == 'abc'
+
+
+def test_clear_removes_the_journal(context):
+    store = InMemoryStateStore()
+    process_context = context(correlation_id='run-1', file_bucket='raw', file_version_id='1', file_key='a/b/c/d.csv',
+                              target_bucket='curated', processed_on='', business_process='', pipeline_name='',
+                              business_email='', account_number='', support_email='', error_details_crawler='',
+                              error_summary_crawler='')
+    journal = RunJournal(store, journal_key)
+    journal.record_check_result(process_context, passed_check())
+    assert len(store.documents) == 2
+
+    journal.clear()
+
+    assert store.documents == {}
+    assert RunJournal(store, journal_key).resumed is False
+
+
+def test_journal_without_store_keeps_stages_in_memory(context):
+    journal = RunJournal(None, journal_key)
+    journal.record(JournalStage.Moved, context(*[''] * 13), target_key='x')
+
+    assert journal.get(JournalStage.Moved) == {'target_key': 'x'}
+    assert journal.check_result() is None
+
+
+def test_check_result_is_kept_as_json(context):
+    store = InMemoryStateStore()
+    process_context = context(*[''] * 13)
+    failed_rule = RuleResult(RuleStatus.Fail, 0.5, 'blank',
+                             pd.DataFrame({'row_index': [1, 4], 'blank_column': ['a', 'b']}))
+    failed_rule.exception = RuleException('column missing')
+    journal = RunJournal(store, journal_key)
+    journal.record_check_result(process_context, CheckResult(0.75, [
+        failed_rule,
+        RuleResult(RuleStatus.Pass, 1.0, 'duplicates')
+    ]))
+
+    document = json.loads(store.documents[journal_key + CHECK_RESULT_SUFFIX].decode('utf-8'))
+    check_result = RunJournal(store, journal_key).check_result()
+
+    assert document['rules'][0]['error_rows'] == [1, 4]
+    assert check_result.overall_score == 0.75
+    assert [(r.rule_name, r.status, r.score) for r in check_result.rule_results] == [
+        ('blank', RuleStatus.Fail, 0.5), ('duplicates', RuleStatus.Pass, 1.0)]
+    assert check_result.rule_results[0].errors_df['row_index'].tolist() == [1, 4]
+    assert str(check_result.rule_results[0].exception) == 'RuleException: column missing'
+    assert check_result.rule_results[1].errors_df is None
+    assert check_result.has_passed() is False
@@ -1,6 +1,7 @@
 # pylint:disable=redefined-outer-name
 from glue_file_processing.src.glue_file_processing.pipeline_parquet import PipelineParquet
-import pandas as pd
+import pyarrow
+import pyarrow.parquet
 
 from core.aws import AwsRegion
 from file_operations.context import Context
@@ -9,6 +10,7 @@ from pytest import fixture
 
 from glue_file_processing.src.glue_file_processing.boto_session import BotoSession
 from glue_file_processing.src.glue_file_processing.config import Config
+from glue_file_processing.src.glue_file_processing.error_row_set import ErrorRowSet
 
 CONFIG = Config({'delimiter': ',', 'file_name_timestamp': '%Y%m%d%H%M%S',
                  "schema": [
@@ -25,6 +27,21 @@ CONFIG = Config({'delimiter': ',', 'file_name_timestamp': '%Y%m%d%H%M%S',
                  })
 
 
+CHUNKED_CONFIG = Config({'delimiter': ',', 'file_name_timestamp': '%Y%m%d%H%M%S',
+                         'parquet_chunk_size': 1,
+                         "schema": [
+                             {"name": "asofdate", "type": "DATE", "is_calculated": "true"},
+                             {"name": "OrderDate", "type": "TIMESTAMP"},
+                             {"name": "TradeDate", "type": "DATE"},
+                             {"name": "TranType", "type": "STRING"},
+                             {"name": "Quantity", "type": "DECIMAL"},
+                             {"name": "row_index", "type": "INT", "is_calculated": "true"},
+                             {"name": "correlation_id", "type": "STRING", "is_calculated": "true"},
+                             {"name": "confidence_level", "type": "DECIMAL(3,2)", "is_calculated": "true"},
+                         ]
+                         })
+
+
 @fixture
 def context():
     return Context(file_bucket="test", file_key="cfm/bla/bla/", file_version_id="1",
@@ -46,7 +63,7 @@ def test_parquet_writer(s3_helper, context):
     pipeline_parquet.create_parquet(target_bucket=context.target_bucket,
                                     target_key=f"{context.target_key}text_20191101125900.csv",
                                     config=CONFIG,
-                                    error_indexes=pd.DataFrame(columns=['row_index']),
+                                    error_rows=ErrorRowSet(),
                                     correlation_id='1')
     assert s3_helper.s3_key_exists(file_bucket='test',
                                    file_key='cfm/bla/bla/parquet/year=2019/year_month=201911/year_month_day=20191101/'
@@ -66,3 +83,55 @@ def test_parquet_key(context):
                             '/year_month_day=20191101/text_20191101125900.parquet')
 
     assert parquet_key == expected_parquet_key
+
+
+@mock_s3
+def test_parquet_writer_chunked(s3_helper, context):
+    s3_helper.create_bucket(file_bucket=context.target_bucket)
+
+    s3_helper.create_file_key(file_bucket=context.target_bucket,
+                              file_key=f"{context.target_key}text_20191101125900.csv",
+                              file_data=bytes(
+                                  'OrderDate,TradeDate,TranType,Quantity\n'
+                                  '"2019-11-10T17:07:01","2019-11-10","Test","34.3445566"\n'
+                                  '"2019-11-11T17:07:01","2019-11-11","Test2","1.5"',
+                                  encoding='utf8'))
+
+    pipeline_parquet = PipelineParquet(BotoSession().get_session(AwsRegion.EUIreland))
+    parquet_key = pipeline_parquet.create_parquet(target_bucket=context.target_bucket,
+                                                  target_key=f"{context.target_key}text_20191101125900.csv",
+                                                  config=CHUNKED_CONFIG,
+                                                  error_rows=ErrorRowSet([1]),
+                                                  correlation_id='1')
+
+    parquet_file = pyarrow.parquet.ParquetFile(
+        pyarrow.BufferReader(s3_helper.get_binary_content(context.target_bucket, parquet_key)))
+    assert parquet_file.num_row_groups == 2
+    df = parquet_file.read().to_pandas()
+    assert list(df['row_index']) == [0, 1]
+    assert list(df['TranType']) == ['Test', 'Test2']
+    assert [float(value) for value in df['confidence_level']] == [1.0, 0.0]
+
+
+@mock_s3
+def test_parquet_writer_chunked_matches_whole_file(s3_helper, context):
+    s3_helper.create_bucket(file_bucket=context.target_bucket)
+    file_data = bytes('OrderDate,TradeDate,TranType,Quantity\n'
+                      '"2019-11-10T17:07:01","2019-11-10","Test","34.3445566"\n'
+                      '"2019-11-11T17:07:01","2019-11-11",,\n'
+                      '"2019-11-12T17:07:01","2019-11-12","Test3","1.5"', encoding='utf8')
+    pipeline_parquet = PipelineParquet(BotoSession().get_session(AwsRegion.EUIreland))
+
+    tables = []
+    for folder, config in (('whole', CONFIG), ('chunked', CHUNKED_CONFIG)):
+        target_key = f"{context.target_key}{folder}/text_20191101125900.csv"
+        s3_helper.create_file_key(file_bucket=context.target_bucket, file_key=target_key, file_data=file_data)
+        parquet_key = pipeline_parquet.create_parquet(target_bucket=context.target_bucket, target_key=target_key,
+                                                      config=config, error_rows=ErrorRowSet([1]),
+                                                      correlation_id='1')
+        tables.append(pyarrow.parquet.read_table(
+            pyarrow.BufferReader(s3_helper.get_binary_content(context.target_bucket, parquet_key))))
+
+    whole, chunked = tables
+    assert chunked.schema.remove_metadata().equals(whole.schema.remove_metadata())
+    assert chunked.to_pandas().equals(whole.to_pandas())
@@ -0,0 +1,44 @@
+from core.aws import AwsRegion
+from moto import mock_s3
+from pytest import mark
+
+from glue_file_processing.src.glue_file_processing.boto_session import BotoSession
+from glue_file_processing.src.glue_file_processing.pipeline_enum import ParserBackend
+from glue_file_processing.src.glue_file_processing.source_buffer import SourceBuffer
+
+file_data = 'Name,Amount\nTest,20.34\nTest2,1.5\n'
+
+test_source_buffer = [
+    ({"file_key": "a/b/c.txt", "file_bucket": "tests"}, 1024, False),
+    ({"file_key": "a/b/c.txt", "file_bucket": "tests"}, 8, True)
+]
+
+
+@mock_s3
+class TestSourceBuffer:
+    @mark.parametrize("test_input, max_memory_size, spooled", test_source_buffer)
+    def test_load(self, s3_helper, test_input, max_memory_size, spooled):
+        s3_helper.create_bucket(file_bucket=test_input["file_bucket"])
+        s3_helper.create_file_key(file_bucket=test_input["file_bucket"], file_key=test_input["file_key"],
+                                  file_data="this is a tests file")
+        source = SourceBuffer(BotoSession().get_session(AwsRegion.EUIreland), test_input["file_bucket"],
+                              test_input["file_key"], None, max_memory_size).load()
+
+        assert source.hash_value == "d1fa398af76fd27e9a25965e066f9169974b8ada8bcc02559323ac0b8e3bf61f"
+        assert source.size == len("this is a tests file")
+        assert source.is_spooled == spooled
+        source.close()
+
+    @mark.parametrize("test_input, max_memory_size, spooled", test_source_buffer)
+    def test_dataframe_parsed_once(self, s3_helper, test_input, max_memory_size, spooled):
+        s3_helper.create_bucket(file_bucket=test_input["file_bucket"])
+        s3_helper.create_file_key(file_bucket=test_input["file_bucket"], file_key=test_input["file_key"],
+                                  file_data=bytes(file_data, encoding='utf8'))
+        source = SourceBuffer(BotoSession().get_session(AwsRegion.EUIreland), test_input["file_bucket"],
+                              test_input["file_key"], None, max_memory_size).load()
+
+        df = source.get_dataframe(',', ParserBackend.C)
+        assert list(df.columns) == ['Name', 'Amount']
+        assert list(df['Amount']) == ['20.34', '1.5']
+        assert source.get_dataframe(',', ParserBackend.C) is df
+        source.close()
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+
+MODULE = 'glue_file_processing.src.glue_file_processing.processor'
+# imported by the stages that need them, not when the job starts
+DEFERRED_MODULES = ['pyarrow.csv', 'pyarrow.parquet', 'serializer.parquet_util', 'serializer.parquet_writer',
+                    'data_quality.rule_manager', 'tagger.tagger', 'gluecatalog.crawler']
+# a generous ceiling so the default suite fails when start-up grows a lot, the benchmark holds the tight budget
+IMPORT_CEILING_SECONDS = 5.0
+
+
+def import_in_new_interpreter(module: str) -> dict:
+    """Imports the module in a fresh python and reports how long it took and which modules it loaded."""
+    script = ("import json, sys, time\n"
+              "start = time.perf_counter()\n"
+              f"import {module}\n"
+              "seconds = time.perf_counter() - start\n"
+              "print(json.dumps({'seconds': seconds, 'modules': sorted(sys.modules)}))\n")
+    output = subprocess.run([sys.executable, '-c', script], stdout=subprocess.PIPE, check=True,
+                            env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))).stdout
+    return json.loads(output.decode().splitlines()[-1])
+
+
+def test_heavy_modules_are_not_imported_at_start_up():
+    loaded = import_in_new_interpreter(MODULE)['modules']
+
+    assert [module for module in DEFERRED_MODULES if module in loaded] == []
+
+
+def test_processor_imports_within_ceiling():
+    seconds = import_in_new_interpreter(MODULE)['seconds']
+
+    assert seconds < IMPORT_CEILING_SECONDS, f"Importing the processor took {seconds:.3f}s"
+
+
+def test_run_journal_does_not_import_the_rule_engine():
+    loaded = import_in_new_interpreter('glue_file_processing.src.glue_file_processing.process_context')['modules']
+
+    assert 'data_quality.model' not in loaded
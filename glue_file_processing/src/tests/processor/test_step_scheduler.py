@@ -0,0 +1,53 @@
+import threading
+
+from pytest import mark, raises
+
+from glue_file_processing.src.glue_file_processing.step_scheduler import StepScheduler
+
+test_workers = [1, 4]
+
+
+@mark.parametrize("max_workers", test_workers)
+def test_dependencies_receive_results(max_workers):
+    results = StepScheduler(max_workers) \
+        .add('summary', lambda: 1) \
+        .add('detailed', lambda: 2) \
+        .add('result', lambda summary, detailed: summary + detailed, 'summary', 'detailed') \
+        .add('notification', lambda result: result * 10, 'result') \
+        .run()
+
+    assert results == {'summary': 1, 'detailed': 2, 'result': 3, 'notification': 30}
+
+
+def test_independent_steps_run_concurrently():
+    # both steps wait for each other, so this only finishes when they run at the same time
+    barrier = threading.Barrier(2, timeout=5)
+    results = StepScheduler(2) \
+        .add('summary', barrier.wait) \
+        .add('detailed', barrier.wait) \
+        .run()
+
+    assert sorted(results.values()) == [0, 1]
+
+
+@mark.parametrize("max_workers", test_workers)
+def test_first_failed_step_is_raised(max_workers):
+    calls = []
+
+    def fail(message):
+        calls.append(message)
+        raise ValueError(message)
+
+    scheduler = StepScheduler(max_workers) \
+        .add('summary', lambda: fail('summary')) \
+        .add('detailed', lambda: calls.append('detailed')) \
+        .add('result', lambda *_: calls.append('result'), 'summary', 'detailed')
+
+    with raises(ValueError, match='summary'):
+        scheduler.run()
+    assert 'result' not in calls
+
+
+def test_unknown_dependency():
+    with raises(ValueError):
+        StepScheduler(1).add('result', lambda summary: summary, 'summary')
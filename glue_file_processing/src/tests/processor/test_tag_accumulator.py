@@ -0,0 +1,52 @@
+from pytest import mark, raises
+
+from glue_file_processing.src.glue_file_processing.pipeline_enum import TagFlushPolicy
+from glue_file_processing.src.glue_file_processing.tag_accumulator import TagAccumulator
+
+raw_file = {"file_bucket": "tests", "file_key": "a/b/c.txt", "file_version_id": "1"}
+copied_file = {"file_bucket": "tests", "file_key": "a/b/d.txt", "file_version_id": "2"}
+
+test_flush_policy = [
+    (TagFlushPolicy.Stage, [({'hash': 'abc'}, raw_file), ({'correlation_id': '1', 'status': 'processed'}, copied_file)]),
+    (TagFlushPolicy.Immediate, [({'hash': 'abc'}, raw_file), ({'correlation_id': '1'}, copied_file),
+                                ({'status': 'processed'}, copied_file)])
+]
+
+
+class RecordingTagger:
+    def __init__(self):
+        self.calls = []
+
+    def tag_file(self, tags: dict, **file_args):
+        self.calls.append((tags, file_args))
+
+
+@mark.parametrize("policy, expected_calls", test_flush_policy)
+def test_flush_policy(policy, expected_calls):
+    tagger = RecordingTagger()
+    accumulator = TagAccumulator(tagger.tag_file, policy)
+
+    accumulator.add({'hash': 'abc'}, **raw_file)
+    accumulator.flush()
+    accumulator.add({'correlation_id': '1'}, **copied_file)
+    accumulator.add({'status': 'processed'}, **copied_file)
+    accumulator.flush()
+
+    assert tagger.calls == expected_calls
+    assert accumulator.requested_count == 3
+    assert accumulator.saved_count == 3 - len(expected_calls)
+    assert not accumulator.has_pending
+
+
+def test_failed_flush_is_not_retried():
+    def tag_file(tags, **file_args):
+        raise ValueError("tagging failed")
+
+    accumulator = TagAccumulator(tag_file, TagFlushPolicy.Stage)
+    accumulator.add({'hash': 'abc'}, **raw_file)
+    with raises(ValueError):
+        accumulator.flush()
+
+    assert not accumulator.has_pending
+    accumulator.flush()
+    assert accumulator.call_count == 1
@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock
+
+from pytest import mark
+
+from glue_file_processing.src.glue_file_processing.work_queue import InMemoryWorkQueue
+from glue_file_processing.src.glue_file_processing.worker import Worker
+
+job_variables = {"target_bucket": "curated_bucket", "business_process": "BusinessArea", "pipeline_name": "tests",
+                 "business_email": "tests@tests.com", "support_email": "tests@tests.com",
+                 "account_number": "123456789012", "error_details_crawler": "dev3-cfm-error-detailed-reporting",
+                 "error_summary_crawler": "dev3-cfm-error-summary-reporting"}
+
+
+def work_item(index: int):
+    return {"correlation_id": str(index), "file_bucket": "raw_bucket",
+            "file_key": f"BusinessArea/BusinessProcess/DataSource/Automated/test{index}_20191003103000.txt",
+            "file_version_id": "", "processed_on": "2019-07-30T10:00:54.129Z"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+test_worker = [
+    # failures per message, expected processed, retried, abandoned
+    ([0, 0, 0], 3, 0, 0),
+    ([0, 1, 0], 3, 1, 0),
+    ([0, 3, 0], 2, 2, 1)
+]
+
+
+@mark.parametrize("failures, processed, retried, abandoned", test_worker)
+def test_worker_drains_queue(failures, processed, retried, abandoned):
+    clock = FakeClock()
+    queue = InMemoryWorkQueue(clock=clock)
+    for index in range(len(failures)):
+        queue.send(work_item(index))
+    remaining_failures = {str(index): count for index, count in enumerate(failures)}
+
+    def run(context):
+        if remaining_failures[context.correlation_id]:
+            remaining_failures[context.correlation_id] -= 1
+            raise ValueError("broken file")
+
+    processor = MagicMock()
+    processor.run.side_effect = run
+    worker = Worker(processor, queue, job_variables, max_receive_count=3, retry_delay=10, idle_timeout=60,
+                    clock=clock, sleep=clock.sleep)
+    stats = worker.run()
+
+    assert (stats.processed, stats.retried, stats.abandoned) == (processed, retried, abandoned)
+    assert len(queue) == 0
+    assert processor.run.call_count == processed + retried + abandoned
+
+
+def test_worker_stops_when_requested():
+    queue = InMemoryWorkQueue()
+    queue.send(work_item(0))
+    queue.send(work_item(1))
+    processor = MagicMock()
+    worker = Worker(processor, queue, job_variables)
+    processor.run.side_effect = lambda context: worker.stop()
+
+    stats = worker.run()
+
+    assert stats.processed == 1
+    assert len(queue) == 1
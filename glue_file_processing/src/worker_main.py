@@ -0,0 +1,43 @@
+import signal
+import sys
+from collections import namedtuple
+
+from awsglue.utils import getResolvedOptions
+from core.aws import AwsRegion
+from glue_file_processing.boto_session import BotoSession
+from glue_file_processing.processor import Processor
+from glue_file_processing.work_queue import SqsWorkQueue
+from glue_file_processing.worker import Worker, IDLE_TIMEOUT
+
+QUEUE_URL_ARG = "queue_url"
+IDLE_TIMEOUT_ARG = "idle_timeout"
+
+
+def get_arguments():
+    expected_args = ["target_bucket", "business_process", "pipeline_name", "business_email", "support_email",
+                     "account_number", "error_details_crawler", "error_summary_crawler", QUEUE_URL_ARG]
+    args = getResolvedOptions(sys.argv, expected_args)
+
+    ContextVariables = namedtuple("ContextVariables", expected_args)
+    return ContextVariables(**args)
+
+
+def get_idle_timeout() -> int:
+    if f"--{IDLE_TIMEOUT_ARG}" in sys.argv:
+        return int(getResolvedOptions(sys.argv, [IDLE_TIMEOUT_ARG])[IDLE_TIMEOUT_ARG])
+    return IDLE_TIMEOUT
+
+
+def main():
+    context_variables = get_arguments()._asdict()
+    queue_url = context_variables.pop(QUEUE_URL_ARG)
+
+    processor = Processor()
+    queue = SqsWorkQueue(BotoSession().get_shared_session(AwsRegion.EUIreland), queue_url)
+    worker = Worker(processor, queue, context_variables, idle_timeout=get_idle_timeout())
+    signal.signal(signal.SIGTERM, worker.stop)
+    worker.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import random
+import time
+from typing import Callable, Optional
+
+from .spill_queue import SpillQueue
+
+ACTIVE_STATES = ['STARTING', 'RUNNING', 'STOPPING']
+MAX_JOB_RUNS = 200
+PIPELINE_ARGUMENT = '--pipeline_name'
+
+
+class AdmissionController:
+    """Starts Glue runs within a budget of concurrent runs per pipeline, parking the overflow in a spill queue.
+
+    A start rejected with ``ConcurrentRunsExceededException`` is retried with exponential backoff and full
+    jitter, so the runs of a burst of files do not all retry at once. The backoff never sleeps into the last
+    ``reserve`` seconds of the invocation, as told by ``remaining_time_in_millis``. Runs that still find no room,
+    or that arrive while the pipeline is at its budget, are spilled and started by ``drain`` in a later
+    invocation. Without a spill queue the last rejection is raised.
+    """
+
+    def __init__(self, glue_client, job_name: str, pipeline_name: str, max_concurrent_runs: Optional[int] = None,
+                 spill_queue: Optional[SpillQueue] = None, max_attempts: int = 5, base_delay: float = 1.0,
+                 max_delay: float = 20.0, sleep: Callable[[float], None] = time.sleep,
+                 remaining_time_in_millis: Optional[Callable[[], int]] = None, reserve: float = 10.0):
+        self._glue = glue_client
+        self._job_name = job_name
+        self._pipeline_name = pipeline_name
+        self._max_concurrent_runs = max_concurrent_runs
+        self._spill_queue = spill_queue
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._sleep = sleep
+        self._remaining_time_in_millis = remaining_time_in_millis
+        self._reserve = reserve
+        self._active_runs = None
+        self._full = False
+
+    def submit(self, run: dict) -> Optional[str]:
+        """Starts the run and returns its id, or parks it and returns ``None``."""
+        if self._spill_queue is not None and not self._has_room():
+            self._spill_queue.put(run)
+            return None
+        return self._start(run)
+
+    def drain(self) -> int:
+        """Starts the parked runs while the pipeline has room, returns how many were started."""
+        started = 0
+        while self._spill_queue is not None and self._has_room():
+            parked_run = self._spill_queue.receive()
+            # a run that is not started stays in the queue, it is only deleted once Glue has accepted it
+            if parked_run is None or self._start(parked_run.run, spill=False) is None:
+                break
+            self._spill_queue.delete(parked_run)
+            started += 1
+        return started
+
+    def backoff_delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self._max_delay, self._base_delay * 2 ** attempt))
+
+    def _has_room(self) -> bool:
+        if self._full:
+            return False
+        if self._max_concurrent_runs is None:
+            return True
+        if self._active_runs is None:
+            self._active_runs = self._count_active_runs()
+        return self._active_runs < self._max_concurrent_runs
+
+    def _count_active_runs(self) -> int:
+        # every page is read, a long running job can be behind any number of newer runs
+        pages = self._glue.get_paginator('get_job_runs').paginate(
+            JobName=self._job_name, PaginationConfig={'PageSize': MAX_JOB_RUNS})
+        return sum(1 for page in pages for job_run in page['JobRuns'] if job_run['JobRunState'] in ACTIVE_STATES
+                   and job_run.get('Arguments', {}).get(PIPELINE_ARGUMENT) == self._pipeline_name)
+
+    def _has_time_for(self, delay: float) -> bool:
+        if self._remaining_time_in_millis is None:
+            return True
+        return self._remaining_time_in_millis() / 1000 - delay > self._reserve
+
+    def _start(self, run: dict, spill: bool = True) -> Optional[str]:
+        for attempt in range(self._max_attempts):
+            try:
+                job_run_id = self._glue.start_job_run(**run)['JobRunId']
+            except self._glue.exceptions.ConcurrentRunsExceededException:
+                delay = self.backoff_delay(attempt)
+                if attempt == self._max_attempts - 1 or not self._has_time_for(delay):
+                    if self._spill_queue is None:
+                        raise
+                    if spill:
+                        self._spill_queue.put(run)
+                    # the job is full whatever the count says, the next runs are parked straight away
+                    self._full = True
+                    return None
+                self._sleep(delay)
+            else:
+                if self._active_runs is not None:
+                    self._active_runs += 1
+                return job_run_id
+        return None
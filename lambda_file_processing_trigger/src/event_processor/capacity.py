@@ -0,0 +1,47 @@
+import json
+from typing import List, NamedTuple, Optional
+
+
+class CapacityBand(NamedTuple):
+    """The Glue capacity for a run whose files add up to at most ``max_size`` bytes, ``None`` has no limit.
+
+    Either ``max_capacity`` or a ``worker_type`` with its ``number_of_workers`` is set, Glue rejects both together.
+    The ``timeout`` is in minutes. Anything left unset keeps the default of the job.
+    """
+    max_size: Optional[int] = None
+    max_capacity: Optional[float] = None
+    worker_type: Optional[str] = None
+    number_of_workers: Optional[int] = None
+    timeout: Optional[int] = None
+
+    def run_arguments(self) -> dict:
+        """The capacity arguments of ``start_job_run``."""
+        arguments = {"MaxCapacity": self.max_capacity, "WorkerType": self.worker_type,
+                     "NumberOfWorkers": self.number_of_workers, "Timeout": self.timeout}
+        return {name: value for name, value in arguments.items() if value is not None}
+
+
+class CapacityBands:
+    """A table of capacity bands ordered by size, configured as a JSON list of bands.
+
+    For example ``[{"max_size": 1048576, "max_capacity": 2}, {"max_size": null, "worker_type": "G.2X",
+    "number_of_workers": 10, "timeout": 120}]``. Files larger than every band, or of unknown size, run with the
+    defaults of the job.
+    """
+
+    def __init__(self, bands: List[CapacityBand]):
+        self._bands = sorted(bands, key=lambda band: float('inf') if band.max_size is None else band.max_size)
+
+    @classmethod
+    def from_json(cls, bands_json: Optional[str]) -> 'CapacityBands':
+        if not bands_json:
+            return cls([])
+        try:
+            return cls([CapacityBand(**band) for band in json.loads(bands_json)])
+        except (TypeError, ValueError) as ex:
+            raise ValueError(f"Invalid capacity bands '{bands_json}': {ex}") from ex
+
+    def select(self, size: Optional[int]) -> Optional[CapacityBand]:
+        if size is None:
+            return None
+        return next((band for band in self._bands if band.max_size is None or size <= band.max_size), None)
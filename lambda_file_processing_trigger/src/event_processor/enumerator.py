@@ -21,6 +21,10 @@ class EnvironmentVariables(Enum):
     AwsAccountNo = 'AWS_ACCOUNT_NO'
     ErrorDetailsCrawler = 'ERROR_DETAILS_CRAWLER_NAME'
     ErrorSummaryCrawler = 'ERROR_SUMMARY_CRAWLER_NAME'
+    FastLaneMaxSize = 'FAST_LANE_MAX_SIZE'
+    CapacityBands = 'CAPACITY_BANDS'
+    MaxConcurrentRuns = 'MAX_CONCURRENT_RUNS'
+    SpillQueueUrl = 'SPILL_QUEUE_URL'
 
 
 class Event(Enum):
@@ -30,4 +34,5 @@ class Event(Enum):
     Object = 'object'
     Key = 'key'
     VersionId = 'versionId'
+    Size = 'size'
     EventTime = 'eventTime'
@@ -1,74 +1,131 @@
+import copy
 import os
+from typing import List, Optional
 
 from core.aws import AwsService
 
 from .enumerator import EnvironmentVariables, Event
 
 
-class ExecutionContext:
-    def __init__(self, lambda_context, event: dict):
-        self._init_os_variables()
-        self._init_lambda_variables(lambda_context)
-        self._init_event_variables(event)
+class RecordContext:
+    def __init__(self, record: dict, index: int = 0):
+        self._record = record
+        self._index = index
 
-    def _init_lambda_variables(self, lambda_context):
-        self._aws_request_id = lambda_context.aws_request_id
+    @property
+    def index(self):
+        """The position of the record in the event, it keeps the correlation ids apart."""
+        return self._index
+
+    @property
+    def source_bucket_name(self):
+        return self._record[AwsService.S3.value][Event.Bucket.value][Event.Name.value]
+
+    @property
+    def source_object_key(self):
+        return self._record[AwsService.S3.value][Event.Object.value][Event.Key.value]
+
+    @property
+    def source_object_version(self):
+        return self._record[AwsService.S3.value][Event.Object.value][Event.VersionId.value]
+
+    @property
+    def source_object_size(self):
+        return self._record[AwsService.S3.value][Event.Object.value].get(Event.Size.value)
+
+    @property
+    def event_timestamp(self):
+        return self._record[Event.EventTime.value]
+
+
+class EnvironmentConfig:
+    """The settings of the trigger from its environment variables, read once per container."""
 
-    def _init_os_variables(self):
-        self._business_process = os.getenv(
+    def __init__(self):
+        self.business_process = os.getenv(
             EnvironmentVariables.BusinessProcess.value)
-        self._pipeline_name = os.getenv(
+        self.pipeline_name = os.getenv(
             EnvironmentVariables.PipelineName.value)
-        self._business_email_to = os.getenv(
+        self.business_email_to = os.getenv(
             EnvironmentVariables.BusinessEmail.value)
-        self._support_email_to = os.getenv(
+        self.support_email_to = os.getenv(
             EnvironmentVariables.SupportEmail.value)
-        self._target_bucket_name = os.getenv(
+        self.target_bucket_name = os.getenv(
             EnvironmentVariables.TargetBucket.value)
-        self._error_topic = os.getenv(EnvironmentVariables.ErrorTopic.value)
-        self._job_name = os.getenv(EnvironmentVariables.JobName.value)
-        self._log_level = os.getenv(EnvironmentVariables.LogLevel.value)
-        self._aws_account_number = os.getenv(
+        self.error_topic = os.getenv(EnvironmentVariables.ErrorTopic.value)
+        self.job_name = os.getenv(EnvironmentVariables.JobName.value)
+        self.log_level = os.getenv(EnvironmentVariables.LogLevel.value)
+        self.aws_account_number = os.getenv(
             EnvironmentVariables.AwsAccountNo.value)
-        self._error_details_crawler = os.getenv(
+        self.error_details_crawler = os.getenv(
             EnvironmentVariables.ErrorDetailsCrawler.value)
-        self._error_summary_crawler = os.getenv(
+        self.error_summary_crawler = os.getenv(
             EnvironmentVariables.ErrorSummaryCrawler.value)
+        fast_lane_max_size = os.getenv(EnvironmentVariables.FastLaneMaxSize.value)
+        self.fast_lane_max_size = int(fast_lane_max_size) if fast_lane_max_size else None
+        self.capacity_bands = os.getenv(EnvironmentVariables.CapacityBands.value)
+        max_concurrent_runs = os.getenv(EnvironmentVariables.MaxConcurrentRuns.value)
+        self.max_concurrent_runs = int(max_concurrent_runs) if max_concurrent_runs else None
+        self.spill_queue_url = os.getenv(EnvironmentVariables.SpillQueueUrl.value)
+
+
+class ExecutionContext:
+    def __init__(self, lambda_context, event: dict, environment: EnvironmentConfig = None):
+        self._environment = environment or EnvironmentConfig()
+        self._init_lambda_variables(lambda_context)
+        self._init_event_variables(event)
+
+    def _init_lambda_variables(self, lambda_context):
+        self._lambda_context = lambda_context
+        self._aws_request_id = lambda_context.aws_request_id
+
+    def remaining_time_in_millis(self) -> int:
+        return self._lambda_context.get_remaining_time_in_millis()
 
     def _init_event_variables(self, event: dict):
-        self._event = event[Event.Records.value][0]
+        # a scheduled event has no records, it only starts the runs waiting in the spill queue
+        self._records = [RecordContext(record, index)
+                         for index, record in enumerate(event.get(Event.Records.value, []))]
+        self._event = self._records[0] if self._records else None
+
+    def with_records(self, records: List[RecordContext]) -> 'ExecutionContext':
+        """A copy of the context for some of the files of the event."""
+        execution_context = copy.copy(self)
+        execution_context._records = records
+        execution_context._event = records[0]
+        return execution_context
 
     @property
     def business_process(self):
-        return self._business_process
+        return self._environment.business_process
 
     @property
     def pipeline_name(self):
-        return self._pipeline_name
+        return self._environment.pipeline_name
 
     @property
     def business_email_to(self):
-        return self._business_email_to
+        return self._environment.business_email_to
 
     @property
     def support_email_to(self):
-        return self._support_email_to
+        return self._environment.support_email_to
 
     @property
     def target_bucket_name(self):
-        return self._target_bucket_name
+        return self._environment.target_bucket_name
 
     @property
     def error_topic(self):
-        return self._error_topic
+        return self._environment.error_topic
 
     @property
     def job_name(self):
-        return self._job_name
+        return self._environment.job_name
 
     @property
     def log_level(self):
-        return self._log_level
+        return self._environment.log_level
 
     @property
     def aws_request_id(self):
@@ -76,28 +133,54 @@ class ExecutionContext:
 
     @property
     def aws_account_number(self):
-        return self._aws_account_number
+        return self._environment.aws_account_number
+
+    @property
+    def records(self) -> List[RecordContext]:
+        return self._records
 
     @property
     def source_bucket_name(self):
-        return self._event[AwsService.S3.value][Event.Bucket.value][Event.Name.value]
+        return self._event.source_bucket_name
 
     @property
     def source_object_key(self):
-        return self._event[AwsService.S3.value][Event.Object.value][Event.Key.value]
+        return self._event.source_object_key
 
     @property
     def source_object_version(self):
-        return self._event[AwsService.S3.value][Event.Object.value][Event.VersionId.value]
+        return self._event.source_object_version
 
     @property
     def event_timestamp(self):
-        return self._event[Event.EventTime.value]
+        return self._event.event_timestamp
 
     @property
     def error_details_crawler(self):
-        return self._error_details_crawler
+        return self._environment.error_details_crawler
 
     @property
     def error_summary_crawler(self):
-        return self._error_summary_crawler
+        return self._environment.error_summary_crawler
+
+    @property
+    def fast_lane_max_size(self) -> Optional[int]:
+        return self._environment.fast_lane_max_size
+
+    @property
+    def capacity_bands(self) -> Optional[str]:
+        return self._environment.capacity_bands
+
+    @property
+    def max_concurrent_runs(self) -> Optional[int]:
+        return self._environment.max_concurrent_runs
+
+    @property
+    def spill_queue_url(self) -> Optional[str]:
+        return self._environment.spill_queue_url
+
+    @property
+    def total_size(self) -> Optional[int]:
+        """The size of all the files of the context, unknown when the event misses the size of one."""
+        sizes = [record.source_object_size for record in self._records]
+        return None if None in sizes else sum(sizes)
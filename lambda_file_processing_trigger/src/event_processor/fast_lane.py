@@ -0,0 +1,78 @@
+from importlib.util import find_spec
+from typing import List, NamedTuple, Optional, Tuple
+
+from .execution_context import ExecutionContext, RecordContext
+from .job import Job
+
+PROCESSOR_MODULE = "glue_file_processing.processor"
+# a file is only started with this much of the invocation left, the rest of the files go to Glue
+TIME_RESERVE_SECONDS = 60
+
+
+class FastLaneResult(NamedTuple):
+    failed_files: List[str]
+    deferred_records: List[RecordContext]
+
+
+class FastLane:
+    """Processes the small files of an event inside the Lambda, with the same processor as the Glue job.
+
+    A small file waits minutes for the Glue job to be queued and started and is then processed in seconds, so
+    files up to ``max_size`` bytes skip the job. The processor comes from the glue file processing package, when
+    it is not part of the Lambda bundle every file goes to Glue.
+    """
+
+    def __init__(self, max_size: Optional[int], time_reserve: float = TIME_RESERVE_SECONDS):
+        self._max_size = max_size
+        self._time_reserve = time_reserve
+        self._processor = None
+
+    @staticmethod
+    def is_available() -> bool:
+        return find_spec(PROCESSOR_MODULE) is not None
+
+    def accepts(self, record: RecordContext) -> bool:
+        size = record.source_object_size
+        return size is not None and size <= self._max_size
+
+    def split(self, records: List[RecordContext]) -> Tuple[List[RecordContext], List[RecordContext]]:
+        """The records to process here and the records to send to Glue."""
+        if not self._max_size or not self.is_available():
+            return [], records
+        return ([record for record in records if self.accepts(record)],
+                [record for record in records if not self.accepts(record)])
+
+    def run(self, execution_context: ExecutionContext, records: List[RecordContext]) -> FastLaneResult:
+        """Processes the records, returns the files that failed and the records left for Glue.
+
+        A failed file whose error notification the processor sent is returned, any other failure is raised so the
+        event is retried. Records are only started while the invocation has ``time_reserve`` seconds left, the
+        ones that are not are returned as deferred.
+        """
+        # the processor brings pandas and pyarrow, only pay for them when a file takes the fast lane
+        from glue_file_processing.process_context import ProcessContext  # pylint: disable=import-outside-toplevel
+        from glue_file_processing.processor import (  # pylint: disable=import-outside-toplevel
+            BatchProcessingError, Processor)
+
+        job_variables = Job.job_variables(execution_context)
+        contexts = [ProcessContext(file_size=record.source_object_size,
+                                   **dict(job_variables, **Job.work_item(execution_context, record)))
+                    for record in records]
+        if self._processor is None:
+            # built once per container, warm invocations reuse its configuration, session and clients
+            self._processor = Processor()
+            # a Lambda has no shared memory for a process pool
+            self._processor.config.max_workers = 1
+
+        def has_time() -> bool:
+            return execution_context.remaining_time_in_millis() / 1000 > self._time_reserve
+
+        try:
+            skipped = self._processor.run_batch(contexts, has_time)
+            failed_files = []
+        except BatchProcessingError as ex:
+            if ex.unnotified_files:
+                raise
+            skipped, failed_files = ex.skipped, ex.failed_files
+        # the processor skips the tail of the batch
+        return FastLaneResult(failed_files, records[len(records) - len(skipped):] if skipped else [])
@@ -1,37 +1,79 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import json
+from functools import lru_cache
+from typing import Callable, Optional
+
 from boto3 import client
 from core.aws import AwsService
 
-from .execution_context import ExecutionContext
+from .admission import AdmissionController
+from .capacity import CapacityBand
+from .execution_context import ExecutionContext, RecordContext
+from .spill_queue import SpillQueue
+
+
+@lru_cache(maxsize=None)
+def glue_client():
+    """The Glue client of the container, warm invocations reuse it and its connections."""
+    return client(AwsService.Glue.value)
 
 
 class Job:
-    def __init__(self, job_name: str):
-        self._job = client(AwsService.Glue.value)
+    def __init__(self, job_name: str, pipeline_name: str = None, max_concurrent_runs: Optional[int] = None,
+                 spill_queue: Optional[SpillQueue] = None, glue=None,
+                 remaining_time_in_millis: Optional[Callable[[], int]] = None):
+        self._job = glue or glue_client()
         self._job_name = job_name
+        self._admission = AdmissionController(self._job, job_name, pipeline_name, max_concurrent_runs, spill_queue,
+                                              remaining_time_in_millis=remaining_time_in_millis)
 
     @staticmethod
     def _prep_arguments(execution_context: ExecutionContext):
-        glue_variables = dict()
-        glue_variables["--correlation_id"] = execution_context.aws_request_id
-        glue_variables["--file_bucket"] = execution_context.source_bucket_name
-        glue_variables["--file_key"] = execution_context.source_object_key
-        glue_variables["--file_version_id"] = execution_context.source_object_version
-        glue_variables["--target_bucket"] = execution_context.target_bucket_name
-        glue_variables["--processed_on"] = execution_context.event_timestamp
-        glue_variables["--business_process"] = execution_context.business_process
-        glue_variables["--pipeline_name"] = execution_context.pipeline_name
-        glue_variables["--business_email"] = execution_context.business_email_to
-        glue_variables["--support_email"] = execution_context.support_email_to
-        glue_variables["--account_number"] = execution_context.aws_account_number
-        glue_variables["--error_details_crawler"] = execution_context.error_details_crawler
-        glue_variables["--error_summary_crawler"] = execution_context.error_summary_crawler
+        work_item = Job.work_item(execution_context, execution_context.records[0])
+        glue_variables = {f"--{name}": value for name, value in work_item.items()}
+        glue_variables.update({f"--{name}": value for name, value in Job.job_variables(execution_context).items()})
+
+        if len(execution_context.records) > 1:
+            manifest = [Job.work_item(execution_context, record) for record in execution_context.records]
+            glue_variables["--manifest"] = json.dumps(manifest)
 
         return glue_variables
 
-    def run_job(self, execution_context: ExecutionContext):
+    @staticmethod
+    def job_variables(execution_context: ExecutionContext) -> dict:
+        """The variables shared by every file of the event, as the processor of the Glue job expects them."""
+        return {
+            "target_bucket": execution_context.target_bucket_name,
+            "business_process": execution_context.business_process,
+            "pipeline_name": execution_context.pipeline_name,
+            "business_email": execution_context.business_email_to,
+            "support_email": execution_context.support_email_to,
+            "account_number": execution_context.aws_account_number,
+            "error_details_crawler": execution_context.error_details_crawler,
+            "error_summary_crawler": execution_context.error_summary_crawler
+        }
+
+    @staticmethod
+    def correlation_id(execution_context: ExecutionContext, index: int):
+        # the first file keeps the request id so single file events are traced exactly as before
+        return execution_context.aws_request_id if index == 0 else f"{execution_context.aws_request_id}-{index}"
+
+    @staticmethod
+    def work_item(execution_context: ExecutionContext, record: RecordContext):
+        return {
+            "correlation_id": Job.correlation_id(execution_context, record.index),
+            "file_bucket": record.source_bucket_name,
+            "file_key": record.source_object_key,
+            "file_version_id": record.source_object_version,
+            "processed_on": record.event_timestamp
+        }
+
+    def run_job(self, execution_context: ExecutionContext, capacity: Optional[CapacityBand] = None) -> Optional[str]:
+        """Starts the run and returns its id, ``None`` when it was parked in the spill queue."""
         glue_variables = self._prep_arguments(execution_context)
-        res = self._job.start_job_run(
-            JobName=self._job_name, Arguments=glue_variables)
-        return res
+        capacity_arguments = capacity.run_arguments() if capacity else {}
+        return self._admission.submit(dict(JobName=self._job_name, Arguments=glue_variables, **capacity_arguments))
+
+    def start_spilled_runs(self) -> int:
+        return self._admission.drain()
@@ -0,0 +1,70 @@
+import json
+from collections import deque
+from typing import NamedTuple, Optional
+
+from boto3 import client
+
+SQS_SERVICE = 'sqs'
+
+
+class ParkedRun(NamedTuple):
+    """A run received from a spill queue, with the receipt that removes it from the queue once it is started."""
+    run: dict
+    receipt: str
+
+
+class SpillQueue:
+    """Glue runs parked until the job has room for them, as the keyword arguments of ``start_job_run``.
+
+    A received run stays in the queue until it is deleted, so a run whose start fails or is cut short is
+    received again.
+    """
+
+    def put(self, run: dict):
+        raise NotImplementedError
+
+    def receive(self) -> Optional[ParkedRun]:
+        raise NotImplementedError
+
+    def delete(self, parked_run: ParkedRun):
+        raise NotImplementedError
+
+
+class InMemorySpillQueue(SpillQueue):
+    """A spill queue held in memory, used in tests. A received run stays first in the queue until deleted."""
+
+    def __init__(self):
+        self.runs = deque()
+
+    def put(self, run: dict):
+        self.runs.append(run)
+
+    def receive(self) -> Optional[ParkedRun]:
+        return ParkedRun(self.runs[0], str(id(self.runs[0]))) if self.runs else None
+
+    def delete(self, parked_run: ParkedRun):
+        self.runs.remove(parked_run.run)
+
+
+class SqsSpillQueue(SpillQueue):
+    """A spill queue on SQS, so the runs parked by one invocation of the trigger are started by a later one.
+
+    A received message that is not deleted comes back once its visibility timeout ends.
+    """
+
+    def __init__(self, queue_url: str):
+        self._client = client(SQS_SERVICE)
+        self._queue_url = queue_url
+
+    def put(self, run: dict):
+        self._client.send_message(QueueUrl=self._queue_url, MessageBody=json.dumps(run))
+
+    def receive(self) -> Optional[ParkedRun]:
+        messages = self._client.receive_message(QueueUrl=self._queue_url, MaxNumberOfMessages=1,
+                                                WaitTimeSeconds=0).get('Messages', [])
+        if not messages:
+            return None
+        return ParkedRun(json.loads(messages[0]['Body']), messages[0]['ReceiptHandle'])
+
+    def delete(self, parked_run: ParkedRun):
+        self._client.delete_message(QueueUrl=self._queue_url, ReceiptHandle=parked_run.receipt)
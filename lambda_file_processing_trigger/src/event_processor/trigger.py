@@ -0,0 +1,77 @@
+from .capacity import CapacityBands
+from .execution_context import EnvironmentConfig, ExecutionContext
+from .fast_lane import FastLane
+from .job import Job
+from .logger import Logger
+from .spill_queue import SqsSpillQueue
+
+MESSAGE_FORMAT = ["message", "asctime", "funcName", "module", "lineno"]
+
+
+class Trigger:
+    """Starts the processing of the files of an S3 event.
+
+    Everything that does not depend on the event, the settings, logger, clients and the fast lane processor, is
+    built once per container so warm invocations only parse their event.
+    """
+
+    def __init__(self, environment: EnvironmentConfig = None, glue=None):
+        self._environment = environment or EnvironmentConfig()
+        self._glue = glue
+        logger = Logger(message_format=MESSAGE_FORMAT, log_level="DEBUG")
+        self.log = logger.create_logger()
+        logger.update_level(logger=self.log, new_level=self._environment.log_level)
+        self._capacity_bands = CapacityBands.from_json(self._environment.capacity_bands)
+        self._spill_queue = (SqsSpillQueue(self._environment.spill_queue_url)
+                             if self._environment.spill_queue_url else None)
+        self._fast_lane = FastLane(max_size=self._environment.fast_lane_max_size)
+
+    def handle(self, event: dict, lambda_context):
+        log = self.log
+        log.info("Starting Job Call")
+        try:
+            execution_context = ExecutionContext(
+                lambda_context=lambda_context, event=event, environment=self._environment)
+
+            # the admission budget is counted per invocation, so every event gets its own job
+            job = Job(job_name=execution_context.job_name, pipeline_name=execution_context.pipeline_name,
+                      max_concurrent_runs=execution_context.max_concurrent_runs, spill_queue=self._spill_queue,
+                      glue=self._glue, remaining_time_in_millis=execution_context.remaining_time_in_millis)
+            started_runs = job.start_spilled_runs()
+            if started_runs:
+                log.info(f"Started {started_runs} run(s) of {execution_context.job_name} waiting in the spill queue")
+
+            small_records, large_records = self._fast_lane.split(execution_context.records)
+
+            # the fast lane runs first, an error that makes the Lambda retry the event then comes before Glue is
+            # started and the retry does not start a second run for the same files
+            if small_records:
+                log.info(f"Processing {len(small_records)} file(s) of at most {execution_context.fast_lane_max_size} "
+                         f"bytes in the fast lane")
+                result = self._fast_lane.run(execution_context, small_records)
+                if result.failed_files:
+                    log.warning(f"{len(result.failed_files)} of {len(small_records)} file(s) failed in the fast lane "
+                                f"and were reported: {', '.join(result.failed_files)}")
+                if result.deferred_records:
+                    log.info(f"{len(result.deferred_records)} file(s) are left for {execution_context.job_name}, "
+                             f"the invocation is running out of time")
+                    large_records = large_records + result.deferred_records
+                processed = len(small_records) - len(result.failed_files) - len(result.deferred_records)
+                log.info(f"Successfully processed {processed} file(s) in the fast lane")
+
+            if large_records:
+                log.debug(
+                    f"Initiating job {execution_context.job_name} for {len(large_records)} file(s) "
+                    f"with parameters {execution_context}")
+                glue_context = execution_context.with_records(large_records)
+                capacity = self._capacity_bands.select(glue_context.total_size)
+                log.info(f"Selected capacity {capacity.run_arguments() if capacity else 'default'} for "
+                         f"{len(large_records)} file(s) of {glue_context.total_size} bytes")
+                log.debug(f"Calling job {execution_context.job_name}")
+                if job.run_job(execution_context=glue_context, capacity=capacity):
+                    log.info(f"Successfully called {execution_context.job_name}")
+                else:
+                    log.info(f"{execution_context.job_name} is running at its limit, the run waits in the spill queue")
+        except Exception as ex:
+            log.error(f"Error encountered during the job call {ex}")
+            raise
@@ -16,5 +16,7 @@ setup(
     description="Package to create aws lambda_file_processing_trigger",
     packages=find_packages(exclude=["sample", "tests", "docs"]),
     python_requires=">=3.6",
-    install_requires=['python-json-logger==0.1.11', 'icg-dp-core==6.0.40', 'icg-dp-loggings==6.0.40']
+    install_requires=['python-json-logger==0.1.11', 'icg-dp-core==6.0.40', 'icg-dp-loggings==6.0.40'],
+    # bundling the glue job package lets the trigger process files up to FAST_LANE_MAX_SIZE bytes itself
+    extras_require={'fast_lane': ['icg-dp-glue-file-processing==1.0.0']}
 )
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+
+class ConcurrentRunsExceededException(Exception):
+    pass
+
+
+class FakeGlueClient:
+    """A Glue client for one job that allows at most ``max_concurrent_runs`` runs at once, as Glue does."""
+
+    def __init__(self, max_concurrent_runs: int):
+        self.exceptions = SimpleNamespace(ConcurrentRunsExceededException=ConcurrentRunsExceededException)
+        self.max_concurrent_runs = max_concurrent_runs
+        self.job_runs = []
+        self.rejected = 0
+
+    def active_runs(self):
+        return [job_run for job_run in self.job_runs if job_run['JobRunState'] == 'RUNNING']
+
+    def start_job_run(self, JobName, Arguments, **capacity):  # pylint: disable=invalid-name
+        if len(self.active_runs()) >= self.max_concurrent_runs:
+            self.rejected += 1
+            raise ConcurrentRunsExceededException(f"Concurrent runs exceeded for {JobName}")
+        job_run_id = f"jr_{len(self.job_runs)}"
+        self.job_runs.append(dict(capacity, Id=job_run_id, JobName=JobName, Arguments=Arguments,
+                                  JobRunState='RUNNING'))
+        return {'JobRunId': job_run_id}
+
+    def get_job_runs(self, JobName, MaxResults, NextToken=None):  # pylint: disable=invalid-name
+        job_runs = [job_run for job_run in reversed(self.job_runs) if job_run['JobName'] == JobName]
+        start = int(NextToken or 0)
+        response = {'JobRuns': job_runs[start:start + MaxResults]}
+        if start + MaxResults < len(job_runs):
+            response['NextToken'] = str(start + MaxResults)
+        return response
+
+    def get_paginator(self, operation_name: str):
+        assert operation_name == 'get_job_runs'
+        return FakePaginator(self.get_job_runs)
+
+    def finish_runs(self, count: int = 1):
+        for job_run in self.active_runs()[:count]:
+            job_run['JobRunState'] = 'SUCCEEDED'
+
+
+class FakePaginator:
+    def __init__(self, operation):
+        self._operation = operation
+
+    def paginate(self, PaginationConfig, **kwargs):  # pylint: disable=invalid-name
+        next_token = None
+        while True:
+            page = self._operation(MaxResults=PaginationConfig['PageSize'], NextToken=next_token, **kwargs)
+            yield page
+            next_token = page.get('NextToken')
+            if not next_token:
+                return
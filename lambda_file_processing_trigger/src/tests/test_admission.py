@@ -0,0 +1,137 @@
+import random
+
+from pytest import raises
+
+from lambda_file_processing_trigger.src.event_processor.admission import AdmissionController, MAX_JOB_RUNS
+from lambda_file_processing_trigger.src.event_processor.spill_queue import InMemorySpillQueue
+from .fake_glue import ConcurrentRunsExceededException, FakeGlueClient
+
+job_name = "tests-job"
+
+
+def run(file_key: str, pipeline_name: str = "test_pipeline_name") -> dict:
+    return {"JobName": job_name, "Arguments": {"--file_key": file_key, "--pipeline_name": pipeline_name}}
+
+
+def controller(glue, max_concurrent_runs=None, spill_queue=None, sleep=lambda delay: None,
+               remaining_time_in_millis=None):
+    return AdmissionController(glue, job_name, "test_pipeline_name", max_concurrent_runs, spill_queue, sleep=sleep,
+                               remaining_time_in_millis=remaining_time_in_millis)
+
+
+def test_runs_over_budget_are_spilled_and_drained_later():
+    glue = FakeGlueClient(max_concurrent_runs=10)
+    spill_queue = InMemorySpillQueue()
+    admission = controller(glue, max_concurrent_runs=2, spill_queue=spill_queue)
+
+    assert [admission.submit(run(f"file_{index}.csv")) for index in range(4)] == ["jr_0", "jr_1", None, None]
+    assert len(spill_queue.runs) == 2
+
+    glue.finish_runs(1)
+    assert controller(glue, max_concurrent_runs=2, spill_queue=spill_queue).drain() == 1
+    assert [job_run['Arguments']['--file_key'] for job_run in glue.active_runs()] == ["file_1.csv", "file_2.csv"]
+    assert len(spill_queue.runs) == 1
+
+
+def test_drained_run_stays_queued_until_started():
+    glue = FakeGlueClient(max_concurrent_runs=1)
+    glue.start_job_run(**run("running.csv"))
+    spill_queue = InMemorySpillQueue()
+    spill_queue.put(run("file_0.csv"))
+
+    assert controller(glue, spill_queue=spill_queue).drain() == 0
+    assert [parked["Arguments"]["--file_key"] for parked in spill_queue.runs] == ["file_0.csv"]
+
+    glue.finish_runs()
+    assert controller(glue, spill_queue=spill_queue).drain() == 1
+    assert len(spill_queue.runs) == 0
+
+
+def test_budget_is_per_pipeline():
+    glue = FakeGlueClient(max_concurrent_runs=10)
+    glue.start_job_run(**run("other.csv", pipeline_name="other_pipeline"))
+    admission = controller(glue, max_concurrent_runs=1, spill_queue=InMemorySpillQueue())
+
+    assert admission.submit(run("file_0.csv")) == "jr_1"
+
+
+def test_active_runs_are_counted_on_every_page():
+    glue = FakeGlueClient(max_concurrent_runs=1000)
+    glue.start_job_run(**run("long_running.csv"))
+    for index in range(MAX_JOB_RUNS):
+        glue.start_job_run(**run(f"finished_{index}.csv"))
+    glue.finish_runs(MAX_JOB_RUNS + 1)
+    glue.job_runs[0]['JobRunState'] = 'RUNNING'
+    spill_queue = InMemorySpillQueue()
+
+    assert controller(glue, max_concurrent_runs=1, spill_queue=spill_queue).submit(run("file_0.csv")) is None
+    assert len(spill_queue.runs) == 1
+
+
+def test_rejected_start_is_retried_with_backoff():
+    glue = FakeGlueClient(max_concurrent_runs=1)
+    glue.start_job_run(**run("running.csv"))
+    delays = []
+
+    def sleep(delay):
+        delays.append(delay)
+        if len(delays) == 2:
+            glue.finish_runs()
+
+    assert controller(glue, sleep=sleep).submit(run("file_0.csv")) == "jr_1"
+    assert glue.rejected == 2
+    assert 0 <= delays[0] <= 1 and 0 <= delays[1] <= 2
+
+
+def test_run_is_spilled_when_retries_run_out():
+    glue = FakeGlueClient(max_concurrent_runs=0)
+    spill_queue = InMemorySpillQueue()
+    admission = controller(glue, spill_queue=spill_queue)
+
+    assert admission.submit(run("file_0.csv")) is None
+    assert admission.submit(run("file_1.csv")) is None
+    # once the job is known to be full the next runs are parked without asking Glue
+    assert glue.rejected == 5
+    assert len(spill_queue.runs) == 2
+
+
+def test_backoff_stops_at_the_end_of_the_invocation():
+    glue = FakeGlueClient(max_concurrent_runs=0)
+    spill_queue = InMemorySpillQueue()
+    remaining_time = [40000]
+
+    def sleep(delay):
+        remaining_time[0] -= delay * 1000
+
+    admission = AdmissionController(glue, job_name, "test_pipeline_name", spill_queue=spill_queue, base_delay=8,
+                                    max_delay=30, sleep=sleep, remaining_time_in_millis=lambda: remaining_time[0])
+
+    assert admission.submit(run("file_0.csv")) is None
+    # the backoff never sleeps into the last ten seconds of the invocation
+    assert remaining_time[0] > 10000
+    assert len(spill_queue.runs) == 1
+
+
+def test_run_is_spilled_without_backoff_near_the_end_of_the_invocation():
+    glue = FakeGlueClient(max_concurrent_runs=0)
+    spill_queue = InMemorySpillQueue()
+    delays = []
+
+    assert controller(glue, spill_queue=spill_queue, sleep=delays.append,
+                      remaining_time_in_millis=lambda: 9000).submit(run("file_0.csv")) is None
+    assert glue.rejected == 1
+    assert delays == []
+    assert len(spill_queue.runs) == 1
+
+
+def test_rejection_raised_without_spill_queue():
+    with raises(ConcurrentRunsExceededException):
+        controller(FakeGlueClient(max_concurrent_runs=0)).submit(run("file_0.csv"))
+
+
+def test_backoff_delay_is_capped():
+    random.seed(1)
+    admission = AdmissionController(FakeGlueClient(1), job_name, "test_pipeline_name", base_delay=1, max_delay=20)
+    delays = [admission.backoff_delay(attempt) for attempt in range(10) for _ in range(20)]
+    assert max(delays) <= 20
+    assert min(delays) >= 0
@@ -0,0 +1,45 @@
+from pytest import mark, raises
+
+from lambda_file_processing_trigger.src.event_processor.capacity import CapacityBand, CapacityBands
+from lambda_file_processing_trigger.src.event_processor.execution_context import ExecutionContext
+from lambda_file_processing_trigger.src.event_processor.job import Job
+from .fake_glue import FakeGlueClient
+from .test_execution_context import event, HandlerContext
+
+bands_json = ('[{"max_size": null, "worker_type": "G.2X", "number_of_workers": 10, "timeout": 240},'
+              ' {"max_size": 1048576, "max_capacity": 2, "timeout": 10},'
+              ' {"max_size": 1073741824, "worker_type": "G.1X", "number_of_workers": 4, "timeout": 60}]')
+
+test_selections = [
+    (10240, {"MaxCapacity": 2, "Timeout": 10}),
+    (1048576, {"MaxCapacity": 2, "Timeout": 10}),
+    (5 * 1048576, {"WorkerType": "G.1X", "NumberOfWorkers": 4, "Timeout": 60}),
+    (5 * 1073741824, {"WorkerType": "G.2X", "NumberOfWorkers": 10, "Timeout": 240})
+]
+
+
+@mark.parametrize("size, expected", test_selections)
+def test_select_band_of_size(size, expected):
+    assert CapacityBands.from_json(bands_json).select(size).run_arguments() == expected
+
+
+def test_default_capacity():
+    bands = CapacityBands([CapacityBand(max_size=1024, max_capacity=2)])
+    assert bands.select(2048) is None
+    assert bands.select(None) is None
+    assert CapacityBands.from_json(None).select(1024) is None
+
+
+def test_invalid_bands():
+    with raises(ValueError):
+        CapacityBands.from_json('[{"max_bytes": 1024}]')
+
+
+def test_run_job_with_capacity():
+    execution_context = ExecutionContext(lambda_context=HandlerContext(), event=event)
+    glue = FakeGlueClient(max_concurrent_runs=1)
+    Job(job_name="tests-job", glue=glue).run_job(execution_context, CapacityBand(max_capacity=2, timeout=10))
+
+    job_run = glue.job_runs[0]
+    assert (job_run["MaxCapacity"], job_run["Timeout"]) == (2, 10)
+    assert "WorkerType" not in job_run
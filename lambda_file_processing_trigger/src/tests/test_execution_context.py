@@ -1,3 +1,5 @@
+import copy
+
 from pytest import fixture, mark
 
 from lambda_file_processing_trigger.src.event_processor.execution_context import ExecutionContext
@@ -71,6 +73,10 @@ class HandlerContext:
     def aws_request_id(self):
         return self._aws_request_id
 
+    @staticmethod
+    def get_remaining_time_in_millis():
+        return 300000
+
 
 @fixture
 def handler_context():
@@ -145,3 +151,22 @@ def test_successful_access_to_env_vars(expected, context):
     assert env_obj.job_name == expected["job_name"]
     assert env_obj.log_level == expected["log_level"]
     assert env_obj.aws_account_number == expected["aws_account_number"]
+
+
+def multi_record_event(record_count: int):
+    multi_event = copy.deepcopy(event)
+    record = multi_event["Records"][0]
+    multi_event["Records"] = []
+    for index in range(record_count):
+        next_record = copy.deepcopy(record)
+        next_record["s3"]["object"]["key"] = f"drop/virtus/Dec_2018_Test_{index}.csv"
+        multi_event["Records"].append(next_record)
+    return multi_event
+
+
+def test_all_records_extracted(context, handler_context):
+    lambda_context_obj = context(lambda_context=handler_context(), event=multi_record_event(3))
+    assert [record.source_object_key for record in lambda_context_obj.records] == [
+        "drop/virtus/Dec_2018_Test_0.csv", "drop/virtus/Dec_2018_Test_1.csv", "drop/virtus/Dec_2018_Test_2.csv"]
+    assert [record.source_object_size for record in lambda_context_obj.records] == [23927, 23927, 23927]
+    assert lambda_context_obj.source_object_key == "drop/virtus/Dec_2018_Test_0.csv"
@@ -0,0 +1,111 @@
+import sys
+from types import ModuleType, SimpleNamespace
+from unittest.mock import patch
+
+from pytest import mark, raises
+
+from lambda_file_processing_trigger.src.event_processor.execution_context import ExecutionContext
+from lambda_file_processing_trigger.src.event_processor.fast_lane import FastLane
+from .test_execution_context import multi_record_event, HandlerContext
+
+
+def sized_event(*sizes):
+    sized = multi_record_event(len(sizes))
+    for record, size in zip(sized["Records"], sizes):
+        if size is None:
+            del record["s3"]["object"]["size"]
+        else:
+            record["s3"]["object"]["size"] = size
+    return sized
+
+
+def split_keys(max_size, *sizes):
+    execution_context = ExecutionContext(lambda_context=HandlerContext(), event=sized_event(*sizes))
+    small_records, large_records = FastLane(max_size).split(execution_context.records)
+    return ([record.source_object_key[-5:] for record in small_records],
+            [record.source_object_key[-5:] for record in large_records])
+
+
+test_splits = [
+    (1024, [100, 5000, 1024], (['0.csv', '2.csv'], ['1.csv'])),
+    (1024, [100, None], (['0.csv'], ['1.csv'])),
+    (None, [100, 5000], ([], ['0.csv', '1.csv'])),
+    (0, [100], ([], ['0.csv']))
+]
+
+
+@mark.parametrize("max_size, sizes, expected", test_splits)
+def test_split_by_size(max_size, sizes, expected):
+    with patch.object(FastLane, 'is_available', return_value=True):
+        assert split_keys(max_size, *sizes) == expected
+
+
+def test_everything_goes_to_glue_without_the_processor():
+    with patch.object(FastLane, 'is_available', return_value=False):
+        assert split_keys(1024, 100, 5000) == ([], ['0.csv', '1.csv'])
+
+
+class BatchProcessingError(Exception):
+    def __init__(self, failed_files, unnotified_files, skipped):
+        self.failed_files = failed_files
+        self.unnotified_files = unnotified_files
+        self.skipped = skipped
+        super().__init__(failed_files)
+
+
+class FakeProcessor:
+    """Fails the first file, notified unless told otherwise, and asks for time before every file."""
+    notified = True
+
+    def __init__(self):
+        self.config = SimpleNamespace(max_workers=4)
+
+    def run_batch(self, contexts, has_time):
+        started = 0
+        while started < len(contexts) and has_time():
+            started += 1
+        failed_files = [f"{context.file_bucket}/{context.file_key}" for context in contexts[:started][:1]]
+        raise BatchProcessingError(failed_files, [] if self.notified else failed_files, contexts[started:])
+
+
+class RemainingTime(HandlerContext):
+    def __init__(self, *remaining_millis):
+        super().__init__()
+        self._remaining_millis = iter(remaining_millis)
+
+    def get_remaining_time_in_millis(self):
+        return next(self._remaining_millis)
+
+
+def processor_modules(processor=FakeProcessor):
+    process_context = ModuleType('glue_file_processing.process_context')
+    process_context.ProcessContext = SimpleNamespace
+    module = ModuleType('glue_file_processing.processor')
+    module.BatchProcessingError = BatchProcessingError
+    module.Processor = processor
+    return {'glue_file_processing': ModuleType('glue_file_processing'),
+            'glue_file_processing.process_context': process_context, 'glue_file_processing.processor': module}
+
+
+def run_keys(lambda_context, processor=FakeProcessor):
+    execution_context = ExecutionContext(lambda_context=lambda_context, event=sized_event(100, 100, 100))
+    with patch.dict(sys.modules, processor_modules(processor)):
+        result = FastLane(1024, time_reserve=60).run(execution_context, execution_context.records)
+    return ([failed_file[-5:] for failed_file in result.failed_files],
+            [record.source_object_key[-5:] for record in result.deferred_records])
+
+
+def test_run_returns_notified_failures():
+    assert run_keys(HandlerContext()) == (['0.csv'], [])
+
+
+def test_run_defers_files_once_out_of_time():
+    assert run_keys(RemainingTime(300000, 61000, 59000)) == (['0.csv'], ['2.csv'])
+
+
+def test_run_raises_failures_that_were_not_notified():
+    class UnnotifiedProcessor(FakeProcessor):
+        notified = False
+
+    with raises(BatchProcessingError):
+        run_keys(HandlerContext(), UnnotifiedProcessor)
@@ -0,0 +1,38 @@
+import json
+
+from lambda_file_processing_trigger.src.event_processor.execution_context import ExecutionContext
+from lambda_file_processing_trigger.src.event_processor.job import Job
+from .test_execution_context import event, multi_record_event, HandlerContext
+
+
+def test_single_record_has_no_manifest():
+    execution_context = ExecutionContext(lambda_context=HandlerContext(), event=event)
+    glue_variables = Job._prep_arguments(execution_context)  # pylint: disable=protected-access
+    assert glue_variables["--correlation_id"] == "abc123456"
+    assert glue_variables["--file_key"] == "drop/virtus/Dec_2018_Test.csv"
+    assert "--manifest" not in glue_variables
+
+
+def test_multiple_records_sent_in_manifest():
+    execution_context = ExecutionContext(lambda_context=HandlerContext(), event=multi_record_event(2))
+    glue_variables = Job._prep_arguments(execution_context)  # pylint: disable=protected-access
+    manifest = json.loads(glue_variables["--manifest"])
+    assert glue_variables["--file_key"] == "drop/virtus/Dec_2018_Test_0.csv"
+    assert manifest == [
+        {"correlation_id": "abc123456", "file_bucket": "icg-dl-raw-zone-1-primary",
+         "file_key": "drop/virtus/Dec_2018_Test_0.csv", "file_version_id": "B3MF9UXDgUWXW_uN4LalkPn3Brh5qdmu",
+         "processed_on": "2018-12-05T13:29:30.914Z"},
+        {"correlation_id": "abc123456-1", "file_bucket": "icg-dl-raw-zone-1-primary",
+         "file_key": "drop/virtus/Dec_2018_Test_1.csv", "file_version_id": "B3MF9UXDgUWXW_uN4LalkPn3Brh5qdmu",
+         "processed_on": "2018-12-05T13:29:30.914Z"}
+    ]
+
+
+def test_records_keep_their_correlation_id():
+    execution_context = ExecutionContext(lambda_context=HandlerContext(), event=multi_record_event(3))
+    large_records = execution_context.with_records(execution_context.records[1:])
+    glue_variables = Job._prep_arguments(large_records)  # pylint: disable=protected-access
+    manifest = json.loads(glue_variables["--manifest"])
+    assert glue_variables["--correlation_id"] == "abc123456-1"
+    assert glue_variables["--file_key"] == "drop/virtus/Dec_2018_Test_1.csv"
+    assert [work_item["correlation_id"] for work_item in manifest] == ["abc123456-1", "abc123456-2"]
@@ -0,0 +1,80 @@
+import json
+from unittest.mock import patch
+
+from pytest import fixture, raises
+
+from lambda_file_processing_trigger.src.event_processor.fast_lane import FastLane, FastLaneResult
+from lambda_file_processing_trigger.src.event_processor.trigger import Trigger
+from .fake_glue import FakeGlueClient
+from .test_execution_context import event, multi_record_event, HandlerContext
+
+
+@fixture(autouse=True)
+def env_setup(monkeypatch):
+    monkeypatch.setenv("PIPELINE_NAME", "test_pipeline_name")
+    monkeypatch.setenv("TARGET_BUCKET", "test_target_bucket")
+    monkeypatch.setenv("JOB_NAME", "tests-job")
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+
+
+def test_handle_starts_a_run_per_event():
+    glue = FakeGlueClient(max_concurrent_runs=10)
+    trigger = Trigger(glue=glue)
+
+    trigger.handle(event, HandlerContext())
+    trigger.handle(multi_record_event(2), HandlerContext())
+
+    assert [job_run["Arguments"]["--file_key"] for job_run in glue.job_runs] == [
+        "drop/virtus/Dec_2018_Test.csv", "drop/virtus/Dec_2018_Test_0.csv"]
+    assert "--manifest" in glue.job_runs[1]["Arguments"]
+
+
+def test_environment_is_read_once(monkeypatch):
+    glue = FakeGlueClient(max_concurrent_runs=10)
+    trigger = Trigger(glue=glue)
+    monkeypatch.setenv("JOB_NAME", "other-job")
+
+    trigger.handle(event, HandlerContext())
+
+    assert glue.job_runs[0]["JobName"] == "tests-job"
+
+
+def split_in_half(records):
+    return records[:1], records[1:]
+
+
+def test_fast_lane_failures_are_reported_without_a_retry():
+    glue = FakeGlueClient(max_concurrent_runs=10)
+    trigger = Trigger(glue=glue)
+
+    with patch.object(FastLane, 'split', side_effect=split_in_half), \
+            patch.object(FastLane, 'run', return_value=FastLaneResult(['raw/drop/virtus/Dec_2018_Test_0.csv'], [])):
+        trigger.handle(multi_record_event(2), HandlerContext())
+
+    assert [job_run["Arguments"]["--file_key"] for job_run in glue.job_runs] == ["drop/virtus/Dec_2018_Test_1.csv"]
+
+
+def test_fast_lane_error_is_raised_before_glue_starts():
+    glue = FakeGlueClient(max_concurrent_runs=10)
+    trigger = Trigger(glue=glue)
+
+    with patch.object(FastLane, 'split', side_effect=split_in_half), \
+            patch.object(FastLane, 'run', side_effect=RuntimeError('no processor')), raises(RuntimeError):
+        trigger.handle(multi_record_event(2), HandlerContext())
+
+    assert glue.job_runs == []
+
+
+def test_deferred_fast_lane_files_go_to_glue():
+    glue = FakeGlueClient(max_concurrent_runs=10)
+    trigger = Trigger(glue=glue)
+
+    def defer_all(fast_lane, execution_context, records):
+        return FastLaneResult([], records)
+
+    with patch.object(FastLane, 'split', side_effect=split_in_half), patch.object(FastLane, 'run', defer_all):
+        trigger.handle(multi_record_event(2), HandlerContext())
+
+    manifest = json.loads(glue.job_runs[0]["Arguments"]["--manifest"])
+    assert sorted(work_item["file_key"] for work_item in manifest) == [
+        "drop/virtus/Dec_2018_Test_0.csv", "drop/virtus/Dec_2018_Test_1.csv"]
@@ -0,0 +1,25 @@
+import os
+import timeit
+
+from pytest import mark
+
+from lambda_file_processing_trigger.src.event_processor.trigger import Trigger
+from .fake_glue import FakeGlueClient
+from .test_execution_context import multi_record_event, HandlerContext
+from .test_trigger import env_setup  # noqa: F401 pylint: disable=unused-import
+
+EVENT_COUNT = 1000
+
+
+@mark.skipif(not os.getenv('RUN_BENCHMARKS'), reason="Benchmarks are run on demand with RUN_BENCHMARKS=1.")
+def test_handler_overhead_per_event():
+    glue = FakeGlueClient(max_concurrent_runs=EVENT_COUNT * 10)
+    s3_event = multi_record_event(3)
+    trigger = Trigger(glue=glue)
+
+    warm = min(timeit.repeat(lambda: trigger.handle(s3_event, HandlerContext()), number=EVENT_COUNT, repeat=3))
+    cold = min(timeit.repeat(lambda: Trigger(glue=glue).handle(s3_event, HandlerContext()), number=EVENT_COUNT,
+                             repeat=3))
+
+    print(f"warm: {warm / EVENT_COUNT * 1e6:.0f}us per event, rebuilt per event: {cold / EVENT_COUNT * 1e6:.0f}us")
+    assert warm < cold